@@ -8,8 +8,82 @@ API接口文件
 import json
 import os
 import sys
-from typing import Dict, Any
+from typing import Dict, Any, Callable, Optional
 from mysql_to_base_sync import sync_with_config
+from rate_limiter import parse_rate_limits
+from sync_report import SyncReport
+from sync_filters import parse_patterns, parse_column_patterns, parse_row_filters
+
+def parse_bool(value: Any) -> bool:
+    """解析布尔参数，支持true/false、1/0、yes/no"""
+    if isinstance(value, bool):
+        return value
+    return str(value).strip().lower() in ('true', '1', 'yes', 'on')
+
+
+def parse_mapping(value: Any) -> Dict[str, str]:
+    """解析映射参数，支持字典或 "table1=col1,table2=col2" 形式的字符串"""
+    if isinstance(value, dict):
+        return {str(k): str(v) for k, v in value.items()}
+    mapping = {}
+    for item in str(value).split(','):
+        key, sep, val = item.strip().partition('=')
+        if sep and key.strip():
+            mapping[key.strip()] = val.strip()
+    return mapping
+
+
+# 可选同步参数及其类型转换（请求体使用小写参数名，环境变量使用对应的大写名称）
+OPTIONAL_SYNC_PARAMS: Dict[str, Callable[[Any], Any]] = {
+    'read_mode': str,
+    'max_workers': int,
+    'rate_limits': parse_rate_limits,
+    'max_retries': int,
+    'skip_unchanged': parse_bool,
+    'state_path': str,
+    'watermark': parse_bool,
+    'watermark_columns': parse_mapping,
+    'mirror': parse_bool,
+    'pipeline_depth': int,
+    'shards': int,
+    'shard_min_rows': int,
+    'base_transport': str,
+    'max_in_flight': int,
+    'resume': parse_bool,
+    'max_run_seconds': float,
+    'max_batch_bytes': int,
+    'oversized_record': str,
+    'include_tables': parse_patterns,
+    'exclude_tables': parse_patterns,
+    'include_columns': parse_column_patterns,
+    'exclude_columns': parse_column_patterns,
+    'row_filters': parse_row_filters,
+    'warm_start': parse_bool,
+}
+
+
+def parse_optional_params(get_value: Callable[[str], Optional[Any]]) -> Dict[str, Any]:
+    """解析可选同步参数，未提供或为空的参数不传递，使用sync_with_config的默认值"""
+    options = {}
+    for name, cast in OPTIONAL_SYNC_PARAMS.items():
+        value = get_value(name)
+        if value is None or str(value).strip() == '':
+            continue
+        options[name] = cast(value)
+    return options
+
+def write_report(report: Optional[SyncReport]) -> None:
+    """按环境变量导出同步报告：REPORT_PATH 写入JSON，PROMETHEUS_TEXTFILE 写入Prometheus文本文件"""
+    if report is None:
+        return
+    report_path = os.getenv('REPORT_PATH')
+    if report_path:
+        report.write_json(report_path)
+        print(f"同步报告已写入: {report_path}")
+    prometheus_path = os.getenv('PROMETHEUS_TEXTFILE')
+    if prometheus_path:
+        report.write_prometheus(prometheus_path)
+        print(f"Prometheus指标已写入: {prometheus_path}")
 
 def lambda_handler(event: Dict[str, Any], context: Any = None) -> Dict[str, Any]:
     """
@@ -43,6 +117,11 @@ def lambda_handler(event: Dict[str, Any], context: Any = None) -> Dict[str, Any]
                 }, ensure_ascii=False)
             }
         
+        options = parse_optional_params(body.get)
+        # Lambda热容器中默认复用连接，请求体中传入warm_start=false时关闭
+        if os.getenv('AWS_LAMBDA_FUNCTION_NAME'):
+            options.setdefault('warm_start', True)
+        
         # 执行同步
         results = sync_with_config(
             mysql_host=body['mysql_host'],
@@ -52,7 +131,8 @@ def lambda_handler(event: Dict[str, Any], context: Any = None) -> Dict[str, Any]
             mysql_database=body['mysql_database'],
             app_token=body['app_token'],
             personal_base_token=body['personal_base_token'],
-            region=region
+            region=region,
+            **options
         )
         
         return {
@@ -60,7 +140,10 @@ def lambda_handler(event: Dict[str, Any], context: Any = None) -> Dict[str, Any]
             'body': json.dumps({
                 'success': True,
                 'message': '同步完成',
-                'results': results
+                'results': results,
+                'api_stats': getattr(results, 'api_stats', {}),
+                'table_stats': getattr(results, 'table_stats', {}),
+                'report': results.report.to_dict() if hasattr(results, 'report') else {}
             }, ensure_ascii=False)
         }
         
@@ -93,6 +176,7 @@ def main():
             'personal_base_token': os.getenv('PERSONAL_BASE_TOKEN'),
             'region': os.getenv('REGION', 'domestic')
         }
+        config.update(parse_optional_params(lambda name: os.getenv(name.upper())))
         
         # 验证配置（排除region，它有默认值）
         required_vars = ['mysql_host', 'mysql_username', 'mysql_password', 'mysql_database', 'app_token', 'personal_base_token']
@@ -107,11 +191,21 @@ def main():
         
         print("同步完成!")
         print(f"同步结果: {results}")
+        api_stats = getattr(results, 'api_stats', {})
+        table_stats = getattr(results, 'table_stats', {})
+        print(f"接口调用统计: {api_stats}")
+        print(f"记录统计: {table_stats}")
+        report = getattr(results, 'report', None)
+        write_report(report)
         
         # 输出结果到GitHub Actions
         if os.getenv('GITHUB_ACTIONS'):
             with open(os.getenv('GITHUB_OUTPUT', '/dev/stdout'), 'a') as f:
                 f.write(f"sync_results={json.dumps(results)}\n")
+                f.write(f"api_stats={json.dumps(api_stats)}\n")
+                f.write(f"table_stats={json.dumps(table_stats)}\n")
+                if report is not None:
+                    f.write(f"sync_report={report.to_json()}\n")
         
     except Exception as e:
         print(f"同步失败: {e}")
@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+基于asyncio的飞书多维表格接口传输
+复用HTTP keep-alive长连接，按连接池限制同时在途的请求数；
+直接发送baseopensdk的请求对象（builder构建），返回与SDK相同的响应对象
+"""
+
+import asyncio
+import json
+import ssl
+import threading
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import quote, urlencode, urlsplit
+
+from lazy_import import LazyModule
+
+baseopensdk = LazyModule('baseopensdk')
+base_v1 = LazyModule('baseopensdk.api.base.v1')
+
+
+class HttpResponse:
+    """HTTP原始响应，与SDK响应对象的raw属性一致"""
+
+    def __init__(self, status_code: int, headers: Dict[str, str], content: bytes):
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        # 本次请求发送的请求体字节数，用于同步报告统计
+        self.request_bytes = 0
+
+
+class _Connection:
+    """一条keep-alive连接"""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+
+    def close(self):
+        self.writer.close()
+
+
+class AsyncBaseTransport:
+    """飞书多维表格接口的asyncio传输
+
+    最多同时发送max_in_flight个请求，每个请求从连接池取一条空闲的keep-alive连接，
+    完成后放回；服务端关闭了空闲连接时换一条新连接重发一次。
+    网络异常统一抛出OSError的子类，与SDK（requests）的异常一致，便于调用方按临时错误重试
+    """
+
+    def __init__(self, domain: str, app_token: str, personal_base_token: str,
+                 max_in_flight: int = 4, timeout: float = 60.0):
+        url = urlsplit(domain)
+        self.host = url.hostname
+        self.secure = url.scheme == 'https'
+        self.port = url.port or (443 if self.secure else 80)
+        # Host头：IPv6地址加方括号，非默认端口时带上端口
+        host = f"[{self.host}]" if ':' in self.host else self.host
+        self.host_header = host if self.port == (443 if self.secure else 80) else f"{host}:{self.port}"
+        self.app_token = app_token
+        self.personal_base_token = personal_base_token
+        self.max_in_flight = max(1, max_in_flight)
+        self.timeout = timeout
+        self.connections_opened = 0
+        self._idle: List[_Connection] = []
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._ssl_context = ssl.create_default_context() if self.secure else None
+
+    async def request(self, request) -> Any:
+        """发送SDK请求对象，返回对应的SDK响应对象（如ListAppTableRecordResponse）"""
+        method, target, body = self._encode_request(request)
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_in_flight)
+        async with self._semaphore:
+            try:
+                raw = await asyncio.wait_for(self._send(method, target, body), self.timeout)
+            except asyncio.TimeoutError as e:
+                raise TimeoutError(f"请求超时（{self.timeout}秒）: {method} {target}") from e
+        raw.request_bytes = len(body) if body else 0
+        return self._decode_response(request, raw)
+
+    def _encode_request(self, request) -> Tuple[str, str, Optional[bytes]]:
+        """将SDK请求对象转换为 (HTTP方法, 路径和查询参数, JSON请求体)"""
+        method = getattr(request.http_method, 'name', None) or str(request.http_method)
+        paths = dict(request.paths)
+        paths.setdefault('app_token', self.app_token)
+        segments = []
+        for segment in request.uri.split('/'):
+            if segment.startswith(':'):
+                segment = quote(str(paths[segment[1:]]), safe='')
+            segments.append(segment)
+        target = '/'.join(segments)
+        if request.queries:
+            target += '?' + urlencode(request.queries)
+        body = baseopensdk.JSON.marshal(request.body)
+        return method, target, body.encode('utf-8') if body is not None else None
+
+    @staticmethod
+    def _decode_response(request, raw: HttpResponse) -> Any:
+        """按请求类型构造SDK响应对象；响应体不是JSON时只保留HTTP状态，由调用方按状态码处理"""
+        request_name = type(request).__name__
+        response_class = getattr(base_v1, request_name[:-len('Request')] + 'Response', None)
+        try:
+            payload = json.loads(raw.content.decode('utf-8')) if raw.content else {}
+        except ValueError:
+            payload = {'msg': raw.content[:200].decode('utf-8', 'replace')}
+        if not isinstance(payload, dict):
+            payload = {}
+        if response_class is not None:
+            response = response_class(payload)
+        else:
+            response = SimpleNamespace(code=payload.get('code'), msg=payload.get('msg'),
+                                       data=payload.get('data'))
+            response.success = lambda: response.code == 0
+        response.raw = raw
+        return response
+
+    async def _send(self, method: str, target: str, body: Optional[bytes]) -> HttpResponse:
+        headers = [
+            f"{method} {target} HTTP/1.1",
+            f"Host: {self.host_header}",
+            f"Authorization: Bearer {self.personal_base_token}",
+            "Connection: keep-alive",
+            "Accept: application/json",
+        ]
+        if body is not None:
+            headers.append("Content-Type: application/json; charset=utf-8")
+            headers.append(f"Content-Length: {len(body)}")
+        payload = ('\r\n'.join(headers) + '\r\n\r\n').encode('latin-1') + (body or b'')
+
+        while True:
+            conn, reused = await self._acquire()
+            try:
+                conn.writer.write(payload)
+                await conn.writer.drain()
+                response, keep_alive = await self._read_response(conn.reader)
+            except (OSError, EOFError) as e:
+                conn.close()
+                # 服务端已关闭空闲连接时请求不会被处理，换一条新连接重发
+                if reused and isinstance(e, (ConnectionError, EOFError)):
+                    continue
+                if isinstance(e, EOFError):
+                    raise ConnectionError(f"连接被服务端关闭: {e}") from e
+                raise
+            except BaseException:
+                conn.close()
+                raise
+            if keep_alive:
+                self._idle.append(conn)
+            else:
+                conn.close()
+            return response
+
+    async def _acquire(self) -> Tuple[_Connection, bool]:
+        """取一条空闲连接，没有时新建，返回 (连接, 是否为复用的连接)"""
+        while self._idle:
+            conn = self._idle.pop()
+            if not conn.reader.at_eof():
+                return conn, True
+            conn.close()
+        reader, writer = await asyncio.open_connection(
+            self.host, self.port, ssl=self._ssl_context, server_hostname=self.host if self.secure else None)
+        self.connections_opened += 1
+        return _Connection(reader, writer), False
+
+    @staticmethod
+    async def _read_response(reader: asyncio.StreamReader) -> Tuple[HttpResponse, bool]:
+        """读取一个HTTP/1.1响应，返回 (响应, 连接是否可以复用)"""
+        status_line = await reader.readuntil(b'\r\n')
+        version, status, _ = (status_line.decode('latin-1').rstrip('\r\n') + ' ').split(' ', 2)
+        headers = {}
+        while True:
+            line = (await reader.readuntil(b'\r\n')).decode('latin-1').rstrip('\r\n')
+            if not line:
+                break
+            name, _, value = line.partition(':')
+            headers[name.strip()] = value.strip()
+        lowered = {name.lower(): value for name, value in headers.items()}
+
+        if 'chunked' in lowered.get('transfer-encoding', '').lower():
+            chunks = []
+            while True:
+                size = int((await reader.readuntil(b'\r\n')).split(b';')[0], 16)
+                if size == 0:
+                    # 跳过trailer直到空行
+                    while await reader.readuntil(b'\r\n') != b'\r\n':
+                        pass
+                    break
+                chunks.append(await reader.readexactly(size))
+                await reader.readexactly(2)
+            content = b''.join(chunks)
+        elif 'content-length' in lowered:
+            content = await reader.readexactly(int(lowered['content-length']))
+        else:
+            # 没有长度信息时读到连接关闭为止
+            content = await reader.read()
+            return HttpResponse(int(status), headers, content), False
+
+        keep_alive = lowered.get('connection', '').lower() != 'close' and version != 'HTTP/1.0'
+        return HttpResponse(int(status), headers, content), keep_alive
+
+    async def close(self):
+        """关闭连接池中的空闲连接"""
+        idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
+            try:
+                await conn.writer.wait_closed()
+            except (OSError, ssl.SSLError):
+                pass
+
+
+class AsyncTransportClient:
+    """在后台事件循环中运行AsyncBaseTransport的同步客户端
+
+    接口与BaseClient一致（base.v1.<资源>.<方法>(request)），可直接替换同步器的base_client；
+    多个同步线程共享同一个连接池，同时在途的请求数不超过max_in_flight；
+    call等待响应后才返回，单个线程同一时刻只有一个请求，并发来自多个同步线程（max_workers、shards）
+    """
+
+    # 支持的资源及方法，均按请求对象中的HTTP方法和路径发送
+    RESOURCES = {
+        'app_table': ('list', 'create'),
+        'app_table_record': ('list', 'batch_create', 'batch_update', 'batch_delete'),
+        'app_table_field': ('list', 'create'),
+    }
+
+    def __init__(self, domain: str, app_token: str, personal_base_token: str,
+                 max_in_flight: int = 4, timeout: float = 60.0):
+        self.transport = AsyncBaseTransport(domain, app_token, personal_base_token, max_in_flight, timeout)
+        self._closed = False
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name='base-transport', daemon=True)
+        self._thread.start()
+        resources = {
+            resource: SimpleNamespace(**{method: self.call for method in methods})
+            for resource, methods in self.RESOURCES.items()
+        }
+        self.base = SimpleNamespace(v1=SimpleNamespace(**resources))
+
+    @property
+    def closed(self) -> bool:
+        """已调用close或后台事件循环线程已退出时为True，此时客户端不能再发送请求"""
+        return self._closed or not self._thread.is_alive()
+
+    def call(self, request) -> Any:
+        """发送请求并等待响应，可在任意线程中调用"""
+        return asyncio.run_coroutine_threadsafe(self.transport.request(request), self._loop).result()
+
+    def close(self):
+        """关闭连接并停止后台事件循环"""
+        self._closed = True
+        if not self._loop.is_running():
+            return
+        asyncio.run_coroutine_threadsafe(self.transport.close(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+行转换微基准测试
+对比逐个单元格调用convert_value（原实现）、按表结构预编译的行转换函数和按列批量转换函数
+日期时间转换的开销与本地时区有关，可用TZ环境变量对比，如 TZ=Asia/Shanghai
+
+运行: python benchmarks/bench_row_converter.py [行数] [列数]
+"""
+
+import os
+import sys
+import time
+import timeit
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import Any, Dict, List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mysql_to_base_sync import DataTypeMapper
+
+
+def legacy_convert_value(value: Any, mysql_type: str) -> Any:
+    """原DataTypeMapper.convert_value实现：每个单元格都重新解析字段类型"""
+    if value is None:
+        return None
+
+    base_type = mysql_type.lower().split('(')[0].strip()
+
+    if base_type in ['date', 'datetime', 'timestamp']:
+        if isinstance(value, (datetime,)):
+            return int(value.timestamp() * 1000)
+        elif isinstance(value, str):
+            try:
+                dt = datetime.strptime(value, '%Y-%m-%d %H:%M:%S')
+                return int(dt.timestamp() * 1000)
+            except:
+                return value
+    elif base_type in ['boolean', 'bool']:
+        return bool(value)
+    elif base_type in ['tinyint', 'smallint', 'mediumint', 'int', 'integer', 'bigint']:
+        return int(value) if value is not None else None
+    elif base_type in ['float', 'double', 'decimal', 'numeric']:
+        return float(value) if value is not None else None
+    else:
+        return str(value) if value is not None else None
+
+
+def legacy_convert_row(row: Dict[str, Any], schema: List[Dict]) -> Dict[str, Any]:
+    """原sync_table_data中的逐行转换循环"""
+    fields = {}
+    for col in schema:
+        col_name = col['name']
+        if col_name in row:
+            value = legacy_convert_value(row[col_name], col['type'])
+            if value is not None:
+                fields[col_name] = value
+    return fields
+
+
+# 宽表中常见的字段类型及示例值
+COLUMN_SAMPLES = [
+    ('int(11)', 12345),
+    ('varchar(255)', 'hello world'),
+    ('decimal(10,2)', Decimal('1234.56')),
+    ('datetime', datetime(2024, 1, 2, 3, 4, 5, 678000)),
+    ('bigint(20) unsigned', 9876543210),
+    ('text', 'some longer description text'),
+    ('tinyint(1)', 1),
+    ('double', 3.14159),
+    ('timestamp', datetime(2024, 6, 7, 8, 9, 10)),
+    ('varchar(32)', None),
+]
+
+
+# 事实表：以时间和金额字段为主
+FACT_COLUMN_SAMPLES = [
+    ('bigint(20)', 1234567),
+    ('datetime', datetime(2024, 1, 2, 3, 4, 5, 678000)),
+    ('decimal(12,2)', Decimal('99.90')),
+    ('timestamp', datetime(2024, 6, 7, 8, 9, 10)),
+    ('decimal(12,4)', Decimal('0.1250')),
+]
+
+
+def make_table(rows: int, columns: int, column_samples: List[Tuple[str, Any]]):
+    schema = []
+    samples = {}
+    for i in range(columns):
+        mysql_type, value = column_samples[i % len(column_samples)]
+        name = f'col_{i}'
+        schema.append({'name': name, 'type': mysql_type})
+        samples[name] = value
+
+    data = []
+    for n in range(rows):
+        row = {}
+        for name, value in samples.items():
+            # 时间字段每行相差一分多钟，覆盖多个日期
+            row[name] = value + timedelta(seconds=n * 97) if isinstance(value, datetime) else value
+        data.append(row)
+    return schema, data
+
+
+def run(title: str, rows: int, columns: int, column_samples: List[Tuple[str, Any]]):
+    schema, data = make_table(rows, columns, column_samples)
+
+    convert_row = DataTypeMapper.compile_row_converter(schema)
+    convert_rows = DataTypeMapper.compile_batch_converter(schema)
+    expected = [legacy_convert_row(row, schema) for row in data]
+    assert [convert_row(row) for row in data] == expected
+    assert convert_rows(data) == expected
+
+    # 同步时每页500行
+    pages = [data[i:i + 500] for i in range(0, len(data), 500)]
+    legacy = min(timeit.repeat(lambda: [legacy_convert_row(row, schema) for row in data], number=1, repeat=5))
+    compiled = min(timeit.repeat(lambda: [convert_row(row) for row in data], number=1, repeat=5))
+    columnar = min(timeit.repeat(lambda: [convert_rows(page) for page in pages], number=1, repeat=5))
+
+    cells = rows * columns
+    print(f"{title}: {rows} 行 x {columns} 列")
+    print(f"  逐单元格convert_value: {legacy:.3f}s ({cells / legacy:,.0f} 单元格/秒)")
+    print(f"  预编译行转换函数:      {compiled:.3f}s ({cells / compiled:,.0f} 单元格/秒) {legacy / compiled:.1f}x")
+    print(f"  按列批量转换:          {columnar:.3f}s ({cells / columnar:,.0f} 单元格/秒) {legacy / columnar:.1f}x")
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    columns = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    print(f"本地时区: {time.tzname[0]}")
+    run("宽表", rows, columns, COLUMN_SAMPLES)
+    run("事实表", rows * 5, 10, FACT_COLUMN_SAMPLES)
+
+
+if __name__ == '__main__':
+    main()
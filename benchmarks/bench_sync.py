@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+MySQLToBaseSync端到端基准测试（离线、可复现）
+飞书接口使用本地模拟服务（可配置延迟和QPS上限，在独立进程中运行），
+MySQL使用合成数据：默认为SQLite内存库模拟的连接，也可以指定本地MySQL/MariaDB（会重建同名测试表，请使用专用数据库）
+
+场景:
+  full_load    空表格全量写入
+  noop_resync  全量写入后再次同步，数据无变化
+  small_delta  全量写入后修改部分行、新增少量行，再次同步
+  wide_rows    宽表全量写入
+
+输出每个场景的吞吐量、飞书接口调用次数、收发字节数和同步过程中的内存峰值
+
+运行: python benchmarks/bench_sync.py [--rows 20000] [--scenarios full_load,noop_resync] [--json result.json]
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pymysql
+
+from mysql_to_base_sync import MySQLConfig, BaseConfig, SyncConfig, MySQLToBaseSync, baseopensdk
+from base_transport import AsyncTransportClient
+from rate_limiter import parse_rate_limits
+from fake_base_server import start_server_process, control
+from synthetic_mysql import TableSpec, SyntheticMySQL, create_mysql_tables, insert_rows, update_rows
+
+
+class BenchmarkSync(MySQLToBaseSync):
+    """连接本地模拟服务和合成数据源的同步器，同步逻辑与MySQLToBaseSync完全相同"""
+
+    def __init__(self, mysql_config: MySQLConfig, base_config: BaseConfig, sync_config: SyncConfig,
+                 domain: str, source: Optional[SyntheticMySQL] = None):
+        super().__init__(mysql_config, base_config, sync_config)
+        self.domain = domain
+        self.source = source
+
+    def connect_mysql(self) -> bool:
+        if self.source is None:
+            return super().connect_mysql()
+        self.mysql_conn = self.source.connect()
+        return True
+
+    def connect_base(self) -> bool:
+        if self.sync_config.base_transport == 'async':
+            self.base_client = AsyncTransportClient(self.domain, self.base_config.app_token,
+                                                    self.base_config.personal_base_token,
+                                                    max_in_flight=self.sync_config.max_in_flight)
+        else:
+            self.base_client = baseopensdk.BaseClient.builder() \
+                .app_token(self.base_config.app_token) \
+                .personal_base_token(self.base_config.personal_base_token) \
+                .domain(self.domain) \
+                .build()
+        return True
+
+
+class MemorySampler:
+    """后台线程定期采样进程常驻内存（RSS），记录峰值；非Linux平台只能读取进程生命周期内的峰值"""
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.baseline = self.current()
+        self.peak = self.baseline
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    @staticmethod
+    def current() -> int:
+        try:
+            with open('/proc/self/statm') as f:
+                return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+        except (OSError, ValueError):
+            import resource
+            return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.peak = max(self.peak, self.current())
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *args):
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, self.current())
+
+
+def build_tables(scenario: str, args) -> List[TableSpec]:
+    if scenario == 'wide_rows':
+        return [TableSpec('bench_wide', args.wide_rows, args.wide_columns)]
+    return [TableSpec('bench_orders', args.rows, args.columns)]
+
+
+def run_scenario(scenario: str, domain: str, args) -> Dict[str, Any]:
+    control(domain, 'reset')
+    specs = build_tables(scenario, args)
+    mysql_config = MySQLConfig(host=args.mysql_host or 'synthetic', port=args.mysql_port,
+                               username=args.mysql_user, password=args.mysql_password,
+                               database=args.mysql_database)
+    source = None
+    if args.mysql_host:
+        setup_conn = pymysql.connect(host=args.mysql_host, port=args.mysql_port, user=args.mysql_user,
+                                     password=args.mysql_password, database=args.mysql_database,
+                                     charset='utf8mb4')
+        create_mysql_tables(setup_conn, specs)
+    else:
+        source = SyntheticMySQL(specs, args.mysql_database)
+        setup_conn = source.connect()
+
+    state_dir = tempfile.TemporaryDirectory() if args.state else None
+    sync_config = SyncConfig(
+        read_mode=args.read_mode,
+        max_workers=args.max_workers,
+        rate_limits=args.client_limits,
+        pipeline_depth=args.pipeline_depth,
+        shards=args.shards,
+        shard_min_rows=args.shard_min_rows,
+        base_transport=args.transport,
+        max_in_flight=args.max_in_flight,
+        state_path=os.path.join(state_dir.name, 'sync_state.db') if state_dir else None,
+    )
+    syncer = BenchmarkSync(mysql_config, BaseConfig(app_token='bench', personal_base_token='pt-bench'),
+                           sync_config, domain, source)
+    syncer.logger.setLevel(args.log_level)
+    try:
+        syncer.connect_mysql()
+        syncer.connect_base()
+
+        if scenario in ('noop_resync', 'small_delta'):
+            syncer.sync_all_tables()
+        if scenario == 'small_delta':
+            spec = specs[0]
+            changed = max(1, int(spec.rows * args.delta))
+            step = max(1, spec.rows // changed)
+            update_rows(setup_conn, spec, range(1, spec.rows + 1, step))
+            inserted = max(1, changed // 2)
+            insert_rows(setup_conn, spec, (spec.generate_row(row_id)
+                                           for row_id in range(spec.rows + 1, spec.rows + inserted + 1)))
+            spec.rows += inserted
+
+        control(domain, 'reset_stats')
+        with MemorySampler() as memory:
+            started = time.perf_counter()
+            results = syncer.sync_all_tables()
+            elapsed = time.perf_counter() - started
+        server = control(domain, 'stats')
+    finally:
+        syncer.close_connections()
+        setup_conn.close()
+        if source is not None:
+            source.close()
+        if state_dir is not None:
+            state_dir.cleanup()
+
+    rows = sum(spec.rows for spec in specs)
+    totals = {key: sum(stats.get(key, 0) for stats in results.table_stats.values())
+              for key in ('synced', 'created', 'updated', 'unchanged')}
+    consistent = all(server['records'].get(spec.name) == spec.rows for spec in specs)
+    return {
+        'scenario': scenario,
+        'success': all(results.values()) and consistent,
+        'rows': rows,
+        'columns': specs[0].columns + 2,
+        'seconds': round(elapsed, 3),
+        'rows_per_second': round(rows / elapsed, 1) if elapsed else None,
+        'written_per_second': round(totals['synced'] / elapsed, 1) if elapsed else None,
+        **totals,
+        'api_calls': server['calls'],
+        'throttled': server['throttled'],
+        'retries': results.api_stats.get('retries', 0),
+        'bytes_sent': server['bytes_received'],
+        'bytes_received': server['bytes_sent'],
+        'connections': server['connections'],
+        'peak_rss_mb': round(memory.peak / 1048576, 1),
+        'peak_rss_delta_mb': round((memory.peak - memory.baseline) / 1048576, 1),
+    }
+
+
+def print_result(result: Dict[str, Any]):
+    calls = result['api_calls']
+    print(f"{result['scenario']}: {result['rows']} 行 x {result['columns']} 列"
+          f"{'' if result['success'] else '  [失败或飞书记录数与MySQL不一致]'}")
+    print(f"  耗时 {result['seconds']:.2f}s，读取 {result['rows_per_second']:,.0f} 行/秒，"
+          f"写入 {result['written_per_second']:,.0f} 条/秒")
+    print(f"  记录: 新增 {result['created']}, 更新 {result['updated']}, 未变化 {result['unchanged']}")
+    print(f"  飞书接口: read {calls['read']}, write {calls['write']}, meta {calls['meta']}, "
+          f"限流 {result['throttled']}, 重试 {result['retries']}, 连接 {result['connections']}")
+    print(f"  发送 {result['bytes_sent'] / 1048576:.2f} MB，接收 {result['bytes_received'] / 1048576:.2f} MB")
+    print(f"  内存峰值 {result['peak_rss_mb']:.1f} MB（同步期间增长 {result['peak_rss_delta_mb']:.1f} MB）")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='MySQLToBaseSync离线基准测试')
+    parser.add_argument('--scenarios', default='full_load,noop_resync,small_delta,wide_rows')
+    parser.add_argument('--rows', type=int, default=20000)
+    parser.add_argument('--columns', type=int, default=20, help='主键和updated_at之外的列数')
+    parser.add_argument('--wide-rows', type=int, default=2000)
+    parser.add_argument('--wide-columns', type=int, default=200)
+    parser.add_argument('--delta', type=float, default=0.01, help='small_delta场景中修改的行比例')
+    parser.add_argument('--latency-ms', type=float, default=20.0, help='模拟飞书接口的单次请求延迟')
+    parser.add_argument('--server-limits', default='read=20,write=10,meta=5', help='模拟服务各类接口的QPS上限')
+    parser.add_argument('--client-limits', default=None, help='同步器的rate_limits，默认与--server-limits相同')
+    parser.add_argument('--transport', default='async', choices=['async', 'sdk'],
+                        help='sdk需要安装baseopensdk并支持自定义domain')
+    parser.add_argument('--max-in-flight', type=int, default=4)
+    parser.add_argument('--read-mode', default='keyset', choices=['keyset', 'stream'])
+    parser.add_argument('--max-workers', type=int, default=1)
+    parser.add_argument('--pipeline-depth', type=int, default=2)
+    parser.add_argument('--shards', type=int, default=1)
+    parser.add_argument('--shard-min-rows', type=int, default=1000000)
+    parser.add_argument('--state', action='store_true', help='启用本地同步状态（state_path）')
+    parser.add_argument('--mysql-host', default=None, help='使用本地MySQL/MariaDB代替SQLite模拟数据源')
+    parser.add_argument('--mysql-port', type=int, default=3306)
+    parser.add_argument('--mysql-user', default='root')
+    parser.add_argument('--mysql-password', default='')
+    parser.add_argument('--mysql-database', default='bench')
+    parser.add_argument('--log-level', default='WARNING')
+    parser.add_argument('--json', default=None, help='将结果写入JSON文件，便于对比不同版本')
+    args = parser.parse_args(argv)
+    args.server_limits = parse_rate_limits(args.server_limits)
+    args.client_limits = parse_rate_limits(args.client_limits) if args.client_limits else dict(args.server_limits)
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    logging.getLogger('mysql_to_base_sync').setLevel(args.log_level)
+    process, domain = start_server_process(args.latency_ms / 1000, args.server_limits)
+    print(f"模拟飞书接口 {domain}，延迟 {args.latency_ms:.0f}ms，QPS上限 {args.server_limits}")
+    results = []
+    try:
+        for scenario in args.scenarios.split(','):
+            result = run_scenario(scenario.strip(), domain, args)
+            print_result(result)
+            results.append(result)
+    finally:
+        process.terminate()
+        process.join()
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'args': {k: v for k, v in vars(args).items()}, 'results': results}, f,
+                      ensure_ascii=False, indent=2)
+    return 0 if all(result['success'] for result in results) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
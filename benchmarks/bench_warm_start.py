@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Lambda入口的冷启动和单次调用耗时（离线、可复现）
+
+冷启动：在新进程中导入api模块的耗时（baseopensdk延迟到第一次构建请求时导入），
+       与导入后立即导入baseopensdk（即原来的模块级导入）的耗时对比
+单次调用：对同一个小表连续同步多次，对比每次新建同步器和连接（warm_start=false）
+       与复用热启动缓存中的同步器（warm_start=true）的耗时，以及每次调用新建的飞书连接数
+
+飞书接口使用本地模拟服务，MySQL默认使用SQLite模拟的连接（连接几乎没有开销），
+指定--mysql-host时使用本地MySQL/MariaDB，可以同时体现MySQL建连的耗时
+
+运行: python benchmarks/bench_warm_start.py [--invocations 20] [--rows 200] [--json result.json]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from functools import partial
+from typing import Any, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pymysql
+
+from mysql_to_base_sync import (
+    MySQLConfig, BaseConfig, SyncConfig,
+    acquire_warm_syncer, release_warm_syncer, close_warm_syncers,
+)
+from rate_limiter import parse_rate_limits
+from bench_sync import BenchmarkSync
+from fake_base_server import start_server_process, control
+from synthetic_mysql import TableSpec, SyntheticMySQL, create_mysql_tables
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+IMPORT_SNIPPETS = {
+    'lazy': "import api",
+    'eager': "import api; import baseopensdk.api.base.v1",
+}
+
+
+def measure_import(snippet: str, repeats: int) -> float:
+    """在新进程中执行snippet，返回导入耗时的中位数（毫秒），不含解释器启动"""
+    code = f"import time; started = time.perf_counter(); {snippet}; print(time.perf_counter() - started)"
+    samples = []
+    for _ in range(repeats):
+        output = subprocess.run([sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True,
+                                check=True).stdout
+        samples.append(float(output.strip().splitlines()[-1]) * 1000)
+    return statistics.median(samples)
+
+
+def run_invocations(warm: bool, domain: str, args) -> Dict[str, Any]:
+    control(domain, 'reset')
+    spec = TableSpec('bench_orders', args.rows, args.columns)
+    mysql_config = MySQLConfig(host=args.mysql_host or 'synthetic', port=args.mysql_port,
+                               username=args.mysql_user, password=args.mysql_password,
+                               database=args.mysql_database)
+    source = None
+    if args.mysql_host:
+        setup_conn = pymysql.connect(host=args.mysql_host, port=args.mysql_port, user=args.mysql_user,
+                                     password=args.mysql_password, database=args.mysql_database,
+                                     charset='utf8mb4')
+        create_mysql_tables(setup_conn, [spec])
+        setup_conn.close()
+    else:
+        source = SyntheticMySQL([spec], args.mysql_database)
+
+    base_config = BaseConfig(app_token='bench', personal_base_token='pt-bench')
+    sync_config = SyncConfig(rate_limits=args.client_limits, base_transport=args.transport,
+                             max_in_flight=args.max_in_flight)
+    factory = partial(BenchmarkSync, domain=domain, source=source)
+    latencies: List[float] = []
+    connections: List[int] = []
+    try:
+        for _ in range(args.invocations + 1):
+            before = control(domain, 'stats')['connections']
+            started = time.perf_counter()
+            if warm:
+                syncer = acquire_warm_syncer(mysql_config, base_config, sync_config, factory=factory)
+                syncer.logger.setLevel(args.log_level)
+                results = syncer.sync_all_tables()
+                release_warm_syncer(syncer)
+            else:
+                syncer = factory(mysql_config, base_config, sync_config)
+                syncer.logger.setLevel(args.log_level)
+                syncer.connect_mysql()
+                syncer.connect_base()
+                results = syncer.sync_all_tables()
+                syncer.close_connections()
+            latencies.append((time.perf_counter() - started) * 1000)
+            # 控制接口的请求本身也会新建一次连接，不计入
+            connections.append(control(domain, 'stats')['connections'] - before - 1)
+            if not all(results.values()):
+                raise Exception(f"同步失败: {dict(results)}")
+    finally:
+        close_warm_syncers()
+        if source is not None:
+            source.close()
+
+    # 第一次调用写入全部数据，只统计之后数据无变化的调用
+    latencies, connections = latencies[1:], connections[1:]
+    return {
+        'mode': 'warm' if warm else 'cold',
+        'invocations': len(latencies),
+        'median_ms': round(statistics.median(latencies), 1),
+        'p95_ms': round(sorted(latencies)[max(0, int(len(latencies) * 0.95) - 1)], 1),
+        'base_connections_per_invocation': round(sum(connections) / len(connections), 2),
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Lambda入口冷启动与热启动耗时对比')
+    parser.add_argument('--invocations', type=int, default=20)
+    parser.add_argument('--import-repeats', type=int, default=5)
+    parser.add_argument('--rows', type=int, default=200)
+    parser.add_argument('--columns', type=int, default=10)
+    parser.add_argument('--latency-ms', type=float, default=5.0, help='模拟飞书接口的单次请求延迟')
+    parser.add_argument('--server-limits', default='read=100,write=50,meta=20')
+    parser.add_argument('--transport', default='async', choices=['async', 'sdk'],
+                        help='sdk需要安装baseopensdk并支持自定义domain')
+    parser.add_argument('--max-in-flight', type=int, default=4)
+    parser.add_argument('--mysql-host', default=None, help='使用本地MySQL/MariaDB代替SQLite模拟数据源')
+    parser.add_argument('--mysql-port', type=int, default=3306)
+    parser.add_argument('--mysql-user', default='root')
+    parser.add_argument('--mysql-password', default='')
+    parser.add_argument('--mysql-database', default='bench')
+    parser.add_argument('--log-level', default='WARNING')
+    parser.add_argument('--json', default=None, help='将结果写入JSON文件')
+    args = parser.parse_args(argv)
+    args.server_limits = parse_rate_limits(args.server_limits)
+    args.client_limits = dict(args.server_limits)
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    imports = {name: round(measure_import(snippet, args.import_repeats), 1)
+               for name, snippet in IMPORT_SNIPPETS.items()}
+    print(f"冷启动导入api: {imports['lazy']:.1f} ms（延迟导入baseopensdk），"
+          f"{imports['eager']:.1f} ms（立即导入baseopensdk）")
+
+    process, domain = start_server_process(args.latency_ms / 1000, args.server_limits)
+    try:
+        invocations = [run_invocations(warm, domain, args) for warm in (False, True)]
+    finally:
+        process.terminate()
+        process.join()
+    for result in invocations:
+        print(f"{result['mode']}: {result['invocations']} 次调用，中位数 {result['median_ms']:.1f} ms，"
+              f"P95 {result['p95_ms']:.1f} ms，每次新建飞书连接 {result['base_connections_per_invocation']}")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'args': vars(args), 'import_ms': imports, 'invocations': invocations}, f,
+                      ensure_ascii=False, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+本地模拟的飞书多维表格开放接口，供基准测试使用
+支持数据表、字段、记录的列表和批量写入接口，可配置每个请求的延迟和各类接口的QPS上限，
+并统计各类接口的调用次数、限流次数和收发字节数
+
+单独运行: python benchmarks/fake_base_server.py [端口] [延迟毫秒]
+"""
+
+import json
+import multiprocessing
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+from urllib.request import Request, urlopen
+
+
+# 与飞书一致的错误码
+CODE_TOO_MANY_REQUESTS = 1254290
+CODE_FIELD_NOT_FOUND = 1254045
+CODE_NOT_FOUND = 1254004
+
+# 与rate_limiter中的接口类别一致
+CATEGORIES = ('read', 'write', 'meta')
+
+
+class TokenBucket:
+    """服务端限流：超过QPS上限的请求直接返回429"""
+
+    def __init__(self, rate: float):
+        self.rate = rate
+        self.tokens = rate
+        self.updated = time.monotonic()
+
+    def take(self) -> bool:
+        now = time.monotonic()
+        self.tokens = min(self.rate, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens < 1:
+            return False
+        self.tokens -= 1
+        return True
+
+
+class FakeBaseServer(ThreadingHTTPServer):
+    """内存中的多维表格：app_token -> 数据表 -> 字段和记录"""
+    daemon_threads = True
+
+    def __init__(self, port: int = 0, latency: float = 0.0, rate_limits: Optional[Dict[str, float]] = None):
+        super().__init__(('127.0.0.1', port), FakeBaseHandler)
+        self.latency = latency
+        self.rate_limits = dict(rate_limits or {})
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.tables: Dict[str, Dict[str, Any]] = {}
+            self.next_id = 0
+            self.buckets = {category: TokenBucket(rate) for category, rate in self.rate_limits.items()}
+            self.reset_stats()
+
+    def reset_stats(self):
+        self.stats = {
+            'calls': {category: 0 for category in CATEGORIES},
+            'throttled': 0,
+            'bytes_received': 0,
+            'bytes_sent': 0,
+            'connections': 0,
+        }
+
+    def new_id(self, prefix: str) -> str:
+        self.next_id += 1
+        return f"{prefix}{self.next_id:08d}"
+
+
+class FakeBaseHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.stats['connections'] += 1
+
+    def do_GET(self):
+        self.handle_request()
+
+    def do_POST(self):
+        self.handle_request()
+
+    def handle_request(self):
+        server = self.server
+        length = int(self.headers.get('Content-Length') or 0)
+        raw_body = self.rfile.read(length) if length else b''
+        url = urlsplit(self.path)
+
+        if url.path.startswith('/_bench/'):
+            self.handle_control(url.path)
+            return
+
+        category = self.category(self.command, url.path)
+        with server.lock:
+            server.stats['calls'][category] += 1
+            server.stats['bytes_received'] += len(self.raw_requestline) + len(str(self.headers)) + len(raw_body)
+            bucket = server.buckets.get(category)
+            allowed = bucket is None or bucket.take()
+            if not allowed:
+                server.stats['throttled'] += 1
+        if server.latency:
+            time.sleep(server.latency)
+        if not allowed:
+            self.reply(429, {'code': CODE_TOO_MANY_REQUESTS, 'msg': 'TooManyRequest'})
+            return
+
+        query = {k: v[0] for k, v in parse_qs(url.query).items()}
+        body = json.loads(raw_body) if raw_body else None
+        with server.lock:
+            code, msg, data = self.route(self.command, url.path.split('/')[6:], query, body)
+        self.reply(200, {'code': code, 'msg': msg, 'data': data})
+
+    def handle_control(self, path: str):
+        server = self.server
+        if path == '/_bench/stats':
+            with server.lock:
+                stats = json.loads(json.dumps(server.stats))
+                stats['records'] = {table['name']: len(table['records']) for table in server.tables.values()}
+            self.reply(200, stats, count=False)
+        elif path == '/_bench/reset_stats':
+            with server.lock:
+                server.reset_stats()
+            self.reply(200, {}, count=False)
+        else:
+            server.reset()
+            self.reply(200, {}, count=False)
+
+    @staticmethod
+    def category(method: str, path: str) -> str:
+        """按rate_limiter的接口类别归类：列表为read，记录批量写入为write，创建数据表和字段为meta"""
+        if method == 'GET':
+            return 'read'
+        if '/records/' in path:
+            return 'write'
+        return 'meta'
+
+    def route(self, method: str, parts, query: Dict[str, str], body: Any) -> Tuple[int, str, Any]:
+        """parts为 /open-apis/bitable/v1/apps/:app_token/ 之后的路径段"""
+        server = self.server
+        if parts == ['tables']:
+            if method == 'GET':
+                items = [{'table_id': table_id, 'name': table['name'], 'revision': 1}
+                         for table_id, table in server.tables.items()]
+                return 0, 'success', {'items': items, 'has_more': False, 'total': len(items)}
+            table_id = server.new_id('tbl')
+            spec = body['table']
+            server.tables[table_id] = {
+                'name': spec['name'],
+                'fields': [field['field_name'] for field in spec.get('fields') or []],
+                'records': {},
+            }
+            return 0, 'success', {'table_id': table_id, 'default_view_id': 'vew0', 'field_id_list': []}
+
+        table = server.tables.get(parts[1]) if len(parts) > 2 else None
+        if table is None:
+            return CODE_NOT_FOUND, 'TableIdNotFound', None
+        resource, action = parts[2], parts[3] if len(parts) > 3 else None
+
+        if resource == 'fields':
+            if method == 'GET':
+                return 0, 'success', self.page(
+                    [{'field_id': name, 'field_name': name, 'type': 1} for name in table['fields']], query, 100)
+            table['fields'].append(body['field_name'])
+            return 0, 'success', {'field': {'field_id': body['field_name'], 'field_name': body['field_name'],
+                                            'type': body.get('type', 1)}}
+
+        records = table['records']
+        if action is None:
+            names = json.loads(query['field_names']) if 'field_names' in query else None
+            result = self.page(list(records.items()), query, 500)
+            result['items'] = [{'record_id': record_id,
+                                'fields': fields if names is None else {k: v for k, v in fields.items() if k in names}}
+                               for record_id, fields in result['items']]
+            return 0, 'success', result
+
+        # 飞书对整批记录校验字段，任意一条包含不存在的字段时整批失败
+        known = set(table['fields'])
+        for record in body['records'] if action != 'batch_delete' else []:
+            unknown = [name for name in record.get('fields', {}) if name not in known]
+            if unknown:
+                return CODE_FIELD_NOT_FOUND, f"FieldNameNotFound: {unknown[0]}", None
+        if action == 'batch_create':
+            created = []
+            for record in body['records']:
+                record_id = server.new_id('rec')
+                records[record_id] = dict(record['fields'])
+                created.append({'record_id': record_id, 'fields': record['fields']})
+            return 0, 'success', {'records': created}
+        if action == 'batch_update':
+            for record in body['records']:
+                if record['record_id'] not in records:
+                    return CODE_NOT_FOUND, 'RecordIdNotFound', None
+            for record in body['records']:
+                records[record['record_id']].update(record['fields'])
+            return 0, 'success', {'records': body['records']}
+        if action == 'batch_delete':
+            for record_id in body['records']:
+                records.pop(record_id, None)
+            return 0, 'success', {'records': [{'record_id': record_id, 'deleted': True}
+                                              for record_id in body['records']]}
+        return CODE_NOT_FOUND, 'NotFound', None
+
+    @staticmethod
+    def page(items, query: Dict[str, str], max_size: int) -> Dict[str, Any]:
+        start = int(query.get('page_token') or 0)
+        size = min(int(query.get('page_size') or 20), max_size)
+        has_more = start + size < len(items)
+        return {'items': items[start:start + size], 'has_more': has_more,
+                'page_token': str(start + size) if has_more else None, 'total': len(items)}
+
+    def reply(self, status: int, payload: Dict[str, Any], count: bool = True):
+        content = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+        if count:
+            with self.server.lock:
+                self.server.stats['bytes_sent'] += len(content)
+
+
+def _serve(pipe, latency: float, rate_limits: Optional[Dict[str, float]]):
+    server = FakeBaseServer(latency=latency, rate_limits=rate_limits)
+    pipe.send(server.server_address[1])
+    server.serve_forever(poll_interval=0.05)
+
+
+def start_server_process(latency: float = 0.0,
+                         rate_limits: Optional[Dict[str, float]] = None) -> Tuple[multiprocessing.Process, str]:
+    """在独立进程中启动模拟服务，避免与被测同步器争用GIL，返回 (进程, domain)"""
+    parent, child = multiprocessing.Pipe()
+    process = multiprocessing.Process(target=_serve, args=(child, latency, rate_limits), daemon=True)
+    process.start()
+    port = parent.recv()
+    return process, f"http://127.0.0.1:{port}"
+
+
+def control(domain: str, action: str) -> Dict[str, Any]:
+    """调用控制接口：stats 获取统计，reset_stats 清零统计，reset 清空全部数据"""
+    method = 'GET' if action == 'stats' else 'POST'
+    with urlopen(Request(f"{domain}/_bench/{action}", method=method, data=b'' if method == 'POST' else None)) as resp:
+        return json.loads(resp.read())
+
+
+if __name__ == '__main__':
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else 8765
+    latency = float(sys.argv[2]) / 1000 if len(sys.argv) > 2 else 0.0
+    server = FakeBaseServer(port, latency)
+    print(f"模拟飞书多维表格接口: http://127.0.0.1:{server.server_address[1]}")
+    server.serve_forever()
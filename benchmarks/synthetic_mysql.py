@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+基准测试使用的合成MySQL数据
+按指定的列数和行数生成确定性的测试表，可以写入本地MySQL/MariaDB，
+也可以使用SQLite内存库模拟的pymysql连接（无需MySQL服务）
+"""
+
+import re
+import sqlite3
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from decimal import Decimal
+from itertools import count
+from typing import Any, Callable, Iterable, List, Optional, Tuple
+
+
+# 普通列按顺序循环使用的类型：(MySQL类型, SQLite类型, 按行号和列号生成值)
+COLUMN_TYPES: List[Tuple[str, str, Callable[[int, int], Any]]] = [
+    ('varchar(64)', 'TEXT', lambda row, col: f"name-{(row * 31 + col) % 99991}"),
+    ('int(11)', 'INTEGER', lambda row, col: (row * 7919 + col) % 1000003),
+    ('decimal(12,2)', 'TEXT', lambda row, col: Decimal((row * 13 + col) % 10000000) / 100),
+    ('datetime', 'TEXT', lambda row, col: datetime(2024, 1, 1) + timedelta(seconds=row * 37 + col)),
+    ('tinyint(1)', 'INTEGER', lambda row, col: (row + col) % 2),
+    ('text', 'TEXT', lambda row, col: 'lorem ipsum dolor sit amet ' * ((row + col) % 4 + 1)),
+    ('bigint(20)', 'INTEGER', lambda row, col: row * 1000003 + col),
+    ('double', 'REAL', lambda row, col: (row * 0.37 + col) % 1000),
+]
+
+# 每张表固定的主键和水位字段
+BASE_UPDATED_AT = datetime(2024, 6, 1)
+
+
+@dataclass
+class TableSpec:
+    """一张合成表：columns为除主键id和updated_at外的列数"""
+    name: str
+    rows: int
+    columns: int
+
+    def column_defs(self) -> List[Tuple[str, str, str]]:
+        """返回 [(列名, MySQL类型, SQLite类型)]"""
+        defs = [('id', 'bigint(20)', 'INTEGER'), ('updated_at', 'datetime', 'TEXT')]
+        for i in range(self.columns):
+            mysql_type, sqlite_type, _ = COLUMN_TYPES[i % len(COLUMN_TYPES)]
+            defs.append((f"col_{i}", mysql_type, sqlite_type))
+        return defs
+
+    def generate_row(self, row_id: int, revision: int = 0) -> List[Any]:
+        """生成一行数据，revision不同的同一行除主键外内容不同，用于模拟更新"""
+        values: List[Any] = [row_id, BASE_UPDATED_AT + timedelta(seconds=row_id + revision * 86400)]
+        for i in range(self.columns):
+            values.append(COLUMN_TYPES[i % len(COLUMN_TYPES)][2](row_id + revision * 7, i))
+        return values
+
+
+def _to_sql_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.strftime('%Y-%m-%d %H:%M:%S')
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+
+def insert_rows(conn, spec: TableSpec, rows: Iterable[List[Any]], chunk_size: int = 1000):
+    """按块插入数据行，conn为pymysql连接或SyntheticMySQL连接"""
+    names = ', '.join(f"`{name}`" for name, _, _ in spec.column_defs())
+    placeholders = ', '.join(['%s'] * (spec.columns + 2))
+    sql = f"INSERT INTO `{spec.name}` ({names}) VALUES ({placeholders})"
+    chunk = []
+    with conn.cursor() as cursor:
+        for row in rows:
+            chunk.append(row)
+            if len(chunk) >= chunk_size:
+                cursor.executemany(sql, chunk)
+                chunk = []
+        if chunk:
+            cursor.executemany(sql, chunk)
+    conn.commit()
+
+
+def update_rows(conn, spec: TableSpec, row_ids: Iterable[int], revision: int = 1):
+    """将指定行改为revision版本的内容"""
+    names = [name for name, _, _ in spec.column_defs()][1:]
+    assignments = ', '.join(f"`{name}` = %s" for name in names)
+    sql = f"UPDATE `{spec.name}` SET {assignments} WHERE `id` = %s"
+    with conn.cursor() as cursor:
+        cursor.executemany(sql, [spec.generate_row(row_id, revision)[1:] + [row_id] for row_id in row_ids])
+    conn.commit()
+
+
+def create_mysql_tables(conn, specs: List[TableSpec]):
+    """在MySQL中重建合成表并写入数据"""
+    with conn.cursor() as cursor:
+        for spec in specs:
+            columns = ', '.join(f"`{name}` {mysql_type}" + (' NOT NULL' if name == 'id' else '')
+                                for name, mysql_type, _ in spec.column_defs())
+            cursor.execute(f"DROP TABLE IF EXISTS `{spec.name}`")
+            cursor.execute(f"CREATE TABLE `{spec.name}` ({columns}, PRIMARY KEY (`id`)) ENGINE=InnoDB")
+    conn.commit()
+    for spec in specs:
+        insert_rows(conn, spec, (spec.generate_row(row_id) for row_id in range(1, spec.rows + 1)))
+    with conn.cursor() as cursor:
+        for spec in specs:
+            # 更新统计信息，使INFORMATION_SCHEMA中的估算行数接近实际
+            cursor.execute(f"ANALYZE TABLE `{spec.name}`")
+            cursor.fetchall()
+
+
+class SyntheticMySQL:
+    """SQLite内存库模拟的MySQL数据源
+
+    connect()返回行为与pymysql连接一致的对象：DictCursor/SSDictCursor返回字典，SSCursor返回元组，
+    日期时间和定点数按MySQL类型还原为datetime和Decimal；INFORMATION_SCHEMA和DESCRIBE查询按表定义应答
+    """
+
+    _ids = count()
+
+    def __init__(self, specs: List[TableSpec], database: str = 'bench'):
+        self.specs = {spec.name: spec for spec in specs}
+        self.database = database
+        # 共享缓存的内存库，每个连接独立打开，可在多个线程中并发读取
+        self.uri = f"file:synthetic_{id(self)}_{next(self._ids)}?mode=memory&cache=shared"
+        self._keeper = sqlite3.connect(self.uri, uri=True, check_same_thread=False)
+        self._converters = {}
+        for spec in specs:
+            defs = spec.column_defs()
+            columns = ', '.join(f"`{name}` {sqlite_type}" for name, _, sqlite_type in defs)
+            self._keeper.execute(f"CREATE TABLE `{spec.name}` ({columns}, PRIMARY KEY (`id`))")
+            for name, mysql_type, _ in defs:
+                if mysql_type == 'datetime':
+                    self._converters[name] = lambda value: datetime.strptime(value, '%Y-%m-%d %H:%M:%S')
+                elif mysql_type.startswith('decimal'):
+                    self._converters[name] = Decimal
+        self._keeper.commit()
+        conn = self.connect()
+        for spec in specs:
+            insert_rows(conn, spec, (spec.generate_row(row_id) for row_id in range(1, spec.rows + 1)))
+        conn.close()
+
+    def connect(self) -> 'SyntheticConnection':
+        return SyntheticConnection(self)
+
+    def close(self):
+        self._keeper.close()
+
+
+class SyntheticConnection:
+    """pymysql连接的最小替代，只实现同步器用到的接口"""
+
+    def __init__(self, source: SyntheticMySQL):
+        self.source = source
+        self.db = sqlite3.connect(source.uri, uri=True, check_same_thread=False)
+        self.open = True
+
+    def cursor(self, cursor_class=None) -> 'SyntheticCursor':
+        name = getattr(cursor_class, '__name__', 'DictCursor')
+        return SyntheticCursor(self, as_dict='Dict' in name)
+
+    def ping(self, reconnect: bool = False):
+        return True
+
+    def commit(self):
+        self.db.commit()
+
+    def rollback(self):
+        self.db.rollback()
+
+    def close(self):
+        if self.open:
+            self.db.close()
+            self.open = False
+
+
+class SyntheticCursor:
+    def __init__(self, conn: SyntheticConnection, as_dict: bool = True):
+        self.conn = conn
+        self.as_dict = as_dict
+        self._rows: Optional[Iterable] = None
+        self._columns: List[str] = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        self._rows = None
+
+    def execute(self, sql: str, params: Optional[Tuple] = None):
+        statement = sql.strip()
+        upper = statement.upper()
+        source = self.conn.source
+        if upper.startswith(('SET ', 'START TRANSACTION', 'ANALYZE ')):
+            self._set([], [])
+        elif upper.startswith('SHOW TABLES'):
+            self._set([f"Tables_in_{source.database}"], [(name,) for name in source.specs])
+        elif upper.startswith('DESCRIBE'):
+            spec = source.specs[re.search(r"`(\w+)`", statement).group(1)]
+            self._set(['Field', 'Type', 'Null', 'Key', 'Default', 'Extra'],
+                      [(name, mysql_type, 'NO' if name == 'id' else 'YES', 'PRI' if name == 'id' else '', None, '')
+                       for name, mysql_type, _ in spec.column_defs()])
+        elif 'INFORMATION_SCHEMA' in upper:
+            self._information_schema(statement, params)
+        else:
+            cursor = self.conn.db.execute(statement.replace('%s', '?'),
+                                          tuple(_to_sql_value(value) for value in params or ()))
+            columns = [d[0] for d in cursor.description] if cursor.description else []
+            self._set(columns, cursor)
+        return 0
+
+    def executemany(self, sql: str, rows: Iterable):
+        self.conn.db.executemany(sql.strip().replace('%s', '?'),
+                                 ([_to_sql_value(value) for value in row] for row in rows))
+
+    def _information_schema(self, statement: str, params: Optional[Tuple]):
+        specs = self.conn.source.specs
+        row_counts = {name: self.conn.db.execute(f"SELECT COUNT(*) FROM `{name}`").fetchone()[0] for name in specs}
+        if 'INFORMATION_SCHEMA.TABLES' in statement and 'table_name' in statement:
+            self._set(['table_name', 'table_rows', 'update_time'],
+                      [(name, row_counts[name], None) for name in specs])
+        elif 'INFORMATION_SCHEMA.TABLES' in statement:
+            self._set(['TABLE_ROWS'], [(row_counts[params[1]],)] if params[1] in specs else [])
+        elif 'INFORMATION_SCHEMA.COLUMNS' in statement:
+            self._set(['table_name', 'name', 'type', 'nullable', 'column_key', 'column_default', 'extra'],
+                      [(spec.name, name, mysql_type, 'NO' if name == 'id' else 'YES',
+                        'PRI' if name == 'id' else '', None, '')
+                       for spec in specs.values() for name, mysql_type, _ in spec.column_defs()])
+        elif "TABLE_NAME = '" in statement:
+            table = re.search(r"TABLE_NAME = '(\w+)'", statement).group(1)
+            self._set(['COLUMN_NAME'], [('id',)] if table in specs else [])
+        else:
+            self._set(['table_name', 'name'], [(name, 'id') for name in specs])
+
+    def _set(self, columns: List[str], rows: Iterable):
+        self._columns = columns
+        converters = self.conn.source._converters
+        plan = [(i, converters[name]) for i, name in enumerate(columns) if name in converters]
+        as_dict = self.as_dict
+
+        def convert():
+            for row in rows:
+                if plan:
+                    row = list(row)
+                    for i, converter in plan:
+                        if row[i] is not None:
+                            row[i] = converter(row[i])
+                yield dict(zip(columns, row)) if as_dict else tuple(row)
+
+        self._rows = convert()
+
+    def fetchone(self):
+        return next(self._rows, None)
+
+    def fetchmany(self, size: int = 1):
+        return [row for _, row in zip(range(size), self._rows)]
+
+    def fetchall(self):
+        return list(self._rows)
+
+    def __iter__(self):
+        return self._rows
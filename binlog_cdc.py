@@ -0,0 +1,381 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+MySQL binlog实时同步（CDC）
+读取MySQL行格式binlog，将插入/更新/删除事件合并为小批次写入飞书多维表格，
+写入成功后保存binlog位置，重启后从上次位置继续
+"""
+
+import os
+import sys
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from mysql_to_base_sync import MySQLConfig, BaseConfig, SyncConfig, MySQLToBaseSync, DataTypeMapper
+
+try:
+    from pymysqlreplication import BinLogStreamReader
+    from pymysqlreplication.event import HeartbeatLogEvent, XidEvent
+    from pymysqlreplication.row_event import WriteRowsEvent, UpdateRowsEvent, DeleteRowsEvent
+    CDC_EVENTS = [WriteRowsEvent, UpdateRowsEvent, DeleteRowsEvent, XidEvent, HeartbeatLogEvent]
+except ImportError:  # 可选依赖，只有CDC模式需要: pip install mysql-replication
+    BinLogStreamReader = None
+    CDC_EVENTS = None
+
+
+@dataclass
+class CDCConfig:
+    """binlog实时同步配置"""
+    server_id: int = 4001  # 作为从库连接时使用的server_id，需与其他从库不同
+    flush_interval: float = 1.0  # 变更最多累积多少秒后写入飞书
+    batch_size: int = 500  # 累积的变更达到该数量时立即写入飞书
+    tables: Optional[List[str]] = None  # 只同步指定的表，默认同步全部表
+    initial_sync: bool = True  # 没有保存的binlog位置时，记录当前位置后先执行一次全量同步
+
+
+class BinlogCDCSync:
+    """binlog实时同步器
+
+    复用MySQLToBaseSync的飞书客户端、限流重试、数据转换和本地同步状态。
+    事件按类名分派，stream_factory可以替换为产生桩事件的函数，便于测试
+    """
+
+    # 事件类名 -> 处理动作
+    EVENT_ACTIONS = {
+        'WriteRowsEvent': 'insert',
+        'UpdateRowsEvent': 'update',
+        'DeleteRowsEvent': 'delete',
+    }
+
+    # 实时同步要求的MySQL服务端变量：行格式binlog并记录完整行镜像；
+    # mysql-replication 1.0起只从binlog_row_metadata=FULL的列元数据获取列名，否则事件中没有列名
+    REQUIRED_SERVER_VARIABLES = {
+        'log_bin': 'ON',
+        'binlog_format': 'ROW',
+        'binlog_row_image': 'FULL',
+        'binlog_row_metadata': 'FULL',
+    }
+
+    def __init__(self, syncer: MySQLToBaseSync, cdc_config: Optional[CDCConfig] = None,
+                 stream_factory: Optional[Callable[..., Any]] = None):
+        self.syncer = syncer
+        self.config = cdc_config or CDCConfig()
+        self.logger = syncer.logger
+        self.stream_factory = stream_factory or BinLogStreamReader
+        mysql_config = syncer.mysql_config
+        self.source = f"{mysql_config.host}:{mysql_config.port}/{mysql_config.database}"
+
+        self.base_tables: Dict[str, str] = {}
+        # 表名 -> 同步上下文（飞书表格ID、行转换函数、主键、已存在记录索引），首次遇到该表的事件时加载
+        self._tables: Dict[str, Optional[Dict[str, Any]]] = {}
+        # 表名 -> 记录标识 -> ('upsert', 字段) 或 ('delete', None)，同一记录的多次变更只保留最后一次
+        self._pending: Dict[str, Dict[str, Tuple[str, Optional[Dict[str, Any]]]]] = {}
+        self._pending_count = 0
+        self._last_flush = time.monotonic()
+        # 最近一个事务提交后的binlog位置，只在事务边界保存，重启时可以安全地继续读取
+        self._safe_position: Optional[Tuple[str, int]] = None
+        self.stats = {'events': 0, 'created': 0, 'updated': 0, 'deleted': 0, 'flushes': 0}
+
+    def current_binlog_position(self) -> Tuple[str, int]:
+        """读取MySQL当前的binlog位置"""
+        with self.syncer.mysql_conn.cursor() as cursor:
+            try:
+                cursor.execute("SHOW MASTER STATUS")
+            except Exception:
+                # MySQL 8.4起改名为SHOW BINARY LOG STATUS
+                cursor.execute("SHOW BINARY LOG STATUS")
+            row = cursor.fetchone()
+        if not row:
+            raise Exception("无法获取binlog位置，请确认MySQL已开启binlog（binlog_format=ROW）")
+        return row['File'], int(row['Position'])
+
+    def check_binlog_settings(self):
+        """检查MySQL的binlog配置，不满足要求时抛出异常；不检查时缺少列名的事件会被丢弃或写错字段"""
+        names = ', '.join(f"'{name}'" for name in self.REQUIRED_SERVER_VARIABLES)
+        with self.syncer.mysql_conn.cursor() as cursor:
+            cursor.execute(f"SHOW GLOBAL VARIABLES WHERE Variable_name IN ({names})")
+            rows = cursor.fetchall()
+        values = {row['Variable_name'].lower(): str(row['Value']).upper() for row in rows}
+        invalid = [f"{name}={values.get(name, '未设置')}" for name, expected in self.REQUIRED_SERVER_VARIABLES.items()
+                   if values.get(name) != expected]
+        if invalid:
+            raise Exception(f"MySQL binlog配置不满足实时同步要求（{', '.join(invalid)}），需要开启binlog并设置 "
+                            "binlog_format=ROW、binlog_row_image=FULL、binlog_row_metadata=FULL（MySQL 8.0.1+）")
+
+    def start_position(self) -> Tuple[str, int]:
+        """确定开始读取的binlog位置
+
+        优先使用本地同步状态中保存的位置；没有时记录当前位置，
+        并按配置先执行一次全量同步，全量同步期间的变更会在之后重放
+        """
+        state_store = self.syncer.state_store
+        app_token = self.syncer.base_config.app_token
+        if state_store:
+            stored = state_store.get_binlog_position(app_token, self.source)
+            if stored:
+                self.logger.info(f"从保存的binlog位置继续: {stored[0]}:{stored[1]}")
+                return stored[0], int(stored[1])
+        else:
+            self.logger.warning("未配置state_path，binlog位置不会被保存，重启后将从最新位置开始")
+
+        position = self.current_binlog_position()
+        self.logger.info(f"没有保存的binlog位置，从当前位置开始: {position[0]}:{position[1]}")
+        if self.config.initial_sync:
+            self.logger.info("开始执行初始全量同步")
+            results = self.syncer.sync_all_tables()
+            failed = [table for table, success in results.items() if not success]
+            if failed:
+                raise Exception(f"初始全量同步失败的表: {failed}")
+            # 元数据缓存只在本次全量同步中有效，常驻运行期间按需读取最新的表结构
+            self.syncer.catalog = None
+        if state_store:
+            state_store.set_binlog_position(app_token, self.source, *position)
+        return position
+
+    def _table_context(self, table_name: str) -> Optional[Dict[str, Any]]:
+        """获取表的同步上下文，飞书中不存在对应表格时返回None"""
+        if table_name in self._tables:
+            return self._tables[table_name]
+
+        table_id = self.base_tables.get(table_name)
+        if not table_id:
+            self.base_tables = self.syncer.get_base_tables()
+            table_id = self.base_tables.get(table_name)
+        if not table_id:
+            self.logger.warning(f"飞书中不存在表格 {table_name}，忽略该表的变更，请先执行全量同步")
+            self._tables[table_name] = None
+            return None
+
+        schema = self.syncer.ensure_base_fields(table_name, table_id, self.syncer.get_table_schema(table_name))
+        primary_key = self.syncer.get_primary_key_columns(table_name) or None
+        column_names = [col['name'] for col in schema]
+        index = self.syncer._load_existing_index(table_name, table_id, primary_key, None)
+        if index is None:
+            raise Exception(f"表 {table_name} 获取飞书已存在记录失败")
+        records = index[0]
+        context = {
+            'table_id': table_id,
+            'convert_row': DataTypeMapper.compile_row_converter(schema),
+            'column_names': column_names,
+            'primary_key': primary_key,
+            'records': records,
+        }
+        self._tables[table_name] = context
+        return context
+
+    def _queue(self, table_name: str, context: Dict[str, Any], action: str, values: Dict[str, Any]) -> str:
+        """将一行变更加入待写入队列，返回记录标识"""
+        fields = context['convert_row'](values)
+        record_key = self.syncer._record_key(fields, context['primary_key'])
+        pending = self._pending.setdefault(table_name, {})
+        if record_key not in pending:
+            self._pending_count += 1
+        pending[record_key] = ('delete', None) if action == 'delete' else ('upsert', fields)
+        return record_key
+
+    def handle_event(self, event: Any):
+        """处理一个行变更事件"""
+        action = self.EVENT_ACTIONS.get(type(event).__name__)
+        if action is None:
+            return
+        table_name = event.table
+        if self.config.tables and table_name not in self.config.tables:
+            return
+        context = self._table_context(table_name)
+        if context is None:
+            return
+
+        self.stats['events'] += 1
+        for row in event.rows:
+            if action == 'update':
+                before_key = self._queue(table_name, context, 'upsert', row['before_values'])
+                after_key = self._queue(table_name, context, 'upsert', row['after_values'])
+                if before_key != after_key:
+                    # 主键被修改：删除旧记录
+                    self._pending[table_name][before_key] = ('delete', None)
+            else:
+                self._queue(table_name, context, action, row['values'])
+
+        if self._pending_count >= self.config.batch_size:
+            self.flush()
+
+    def flush(self):
+        """将累积的变更写入飞书，全部成功后保存binlog位置；失败时抛出异常，重启后从上次保存的位置重放"""
+        for table_name, pending in self._pending.items():
+            if pending:
+                self._flush_table(table_name, self._tables[table_name], pending)
+
+        self._pending = {}
+        self._pending_count = 0
+        self._last_flush = time.monotonic()
+        self.stats['flushes'] += 1
+        self._save_position()
+
+    def _flush_table(self, table_name: str, context: Dict[str, Any],
+                     pending: Dict[str, Tuple[str, Optional[Dict[str, Any]]]]):
+        syncer = self.syncer
+        table_id = context['table_id']
+        records = context['records']
+        column_names = context['column_names']
+
+        delete_keys = [key for key, (op, _) in pending.items() if op == 'delete' and key in records]
+        create_keys = [key for key, (op, _) in pending.items() if op == 'upsert' and key not in records]
+        update_keys = [key for key, (op, _) in pending.items() if op == 'upsert' and key in records]
+
+        if delete_keys:
+            if not syncer._batch_delete_records(table_id, [records[key] for key in delete_keys]):
+                raise Exception(f"表 {table_name} 删除记录失败")
+            for key in delete_keys:
+                records.pop(key, None)
+            if syncer.state_store:
+                syncer.state_store.delete_records(syncer.base_config.app_token, table_id, delete_keys)
+            self.stats['deleted'] += len(delete_keys)
+
+        if create_keys:
+            created_record_ids = []
+            new_records = [{'fields': pending[key][1]} for key in create_keys]
+            if not syncer._batch_create_records(table_id, new_records, created_record_ids):
+                raise Exception(f"表 {table_name} 创建记录失败")
+            records.update(zip(create_keys, created_record_ids))
+            syncer._save_record_state(
+                table_id, [(key, DataTypeMapper.fingerprint(pending[key][1], column_names)) for key in create_keys],
+                created_record_ids)
+            self.stats['created'] += len(create_keys)
+
+        if update_keys:
+            update_records = [
+                {'record_id': records[key], 'fields': syncer._update_fields(pending[key][1], column_names)}
+                for key in update_keys
+            ]
+            if not syncer._batch_update_records(table_id, update_records):
+                raise Exception(f"表 {table_name} 更新记录失败")
+            syncer._save_record_state(
+                table_id, [(key, DataTypeMapper.fingerprint(pending[key][1], column_names)) for key in update_keys],
+                [records[key] for key in update_keys])
+            self.stats['updated'] += len(update_keys)
+
+        self.logger.info(f"表 {table_name} 实时同步 - 新增: {len(create_keys)}, "
+                         f"更新: {len(update_keys)}, 删除: {len(delete_keys)}")
+
+    def _save_position(self):
+        if self._safe_position and self.syncer.state_store:
+            self.syncer.state_store.set_binlog_position(
+                self.syncer.base_config.app_token, self.source, *self._safe_position)
+
+    def run(self, max_events: Optional[int] = None):
+        """持续读取binlog并写入飞书，max_events用于测试时处理指定数量的行事件后退出"""
+        if self.stream_factory is None:
+            raise Exception("binlog实时同步需要安装mysql-replication: pip install mysql-replication")
+
+        self.check_binlog_settings()
+        log_file, log_pos = self.start_position()
+        self._safe_position = (log_file, log_pos)
+        mysql_config = self.syncer.mysql_config
+        stream = self.stream_factory(
+            connection_settings={
+                'host': mysql_config.host,
+                'port': mysql_config.port,
+                'user': mysql_config.username,
+                'passwd': mysql_config.password,
+            },
+            server_id=self.config.server_id,
+            only_schemas=[mysql_config.database],
+            only_tables=self.config.tables,
+            only_events=CDC_EVENTS,
+            log_file=log_file,
+            log_pos=log_pos,
+            resume_stream=True,
+            blocking=True,
+            # 没有新事件时服务端按该间隔发送心跳，用于按时写入累积的变更
+            slave_heartbeat=self.config.flush_interval,
+        )
+        self.logger.info(f"开始读取binlog: {log_file}:{log_pos}")
+
+        failed = False
+        try:
+            for event in stream:
+                event_name = type(event).__name__
+                if event_name == 'XidEvent':
+                    self._safe_position = (stream.log_file, stream.log_pos)
+                elif event_name != 'HeartbeatLogEvent':
+                    self.handle_event(event)
+
+                if self._pending_count == 0:
+                    # 没有待写入的变更时也推进位置，避免重启后重读大量无关事件
+                    if event_name in ('XidEvent', 'HeartbeatLogEvent'):
+                        self._save_position()
+                elif time.monotonic() - self._last_flush >= self.config.flush_interval:
+                    self.flush()
+
+                if max_events is not None and self.stats['events'] >= max_events:
+                    break
+        except Exception:
+            # 出错（包括写入失败）时不再写入累积的变更，避免再次失败掩盖原始错误；重启后从保存的位置重放
+            failed = True
+            raise
+        finally:
+            try:
+                if self._pending_count and not failed:
+                    self.flush()
+            finally:
+                stream.close()
+                self.logger.info(f"binlog实时同步结束: {self.stats}")
+
+
+def run_cdc_with_config(mysql_host: str, mysql_port: int, mysql_username: str,
+                        mysql_password: str, mysql_database: str,
+                        app_token: str, personal_base_token: str,
+                        region: str = 'domestic',
+                        state_path: Optional[str] = None,
+                        cdc_config: Optional[CDCConfig] = None):
+    """使用指定配置启动binlog实时同步"""
+    syncer = MySQLToBaseSync(
+        MySQLConfig(host=mysql_host, port=mysql_port, username=mysql_username,
+                    password=mysql_password, database=mysql_database),
+        BaseConfig(app_token=app_token, personal_base_token=personal_base_token, region=region),
+        SyncConfig(state_path=state_path),
+    )
+
+    try:
+        if not syncer.connect_mysql():
+            raise Exception("MySQL连接失败")
+        if not syncer.connect_base():
+            raise Exception("飞书多维表格连接失败")
+        BinlogCDCSync(syncer, cdc_config).run()
+    finally:
+        syncer.close_connections()
+
+
+def main():
+    """命令行模式，从环境变量读取配置"""
+    tables = os.getenv('CDC_TABLES', '').strip()
+    cdc_config = CDCConfig(
+        server_id=int(os.getenv('CDC_SERVER_ID') or 4001),
+        flush_interval=float(os.getenv('CDC_FLUSH_INTERVAL') or 1.0),
+        tables=[table.strip() for table in tables.split(',') if table.strip()] or None,
+        initial_sync=os.getenv('CDC_INITIAL_SYNC', 'true').strip().lower() in ('true', '1', 'yes', 'on'),
+    )
+
+    try:
+        run_cdc_with_config(
+            mysql_host=os.getenv('MYSQL_HOST'),
+            mysql_port=int(os.getenv('MYSQL_PORT') or 3306),
+            mysql_username=os.getenv('MYSQL_USERNAME'),
+            mysql_password=os.getenv('MYSQL_PASSWORD'),
+            mysql_database=os.getenv('MYSQL_DATABASE'),
+            app_token=os.getenv('APP_TOKEN'),
+            personal_base_token=os.getenv('PERSONAL_BASE_TOKEN'),
+            region=os.getenv('REGION', 'domestic'),
+            state_path=os.getenv('STATE_PATH') or None,
+            cdc_config=cdc_config,
+        )
+    except KeyboardInterrupt:
+        print("\n用户中断操作")
+    except Exception as e:
+        print(f"实时同步失败: {e}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
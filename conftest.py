@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试共用的同步器工厂和飞书接口响应桩
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from mysql_to_base_sync import MySQLConfig, BaseConfig, SyncConfig, MySQLToBaseSync
+
+
+def make_configs(database='test', personal_base_token='token', **options):
+    """连接本地测试库的MySQL、飞书和同步配置，关键字参数为SyncConfig参数"""
+    return (MySQLConfig(host='localhost', port=3306, username='root', password='', database=database),
+            BaseConfig(app_token='app', personal_base_token=personal_base_token),
+            SyncConfig(**options))
+
+
+def reply(data=None, success=True, code=1254000, msg=None, request_bytes=None):
+    """飞书接口响应桩，字段与SDK响应一致；失败时使用code作为错误码"""
+    raw = SimpleNamespace(status_code=200, headers={})
+    if request_bytes is not None:
+        raw.request_bytes = request_bytes
+    return SimpleNamespace(code=0 if success else code, msg=msg or ('success' if success else 'error'), data=data,
+                           raw=raw, success=lambda: success)
+
+
+def stub_base_client(**apis):
+    """只包含指定接口的飞书客户端桩，如stub_base_client(app_table_record=record_api)"""
+    return SimpleNamespace(base=SimpleNamespace(v1=SimpleNamespace(**apis)))
+
+
+@pytest.fixture
+def make_syncer():
+    """同步器工厂：make_syncer(base_client=None, **options)，options为SyncConfig参数，base_client为替换的飞书客户端"""
+    def factory(base_client=None, personal_base_token='token', **options) -> MySQLToBaseSync:
+        syncer = MySQLToBaseSync(*make_configs(personal_base_token=personal_base_token, **options))
+        if base_client is not None:
+            syncer.base_client = base_client
+        return syncer
+    return factory
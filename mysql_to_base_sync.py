@@ -11,13 +11,35 @@ import json
 import logging
 import hashlib
 from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Callable, Dict, List, Any, Optional, Set, Tuple, Union
 from dataclasses import dataclass
 import time
+import copy
+import uuid
+import threading
+import queue
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
+from collections import OrderedDict
+from itertools import islice
+from numbers import Number
 
 import pymysql
-from baseopensdk import BaseClient, LARK_DOMAIN, FEISHU_DOMAIN
-from baseopensdk.api.base.v1 import *
+
+from lazy_import import LazyModule
+from sync_state import SyncStateStore
+from base_transport import AsyncTransportClient
+from sync_report import SyncReport, TableMetrics, ENDPOINT_STAGES
+from record_batcher import RecordBatcher, OVERSIZED_TRUNCATE
+from sync_filters import TableFilter
+from rate_limiter import (
+    RateLimiter, RetryPolicy, ApiCallStats, classify_response, get_retry_after,
+    RESPONSE_OK, RESPONSE_FATAL, RESPONSE_THROTTLED, RESPONSE_TRANSIENT,
+)
+
+# baseopensdk在第一次构建请求时才导入，缩短冷启动（如Lambda初始化）的耗时
+baseopensdk = LazyModule('baseopensdk')
+base_v1 = LazyModule('baseopensdk.api.base.v1')
 
 
 @dataclass
@@ -38,6 +60,89 @@ class BaseConfig:
     region: str = 'domestic'  # 'domestic' for 国内飞书, 'overseas' for 海外Lark
 
 
+# MySQL读取方式和飞书接口传输方式的可选值
+READ_MODES = ('keyset', 'stream')
+BASE_TRANSPORTS = ('sdk', 'async')
+
+
+@dataclass
+class SyncConfig:
+    """同步行为配置"""
+    read_mode: str = 'keyset'  # 'keyset': 按主键分页查询, 'stream': 服务端游标单次查询流式读取
+    max_workers: int = 1  # 并发同步的表数量，每个工作线程使用独立的MySQL连接
+    rate_limits: Optional[Dict[str, float]] = None  # 各类飞书接口的QPS，未配置的类别使用默认值
+    max_retries: int = 5  # 飞书接口遇到限流或临时错误时的最大重试次数
+    skip_unchanged: bool = True  # 增量同步时跳过内容未变化的记录，不重复写入
+    state_path: Optional[str] = None  # 本地同步状态（SQLite）文件路径，设置后复用上次的记录索引
+    watermark: bool = False  # 水位增量同步：只读取水位字段不小于上次水位的行（需要state_path）
+    watermark_columns: Optional[Dict[str, str]] = None  # 表名 -> 水位字段，未配置的表自动识别
+    mirror: bool = False  # 镜像模式：删除飞书中存在但MySQL中已不存在的记录
+    pipeline_depth: int = 2  # 读取、转换、写入流水线各阶段之间最多缓冲的页数，0表示按顺序执行
+    shards: int = 1  # 单表按主键范围切分后并发同步的分片数，1表示不切分
+    shard_min_rows: int = 1000000  # 估算行数不少于该值的表才切分
+    base_transport: str = 'sdk'  # 'sdk': baseopensdk客户端逐个发送请求, 'async': asyncio连接池，复用keep-alive长连接
+    max_in_flight: int = 4  # async传输时同时在途的飞书请求数上限（所有工作线程共享），每个表或分片同时只有一个请求，max_workers和shards均为1时不起作用
+    resume: bool = False  # 断点续传：每批写入后保存读取位置，中断后下次从断点继续（需要state_path）
+    max_run_seconds: Optional[float] = None  # 单次运行的时间上限（秒），到达后写完当前批次即停止，配合resume分多次完成
+    max_batch_bytes: int = 5 * 1024 * 1024  # 批量写入请求体的字节预算，批次在达到500条或该字节数时结束
+    oversized_record: str = 'split'  # 单条记录超过字节预算时: 'split' 单独写入, 'truncate' 截断最长的文本字段
+    include_tables: Optional[List[str]] = None  # 只同步匹配的表（fnmatch模式，如 orders、log_*），默认全部表
+    exclude_tables: Optional[List[str]] = None  # 不同步匹配的表
+    include_columns: Optional[List[str]] = None  # 只同步匹配的列，格式为 表.列（如 orders.id、users.*），未匹配到的表同步全部列
+    exclude_columns: Optional[List[str]] = None  # 不同步匹配的列，格式同include_columns（如 *.password_hash）
+    row_filters: Optional[Dict[str, str]] = None  # 表名（可用模式）-> 读取时附加的WHERE条件，如 deleted_at IS NULL
+
+    def __post_init__(self):
+        if self.read_mode not in READ_MODES:
+            raise ValueError(f"未知的读取方式: {self.read_mode}，可选值: {', '.join(READ_MODES)}")
+        if self.base_transport not in BASE_TRANSPORTS:
+            raise ValueError(f"未知的飞书接口传输方式: {self.base_transport}，可选值: {', '.join(BASE_TRANSPORTS)}")
+
+
+class SyncResults(dict):
+    """同步结果：表名 -> 是否成功，同时附带飞书接口调用统计、各表记录数统计和结构化的同步报告"""
+    
+    def __init__(self, *args, api_stats: Optional[Dict[str, Any]] = None,
+                 table_stats: Optional[Dict[str, Dict[str, int]]] = None,
+                 report: Optional[SyncReport] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.api_stats: Dict[str, Any] = api_stats or {}
+        self.table_stats: Dict[str, Dict[str, int]] = table_stats or {}
+        self.report: SyncReport = report or SyncReport()
+
+
+@dataclass
+class TableCatalog:
+    """一个MySQL表的元数据，来自INFORMATION_SCHEMA"""
+    schema: List[Dict]
+    primary_key: List[str]
+    estimated_rows: Optional[int] = None  # TABLE_ROWS，InnoDB为统计值，不精确
+    update_time: Optional[datetime] = None  # UPDATE_TIME，部分存储引擎或版本下为NULL
+
+
+@dataclass
+class TableSyncContext:
+    """单表同步过程中各分片共享的状态，已存在记录索引等由各分片共同读写"""
+    mysql_table: str
+    table_id: str
+    column_names: List[str]
+    primary_key: Optional[List[str]]
+    paging_columns: Optional[List[str]]
+    conditions: List[Tuple[str, Tuple]]
+    incremental: bool
+    skip_unchanged: bool
+    track_fingerprints: bool
+    watermark_column: Optional[str]
+    convert_rows: Callable[[List[Dict[str, Any]]], List[Dict[str, Any]]]
+    existing_records: Dict[str, str]
+    existing_fingerprints: Dict[str, str]
+    seen_keys: Optional[Set[str]]
+    # 断点续传时的断点：起始位置、断点对应的读取条件和此前累计的记录数，每批写入后更新；None表示不保存断点
+    checkpoint: Optional[Dict[str, Any]] = None
+    # 按列过滤时从MySQL读取的列，None表示读取全部列
+    select_columns: Optional[List[str]] = None
+
+
 class DataTypeMapper:
     """数据类型映射器"""
     
@@ -97,53 +202,230 @@ class DataTypeMapper:
         base_type = mysql_type.lower().split('(')[0].strip()
         return cls.TYPE_MAPPING.get(base_type, 'Text')
     
+    # 各类基础类型的值转换函数，按MySQL字段类型缓存
+    _value_converters: Dict[str, Callable[[Any], Any]] = {}
+    
+    @staticmethod
+    def _convert_datetime(value: Any) -> Any:
+        if isinstance(value, (datetime,)):
+            return int(value.timestamp() * 1000)  # 转换为毫秒时间戳
+        elif isinstance(value, str):
+            try:
+                dt = datetime.strptime(value, '%Y-%m-%d %H:%M:%S')
+                return int(dt.timestamp() * 1000)
+            except ValueError:
+                return value
+        return None
+    
     @classmethod
-    def convert_value(cls, value: Any, mysql_type: str) -> Any:
-        """转换数据值"""
-        if value is None:
-            return None
-            
+    def value_converter(cls, mysql_type: str) -> Callable[[Any], Any]:
+        """获取指定MySQL字段类型的值转换函数（输入不为None），类型解析只在首次调用时执行"""
+        converter = cls._value_converters.get(mysql_type)
+        if converter is not None:
+            return converter
+        
         base_type = mysql_type.lower().split('(')[0].strip()
         
         # 日期时间类型转换
         if base_type in ['date', 'datetime', 'timestamp']:
-            if isinstance(value, (datetime,)):
-                return int(value.timestamp() * 1000)  # 转换为毫秒时间戳
-            elif isinstance(value, str):
-                try:
-                    dt = datetime.strptime(value, '%Y-%m-%d %H:%M:%S')
-                    return int(dt.timestamp() * 1000)
-                except:
-                    return value
-        
+            converter = cls._convert_datetime
         # 布尔类型转换
         elif base_type in ['boolean', 'bool']:
-            return bool(value)
-        
+            converter = bool
         # 数值类型转换
         elif base_type in ['tinyint', 'smallint', 'mediumint', 'int', 'integer', 'bigint']:
-            return int(value) if value is not None else None
+            converter = int
         elif base_type in ['float', 'double', 'decimal', 'numeric']:
-            return float(value) if value is not None else None
-        
+            converter = float
         # 其他类型转为字符串
         else:
-            return str(value) if value is not None else None
+            converter = str
+        
+        cls._value_converters[mysql_type] = converter
+        return converter
+    
+    @classmethod
+    def convert_value(cls, value: Any, mysql_type: str) -> Any:
+        """转换数据值"""
+        if value is None:
+            return None
+        return cls.value_converter(mysql_type)(value)
+    
+    @classmethod
+    def compile_row_converter(cls, schema: List[Dict]) -> Callable[[Dict[str, Any]], Dict[str, Any]]:
+        """将表结构编译为行转换函数：MySQL行 -> 飞书记录字段，省略值为NULL的字段
+
+        每个字段的转换函数在编译时确定，逐行转换时不再解析字段类型
+        """
+        converters = tuple((col['name'], cls.value_converter(col['type'])) for col in schema)
+        
+        def convert_row(row: Dict[str, Any]) -> Dict[str, Any]:
+            fields = {}
+            for col_name, converter in converters:
+                value = row.get(col_name)
+                if value is not None:
+                    value = converter(value)
+                    if value is not None:
+                        fields[col_name] = value
+            return fields
+        
+        return convert_row
+    
+    @classmethod
+    def column_converter(cls, mysql_type: str) -> Callable[[List[Any]], List[Any]]:
+        """获取指定MySQL字段类型的整列转换函数：值列表 -> 转换后的值列表，NULL保持为None"""
+        converter = cls.value_converter(mysql_type)
+        if converter is cls._convert_datetime:
+            return cls._convert_datetime_column
+        
+        def convert_column(values: List[Any]) -> List[Any]:
+            return [None if value is None else converter(value) for value in values]
+        
+        return convert_column
+    
+    @classmethod
+    def compile_batch_converter(cls, schema: List[Dict]) -> Callable[[List[Dict[str, Any]]], List[Dict[str, Any]]]:
+        """将表结构编译为按列批量转换函数：一页MySQL行 -> 飞书记录字段列表
+
+        逐列转换整页数据，结果与逐行调用compile_row_converter的转换函数一致
+        """
+        columns = tuple((col['name'], cls.column_converter(col['type'])) for col in schema)
+        names = tuple(col_name for col_name, _ in columns)
+        
+        def convert_rows(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+            if not columns:
+                return [{} for _ in rows]
+            converted = [convert_column([row.get(col_name) for row in rows]) for col_name, convert_column in columns]
+            return [{col_name: value for col_name, value in zip(names, values) if value is not None}
+                    for values in zip(*converted)]
+        
+        return convert_rows
+    
+    # 本地时区相对UTC的偏移秒数，按日期（距1970-01-01的天数）缓存；当天有时区切换时为None
+    _day_offsets: Dict[int, Optional[int]] = {}
+    _EPOCH = datetime(1970, 1, 1)
+    
+    @classmethod
+    def _local_day_offset(cls, day: int) -> Optional[int]:
+        offset = None
+        try:
+            start = cls._EPOCH + timedelta(days=day)
+            end = start + timedelta(seconds=86399)
+            start_offset = day * 86400 - int(start.timestamp())
+            end_offset = day * 86400 + 86399 - int(end.timestamp())
+            if start_offset == end_offset:
+                offset = start_offset
+        except (OverflowError, OSError, ValueError):
+            pass
+        cls._day_offsets[day] = offset
+        return offset
+    
+    @classmethod
+    def _convert_datetime_column(cls, values: List[Any]) -> List[Any]:
+        """整列转换日期时间值
+
+        datetime.timestamp()对每个值都要查询两次本地时区，非UTC时区下开销较大。
+        这里按日期缓存时区偏移，用与timestamp()相同的运算（整数秒 + 微秒 / 1e6）
+        计算不带时区的datetime，结果与逐个转换逐位一致；当天有时区切换时逐个转换
+        """
+        if time.timezone == 0 and time.altzone == 0:
+            return [None if value is None else cls._convert_datetime(value) for value in values]
+        
+        epoch = cls._EPOCH
+        day_offsets = cls._day_offsets
+        result = []
+        for value in values:
+            if type(value) is datetime and value.tzinfo is None:
+                delta = value - epoch
+                day = delta.days
+                offset = day_offsets[day] if day in day_offsets else cls._local_day_offset(day)
+                if offset is not None:
+                    result.append(int((day * 86400 + delta.seconds - offset + value.microsecond / 1e6) * 1000))
+                    continue
+            result.append(None if value is None else cls._convert_datetime(value))
+        return result
+    
+    @classmethod
+    def normalize_value(cls, value: Any) -> Any:
+        """将写入飞书的值和飞书返回的值规整为可比较的形式，空值返回None
+
+        飞书返回的文本可能是富文本片段列表，多选是字符串列表，数字可能是浮点数；
+        整数保持原值（超过2^53的BIGINT转为浮点数会丢失精度），只把整数值的浮点数转为整数
+        """
+        if value is None or value == '' or value == []:
+            return None
+        if isinstance(value, bool):
+            return value
+        if isinstance(value, int):
+            return value
+        if isinstance(value, float):
+            return int(value) if value.is_integer() else value
+        if isinstance(value, dict):
+            return value.get('text', json.dumps(value, sort_keys=True, ensure_ascii=False))
+        if isinstance(value, list):
+            parts = [cls.normalize_value(item) for item in value]
+            # 富文本片段（文本、链接、@人员）按原文拼接，多选等字符串列表用逗号分隔
+            separator = '' if all(isinstance(item, dict) for item in value) else ','
+            return separator.join(str(part) for part in parts if part is not None)
+        return str(value)
+    
+    @classmethod
+    def fingerprint(cls, fields: Dict[str, Any], columns: List[str]) -> str:
+        """计算记录在指定字段上的内容指纹，用于判断记录是否需要更新"""
+        normalized = []
+        for col in columns:
+            value = cls.normalize_value(fields.get(col))
+            if value is not None:
+                normalized.append((col, value))
+        payload = json.dumps(normalized, ensure_ascii=False, default=str)
+        return hashlib.md5(payload.encode('utf-8')).hexdigest()
 
 
 class MySQLToBaseSync:
     """MySQL到飞书多维表格同步器"""
     
-    def __init__(self, mysql_config: MySQLConfig, base_config: BaseConfig):
+    # 流式读取时结果集会长时间占用连接，放宽服务端写超时避免飞书写入较慢时连接被断开
+    STREAM_NET_WRITE_TIMEOUT = 3600
+    # 校验本地同步状态时抽样比对的飞书记录数
+    STATE_VERIFY_SAMPLE_SIZE = 20
+    
+    def __init__(self, mysql_config: MySQLConfig, base_config: BaseConfig,
+                 sync_config: Optional[SyncConfig] = None):
         self.mysql_config = mysql_config
         self.base_config = base_config
+        self.sync_config = sync_config or SyncConfig()
         self.mysql_conn = None
         self.base_client = None
+        # 所有飞书接口调用共享同一个限流器和调用统计（包括并发同步的工作线程）
+        self.rate_limiter = RateLimiter(self.sync_config.rate_limits)
+        self.retry_policy = RetryPolicy(max_retries=self.sync_config.max_retries)
+        self.api_stats = ApiCallStats()
+        # 各表记录数统计：表名 -> {synced, created, updated, unchanged}
+        self.table_stats: Dict[str, Dict[str, int]] = {}
+        # 本次同步的结构化报告；table_metrics为当前同步的表的统计，不属于任何表的调用（如列出数据表）计入占位对象
+        self.report = SyncReport()
+        self.table_metrics = TableMetrics('')
+        # 单次运行的截止时间（time.monotonic），由max_run_seconds计算，None表示不限时
+        self.deadline: Optional[float] = None
+        # 飞书API限制批量写入每次最多500条记录，同时按请求体字节预算切分
+        self.record_batcher = RecordBatcher(max_records=500, max_bytes=self.sync_config.max_batch_bytes,
+                                            oversized=self.sync_config.oversized_record,
+                                            on_oversized=self._log_oversized_record)
+        self.table_filter = TableFilter(self.sync_config.include_tables, self.sync_config.exclude_tables,
+                                        self.sync_config.include_columns, self.sync_config.exclude_columns,
+                                        self.sync_config.row_filters)
+        # 本次同步的MySQL元数据缓存：表名 -> TableCatalog，未加载时各方法逐表查询
+        self.catalog: Optional[Dict[str, TableCatalog]] = None
+        # 本次同步的飞书字段缓存：table_id -> 字段名列表，每个飞书表格只拉取一次
+        self.field_catalog: Dict[str, List[str]] = {}
         self.logger = self._setup_logger()
+        self.state_store = SyncStateStore(self.sync_config.state_path) if self.sync_config.state_path else None
         
     def _setup_logger(self) -> logging.Logger:
-        """设置日志记录器"""
+        """设置日志记录器；处理器只添加一次，同一进程中多次创建同步器（如Lambda热容器）时日志不会重复输出"""
         logger = logging.getLogger('mysql_to_base_sync')
+        if logger.handlers:
+            return logger
         logger.setLevel(logging.INFO)
         
         # 创建控制台处理器
@@ -184,17 +466,36 @@ class MySQLToBaseSync:
             self.logger.error(f"连接MySQL数据库失败: {e}")
             return False
     
+    def check_connections(self) -> bool:
+        """复用已有连接前的健康检查：MySQL连接断开时重连，飞书客户端已关闭时重建，均失败时返回False"""
+        try:
+            self.mysql_conn.ping(reconnect=True)
+            # 结束上次同步遗留的隐式事务，本次读取看到最新的数据
+            self.mysql_conn.rollback()
+        except Exception as e:
+            self.logger.warning(f"MySQL连接已失效，重新连接: {e}")
+            if not self.connect_mysql():
+                return False
+        if self.base_client is None or getattr(self.base_client, 'closed', False):
+            return self.connect_base()
+        return True
+    
     def connect_base(self) -> bool:
         """连接飞书多维表格"""
         try:
             # 根据区域选择domain
-            domain = LARK_DOMAIN if self.base_config.region == 'overseas' else FEISHU_DOMAIN
+            domain = baseopensdk.LARK_DOMAIN if self.base_config.region == 'overseas' else baseopensdk.FEISHU_DOMAIN
             
-            self.base_client = BaseClient.builder() \
-                .app_token(self.base_config.app_token) \
-                .personal_base_token(self.base_config.personal_base_token) \
-                .domain(domain) \
-                .build()
+            if self.sync_config.base_transport == 'async':
+                self.base_client = AsyncTransportClient(domain, self.base_config.app_token,
+                                                        self.base_config.personal_base_token,
+                                                        max_in_flight=self.sync_config.max_in_flight)
+            else:
+                self.base_client = baseopensdk.BaseClient.builder() \
+                    .app_token(self.base_config.app_token) \
+                    .personal_base_token(self.base_config.personal_base_token) \
+                    .domain(domain) \
+                    .build()
             
             region_name = "海外Lark" if self.base_config.region == 'overseas' else "国内飞书"
             self.logger.info(f"成功连接到{region_name}多维表格")
@@ -203,8 +504,152 @@ class MySQLToBaseSync:
             self.logger.error(f"连接飞书多维表格失败: {e}")
             return False
     
+    def _call_base(self, endpoint: str, api_method, request):
+        """调用飞书多维表格接口
+
+        调用前按接口类别从限流器获取配额；遇到限流、5xx等临时错误或网络异常时
+        按指数退避加抖动重试，限流时同时下调该类别的请求速率，成功后逐步恢复。
+        重试耗尽后返回最后一次响应（或抛出最后一次网络异常）
+        """
+        attempt = 0
+        metrics = self.table_metrics
+        stage = ENDPOINT_STAGES.get(endpoint, 'base_meta')
+        while True:
+            waited = self.rate_limiter.acquire(endpoint)
+            self.api_stats.add_seconds('rate_limit_wait', waited)
+            metrics.add_seconds('rate_limit_wait', waited)
+            self.api_stats.incr('calls')
+            
+            response, error = None, None
+            started = time.perf_counter()
+            try:
+                response = api_method(request)
+                kind = classify_response(response)
+            except OSError as e:
+                # 网络连接、超时等异常（requests的异常均继承自OSError）
+                error = e
+                kind = RESPONSE_TRANSIENT
+            metrics.add_seconds(stage, time.perf_counter() - started)
+            metrics.add_api_call(self._request_bytes(request, response))
+            
+            if kind == RESPONSE_OK:
+                self.rate_limiter.recover(endpoint)
+                return response
+            if kind == RESPONSE_FATAL:
+                return response
+            
+            if kind == RESPONSE_THROTTLED:
+                self.api_stats.incr('throttled')
+                rate = self.rate_limiter.throttle(endpoint)
+                self.logger.warning(f"飞书接口触发限流，{endpoint}类接口速率降至 {rate:.2f} QPS")
+            else:
+                self.api_stats.incr('transient_errors')
+            
+            if attempt >= self.retry_policy.max_retries:
+                self.api_stats.incr('failed')
+                self.logger.error(f"飞书接口调用重试 {attempt} 次后仍失败")
+                if error is not None:
+                    raise error
+                return response
+            
+            retry_after = get_retry_after(response) if response is not None else None
+            delay = self.retry_policy.backoff(attempt, retry_after)
+            reason = error if error is not None else f"code={response.code}, msg={response.msg}"
+            self.logger.warning(f"飞书接口调用失败（{reason}），{delay:.2f}秒后第 {attempt + 1} 次重试")
+            self.api_stats.incr('retries')
+            self.api_stats.add_seconds('backoff', delay)
+            metrics.add_seconds('backoff', delay)
+            time.sleep(delay)
+            attempt += 1
+    
+    @staticmethod
+    def _request_bytes(request, response) -> int:
+        """请求体字节数：async传输直接取实际发送的字节数，SDK传输按相同的JSON序列化计算"""
+        sent = getattr(getattr(response, 'raw', None), 'request_bytes', None)
+        if isinstance(sent, int):
+            return sent
+        body = getattr(request, 'body', None)
+        if body is None:
+            return 0
+        try:
+            return len(baseopensdk.JSON.marshal(body).encode('utf-8'))
+        except (TypeError, ValueError):
+            return 0
+    
+    def load_catalog(self) -> bool:
+        """一次性读取整个数据库的表、字段和主键元数据并缓存，代替逐表的DESCRIBE和主键查询
+
+        共三次查询INFORMATION_SCHEMA（TABLES、COLUMNS、KEY_COLUMN_USAGE），
+        之后get_mysql_tables、get_table_schema、get_primary_key_columns、estimate_table_rows直接读取缓存
+        """
+        try:
+            database = self.mysql_config.database
+            catalog: Dict[str, TableCatalog] = {}
+            with self.mysql_conn.cursor() as cursor:
+                cursor.execute("""
+                    SELECT TABLE_NAME AS table_name, TABLE_ROWS AS table_rows, UPDATE_TIME AS update_time
+                    FROM INFORMATION_SCHEMA.TABLES
+                    WHERE TABLE_SCHEMA = %s
+                    ORDER BY TABLE_NAME
+                """, (database,))
+                for row in cursor.fetchall():
+                    catalog[row['table_name']] = TableCatalog(
+                        schema=[], primary_key=[],
+                        estimated_rows=int(row['table_rows']) if row['table_rows'] is not None else None,
+                        update_time=row['update_time'])
+                
+                # 与DESCRIBE的输出一一对应
+                cursor.execute("""
+                    SELECT TABLE_NAME AS table_name, COLUMN_NAME AS name, COLUMN_TYPE AS type,
+                           IS_NULLABLE AS nullable, COLUMN_KEY AS column_key, COLUMN_DEFAULT AS column_default,
+                           EXTRA AS extra
+                    FROM INFORMATION_SCHEMA.COLUMNS
+                    WHERE TABLE_SCHEMA = %s
+                    ORDER BY TABLE_NAME, ORDINAL_POSITION
+                """, (database,))
+                for row in cursor.fetchall():
+                    table = catalog.get(row['table_name'])
+                    if table is not None:
+                        table.schema.append({
+                            'name': row['name'],
+                            'type': row['type'],
+                            'null': row['nullable'] == 'YES',
+                            'key': row['column_key'],
+                            'default': row['column_default'],
+                            'extra': row['extra']
+                        })
+                
+                cursor.execute("""
+                    SELECT TABLE_NAME AS table_name, COLUMN_NAME AS name
+                    FROM INFORMATION_SCHEMA.KEY_COLUMN_USAGE
+                    WHERE TABLE_SCHEMA = %s AND CONSTRAINT_NAME = 'PRIMARY'
+                    ORDER BY TABLE_NAME, ORDINAL_POSITION
+                """, (database,))
+                for row in cursor.fetchall():
+                    table = catalog.get(row['table_name'])
+                    if table is not None:
+                        table.primary_key.append(row['name'])
+            
+            self.catalog = catalog
+            self.logger.info(f"已加载数据库 {database} 的元数据，共 {len(catalog)} 个表")
+            return True
+        except Exception as e:
+            self.logger.warning(f"批量加载MySQL元数据失败，改为逐表查询: {e}")
+            self.catalog = None
+            return False
+    
+    def _cached_table(self, table_name: str) -> Optional[TableCatalog]:
+        """从元数据缓存中获取表，未加载缓存或表不在缓存中（如同步期间新建的表）时返回None"""
+        if self.catalog is None:
+            return None
+        return self.catalog.get(table_name)
+    
     def get_mysql_tables(self) -> List[str]:
         """获取MySQL数据库中的所有表"""
+        if self.catalog is not None:
+            tables = list(self.catalog)
+            self.logger.info(f"发现 {len(tables)} 个MySQL表: {tables}")
+            return tables
         try:
             with self.mysql_conn.cursor() as cursor:
                 cursor.execute("SHOW TABLES")
@@ -217,6 +662,10 @@ class MySQLToBaseSync:
     
     def get_table_schema(self, table_name: str) -> List[Dict]:
         """获取MySQL表结构"""
+        cached = self._cached_table(table_name)
+        if cached is not None and cached.schema:
+            self.logger.info(f"获取表 {table_name} 结构，共 {len(cached.schema)} 个字段")
+            return [dict(col) for col in cached.schema]
         try:
             with self.mysql_conn.cursor() as cursor:
                 cursor.execute(f"DESCRIBE `{table_name}`")
@@ -240,75 +689,60 @@ class MySQLToBaseSync:
             self.logger.error(f"获取表 {table_name} 结构失败: {e}")
             return []
     
+    def _build_field(self, col: Dict, field_builder) -> Any:
+        """按MySQL字段生成飞书字段定义，field_builder为AppTableCreateHeader或AppTableField的builder"""
+        field_type = DataTypeMapper.get_base_field_type(col['type'])
+        type_mapping = {
+            'Text': 1,
+            'Number': 2, 
+            'SingleSelect': 3,
+            'MultiSelect': 4,
+            'DateTime': 5,
+            'Checkbox': 7,
+            'Attachment': 11
+        }
+        
+        field_builder \
+            .field_name(col['name']) \
+            .type(type_mapping.get(field_type, 1))  # 默认为文本类型
+        
+        # 添加ui_type（可选）
+        if field_type in ['SingleSelect', 'MultiSelect', 'DateTime', 'Checkbox', 'Attachment']:
+            field_builder.ui_type(field_type)
+        
+        # 为单选和多选字段添加选项
+        if field_type in ['SingleSelect', 'MultiSelect']:
+            property_builder = base_v1.AppTableFieldProperty.builder() \
+                .options([
+                    base_v1.AppTableFieldPropertyOption.builder()
+                        .name('选项1')
+                        .color(1)
+                        .build(),
+                    base_v1.AppTableFieldPropertyOption.builder()
+                        .name('选项2')
+                        .color(2)
+                        .build(),
+                    base_v1.AppTableFieldPropertyOption.builder()
+                        .name('选项3')
+                        .color(3)
+                        .build()
+                ])
+            field_builder.property(property_builder.build())
+        
+        return field_builder.build()
+    
     def create_base_table(self, table_name: str, schema: List[Dict]) -> Optional[str]:
         """在飞书多维表格中创建表"""
         try:
             # 构建字段定义 - 使用正确的AppTableCreateHeader.builder()格式
-            fields = []
-            for col in schema:
-                field_type = DataTypeMapper.get_base_field_type(col['type'])
-                type_mapping = {
-                    'Text': 1,
-                    'Number': 2, 
-                    'SingleSelect': 3,
-                    'MultiSelect': 4,
-                    'DateTime': 5,
-                    'Checkbox': 7,
-                    'Attachment': 11
-                }
-                
-                field_builder = AppTableCreateHeader.builder() \
-                    .field_name(col['name']) \
-                    .type(type_mapping.get(field_type, 1))  # 默认为文本类型
-                
-                # 添加ui_type（可选）
-                if field_type in ['SingleSelect', 'MultiSelect', 'DateTime', 'Checkbox', 'Attachment']:
-                    field_builder.ui_type(field_type)
-                
-                # 为单选和多选字段添加选项
-                if field_type == 'SingleSelect':
-                    property_builder = AppTableFieldProperty.builder() \
-                        .options([
-                            AppTableFieldPropertyOption.builder()
-                                .name('选项1')
-                                .color(1)
-                                .build(),
-                            AppTableFieldPropertyOption.builder()
-                                .name('选项2')
-                                .color(2)
-                                .build(),
-                            AppTableFieldPropertyOption.builder()
-                                .name('选项3')
-                                .color(3)
-                                .build()
-                        ])
-                    field_builder.property(property_builder.build())
-                elif field_type == 'MultiSelect':
-                    property_builder = AppTableFieldProperty.builder() \
-                        .options([
-                            AppTableFieldPropertyOption.builder()
-                                .name('选项1')
-                                .color(1)
-                                .build(),
-                            AppTableFieldPropertyOption.builder()
-                                .name('选项2')
-                                .color(2)
-                                .build(),
-                            AppTableFieldPropertyOption.builder()
-                                .name('选项3')
-                                .color(3)
-                                .build()
-                        ])
-                    field_builder.property(property_builder.build())
-                
-                fields.append(field_builder.build())
+            fields = [self._build_field(col, base_v1.AppTableCreateHeader.builder()) for col in schema]
             
             # 创建表请求
-            request = CreateAppTableRequest.builder() \
+            request = base_v1.CreateAppTableRequest.builder() \
                 .request_body(
-                    CreateAppTableRequestBody.builder()
+                    base_v1.CreateAppTableRequestBody.builder()
                     .table(
-                        ReqTable.builder()
+                        base_v1.ReqTable.builder()
                         .name(table_name)
                         .default_view_name("默认视图")
                         .fields(fields)
@@ -318,10 +752,11 @@ class MySQLToBaseSync:
                 ) \
                 .build()
             
-            response = self.base_client.base.v1.app_table.create(request)
+            response = self._call_base('meta', self.base_client.base.v1.app_table.create, request)
             
             if response.success():
                 table_id = response.data.table_id
+                self.field_catalog[table_id] = [col['name'] for col in schema]
                 self.logger.info(f"成功创建飞书表格: {table_name} (ID: {table_id})")
                 return table_id
             else:
@@ -335,8 +770,8 @@ class MySQLToBaseSync:
     def get_base_tables(self) -> Dict[str, str]:
         """获取飞书多维表格中的所有表"""
         try:
-            request = ListAppTableRequest.builder().build()
-            response = self.base_client.base.v1.app_table.list(request)
+            request = base_v1.ListAppTableRequest.builder().build()
+            response = self._call_base('read', self.base_client.base.v1.app_table.list, request)
             
             if response.success():
                 tables = {}
@@ -351,20 +786,283 @@ class MySQLToBaseSync:
             self.logger.error(f"获取飞书表格列表失败: {e}")
             return {}
     
-    def get_mysql_data(self, table_name: str, limit: int = 1000, offset: int = 0) -> List[Dict]:
-        """获取MySQL表数据"""
+    def get_mysql_data(self, table_name: str, limit: int = 1000, offset: int = 0,
+                       key_columns: Optional[List[str]] = None,
+                       last_key: Optional[Tuple] = None,
+                       conditions: Optional[List[Tuple[str, Tuple]]] = None,
+                       columns: Optional[List[str]] = None) -> List[Dict]:
+        """获取MySQL表数据
+
+        传入key_columns时使用键集分页（WHERE pk > last_key ORDER BY pk LIMIT n），
+        每页只扫描本页数据；未传入时回退到LIMIT/OFFSET分页。
+        conditions为附加的过滤条件列表 [(SQL片段, 参数)]，columns为读取的列（默认全部列）
+        """
         try:
-            with self.mysql_conn.cursor() as cursor:
-                cursor.execute(f"SELECT * FROM `{table_name}` LIMIT {limit} OFFSET {offset}")
-                data = cursor.fetchall()
-                self.logger.info(f"从表 {table_name} 获取 {len(data)} 条记录")
-                return data
+            return self._fetch_mysql_page(table_name, limit, offset, key_columns, last_key, conditions, columns)
         except Exception as e:
             self.logger.error(f"获取表 {table_name} 数据失败: {e}")
             return []
     
+    def _fetch_mysql_page(self, table_name: str, limit: int, offset: int = 0,
+                          key_columns: Optional[List[str]] = None,
+                          last_key: Optional[Tuple] = None,
+                          conditions: Optional[List[Tuple[str, Tuple]]] = None,
+                          columns: Optional[List[str]] = None) -> List[Dict]:
+        """获取一页MySQL数据，查询失败时抛出异常，避免同步把读取中断误当作已读完"""
+        with self.mysql_conn.cursor() as cursor:
+            if key_columns:
+                sql, params = self._build_select_query(table_name, conditions, key_columns, last_key, limit,
+                                                       columns=columns)
+            else:
+                sql, params = self._build_select_query(table_name, conditions, limit=limit, offset=offset,
+                                                       columns=columns)
+            cursor.execute(sql, params)
+            data = cursor.fetchall()
+            self.logger.info(f"从表 {table_name} 获取 {len(data)} 条记录")
+            return data
+    
+    @staticmethod
+    def _build_select_query(table_name: str, conditions: Optional[List[Tuple[str, Tuple]]] = None,
+                            key_columns: Optional[List[str]] = None, last_key: Optional[Tuple] = None,
+                            limit: Optional[int] = None, offset: Optional[int] = None,
+                            columns: Optional[List[str]] = None) -> Tuple[str, Tuple]:
+        """构建查询SQL
+
+        传入key_columns时按键集分页，联合主键使用行构造器比较 (a, b) > (%s, %s)；
+        conditions中的条件以AND连接；传入columns时只查询这些列，否则查询全部列
+        """
+        where = []
+        params: List = []
+        for condition, condition_params in conditions or []:
+            where.append(f"({condition})")
+            params.extend(condition_params)
+        
+        order_by = ''
+        if key_columns:
+            order_by = ', '.join(f"`{col}`" for col in key_columns)
+            if last_key is not None:
+                placeholders = ', '.join(['%s'] * len(key_columns))
+                if len(key_columns) == 1:
+                    where.append(f"{order_by} > {placeholders}")
+                else:
+                    where.append(f"({order_by}) > ({placeholders})")
+                params.extend(last_key)
+        
+        columns_sql = ', '.join(f"`{col}`" for col in columns) if columns else '*'
+        sql = f"SELECT {columns_sql} FROM `{table_name}`"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        if order_by:
+            sql += f" ORDER BY {order_by}"
+        if limit is not None:
+            sql += f" LIMIT {int(limit)}"
+        if offset is not None:
+            sql += f" OFFSET {int(offset)}"
+        return sql, tuple(params)
+    
+    def stream_mysql_rows(self, table_name: str, fetch_size: int = 1000,
+                          conditions: Optional[List[Tuple[str, Tuple]]] = None,
+                          columns: Optional[List[str]] = None):
+        """使用服务端游标（SSDictCursor）流式读取整表数据
+
+        整表只执行一次查询，逐行产出，内存占用与表大小无关。
+        流式读取期间该连接不能执行其他查询。
+        """
+        with self.mysql_conn.cursor() as cursor:
+            cursor.execute(f"SET SESSION net_write_timeout = {self.STREAM_NET_WRITE_TIMEOUT}")
+        
+        with self.mysql_conn.cursor(pymysql.cursors.SSDictCursor) as cursor:
+            sql, params = self._build_select_query(table_name, conditions, columns=columns)
+            cursor.execute(sql, params)
+            self.logger.info(f"开始流式读取表 {table_name}")
+            while True:
+                rows = cursor.fetchmany(fetch_size)
+                if not rows:
+                    break
+                yield from rows
+    
+    def _iter_mysql_batches(self, table_name: str, batch_size: int,
+                            key_columns: Optional[List[str]] = None,
+                            conditions: Optional[List[Tuple[str, Tuple]]] = None,
+                            last_key: Optional[Tuple] = None, offset: int = 0,
+                            columns: Optional[List[str]] = None):
+        """按批次遍历MySQL表数据
+
+        stream模式下对流式结果按批次切分；否则有主键时使用键集分页，无主键时回退到OFFSET分页。
+        last_key/offset为起始位置（从断点继续时使用）
+        """
+        if self.sync_config.read_mode == 'stream':
+            rows_iter = self.stream_mysql_rows(table_name, fetch_size=batch_size, conditions=conditions,
+                                               columns=columns)
+            while True:
+                rows = list(islice(rows_iter, batch_size))
+                if not rows:
+                    break
+                yield rows
+            return
+        
+        while True:
+            if key_columns:
+                rows = self._fetch_mysql_page(table_name, batch_size, key_columns=key_columns,
+                                              last_key=last_key, conditions=conditions, columns=columns)
+            else:
+                rows = self._fetch_mysql_page(table_name, batch_size, offset, conditions=conditions,
+                                              columns=columns)
+            if not rows:
+                break
+            
+            yield rows
+            
+            # 不足一页说明已读完，省去一次空查询
+            if len(rows) < batch_size:
+                break
+            if key_columns:
+                last_key = tuple(rows[-1][col] for col in key_columns)
+            else:
+                offset += batch_size
+    
+    def _pipeline(self, table_name: str, convert_rows: Callable[[List[Dict]], List[Dict]], batch_size: int,
+                  key_columns: Optional[List[str]] = None,
+                  conditions: Optional[List[Tuple[str, Tuple]]] = None,
+                  last_key: Optional[Tuple] = None, offset: int = 0,
+                  columns: Optional[List[str]] = None):
+        """按批次读取并转换MySQL数据，产出 (MySQL行列表, 飞书记录字段列表)
+
+        pipeline_depth大于0时，读取和转换分别在后台线程中执行，通过有界队列与调用方（写入飞书）衔接，
+        MySQL读取与飞书写入相互重叠；队列满时上游阻塞等待，内存占用不超过各阶段缓冲的页数。
+        调用方需要在结束后关闭返回的迭代器，以便停止后台线程并归还MySQL连接
+        """
+        depth = self.sync_config.pipeline_depth
+        metrics = self.table_metrics
+        pages = metrics.timed(self._iter_mysql_batches(table_name, batch_size, key_columns, conditions,
+                                                       last_key, offset, columns), 'mysql_read')
+        if depth <= 0:
+            return self._convert_pages(pages, convert_rows, metrics)
+        
+        pages = self._pipeline_stage(pages, depth, f"{table_name}-reader")
+        return self._pipeline_stage(self._convert_pages(pages, convert_rows, metrics), depth,
+                                    f"{table_name}-converter")
+    
+    @staticmethod
+    def _convert_pages(pages, convert_rows: Callable[[List[Dict]], List[Dict]], metrics: TableMetrics):
+        try:
+            for rows in pages:
+                with metrics.timer('convert'):
+                    converted = convert_rows(rows)
+                metrics.incr('converted', len(converted))
+                yield rows, converted
+        finally:
+            pages.close()
+    
+    # 流水线队列中表示上游已结束的标记
+    _PIPELINE_END = object()
+    
+    @classmethod
+    def _pipeline_stage(cls, iterable, depth: int, name: str):
+        """在后台线程中迭代iterable，结果经容量为depth的有界队列交给调用方
+
+        后台线程的异常在调用方重新抛出；调用方提前结束时通知后台线程停止并等待其退出
+        """
+        items = queue.Queue(maxsize=depth)
+        stop = threading.Event()
+        
+        def put(entry) -> bool:
+            while not stop.is_set():
+                try:
+                    items.put(entry, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+        
+        def produce():
+            iterator = iter(iterable)
+            try:
+                for item in iterator:
+                    if not put((item, None)):
+                        return
+                put((cls._PIPELINE_END, None))
+            except Exception as e:
+                put((cls._PIPELINE_END, e))
+            finally:
+                close = getattr(iterator, 'close', None)
+                if close is not None:
+                    close()
+        
+        thread = threading.Thread(target=produce, name=name, daemon=True)
+        thread.start()
+        try:
+            while True:
+                item, error = items.get()
+                if item is cls._PIPELINE_END:
+                    if error is not None:
+                        raise error
+                    return
+                yield item
+        finally:
+            stop.set()
+            thread.join()
+    
+    def scan_record_keys(self, table_name: str, primary_key: Union[str, List[str]],
+                         schema: List[Dict],
+                         conditions: Optional[List[Tuple[str, Tuple]]] = None) -> Optional[Set[str]]:
+        """只读取主键列，返回MySQL表中（满足conditions的）全部记录的记录标识；主键值无法转换为记录标识时返回None"""
+        key_columns = self._key_columns(primary_key)
+        column_types = {col['name']: col['type'] for col in schema}
+        converters = [(col, DataTypeMapper.value_converter(column_types[col])) for col in key_columns]
+        keys = set()
+        with self.mysql_conn.cursor(pymysql.cursors.SSCursor) as cursor:
+            sql, params = self._build_select_query(table_name, conditions, columns=key_columns)
+            cursor.execute(sql, params)
+            while True:
+                rows = cursor.fetchmany(5000)
+                if not rows:
+                    break
+                for row in rows:
+                    fields = {}
+                    for (col, convert), value in zip(converters, row):
+                        value = convert(value) if value is not None else None
+                        if value is None:
+                            return None
+                        fields[col] = value
+                    keys.add(self._record_key(fields, key_columns))
+        return keys
+    
+    @staticmethod
+    def detect_watermark_column(schema: List[Dict]) -> Optional[str]:
+        """从表结构中自动识别水位字段
+
+        优先使用 ON UPDATE CURRENT_TIMESTAMP 的时间字段（可捕获新增和更新），
+        其次使用自增字段（只能捕获新增）
+        """
+        for col in schema:
+            if 'on update current_timestamp' in (col.get('extra') or '').lower():
+                return col['name']
+        for col in schema:
+            if 'auto_increment' in (col.get('extra') or '').lower():
+                return col['name']
+        return None
+    
+    def _resolve_watermark_column(self, mysql_table: str, schema: List[Dict]) -> Optional[str]:
+        """获取表的水位字段：优先使用配置，否则自动识别"""
+        configured = (self.sync_config.watermark_columns or {}).get(mysql_table)
+        if configured:
+            if configured not in [col['name'] for col in schema]:
+                self.logger.warning(f"表 {mysql_table} 不存在配置的水位字段 {configured}")
+                return None
+            return configured
+        return self.detect_watermark_column(schema)
+    
     def get_primary_key(self, table_name: str) -> Optional[str]:
-        """获取表的主键字段"""
+        """获取表的主键字段（联合主键时为第一个字段，完整主键见get_primary_key_columns）"""
+        key_columns = self.get_primary_key_columns(table_name)
+        return key_columns[0] if key_columns else None
+    
+    def get_primary_key_columns(self, table_name: str) -> List[str]:
+        """获取表的主键字段列表（按主键顺序，支持联合主键）"""
+        cached = self._cached_table(table_name)
+        if cached is not None:
+            return list(cached.primary_key)
         try:
             with self.mysql_conn.cursor() as cursor:
                 cursor.execute(f"""
@@ -374,195 +1072,821 @@ class MySQLToBaseSync:
                     AND TABLE_NAME = '{table_name}' 
                     AND CONSTRAINT_NAME = 'PRIMARY'
                     ORDER BY ORDINAL_POSITION
-                    LIMIT 1
                 """)
-                result = cursor.fetchone()
-                if result:
-                    return result['COLUMN_NAME']
-                return None
+                return [row['COLUMN_NAME'] for row in cursor.fetchall()]
         except Exception as e:
             self.logger.error(f"获取表 {table_name} 主键失败: {e}")
+            return []
+    
+    @staticmethod
+    def _key_columns(primary_key: Union[str, List[str], None]) -> List[str]:
+        """将主键字段（单个字段名或联合主键字段列表）统一为字段列表"""
+        if not primary_key:
+            return []
+        return [primary_key] if isinstance(primary_key, str) else list(primary_key)
+    
+    @staticmethod
+    def _record_key(fields: Dict[str, Any], primary_key: Union[str, List[str], None]) -> str:
+        """根据记录字段（飞书记录字段或转换后的MySQL行）生成记录唯一标识
+
+        单字段主键使用字段值本身，联合主键使用各字段值的紧凑JSON数组，如 [1,"a"]；
+        字段值先规整（飞书返回的富文本、浮点数等），使两侧生成的标识一致
+        """
+        key_columns = MySQLToBaseSync._key_columns(primary_key)
+        if key_columns:
+            values = [DataTypeMapper.normalize_value(fields.get(col)) for col in key_columns]
+            if None not in values:
+                if len(values) == 1:
+                    # 使用主键字段值作为唯一标识
+                    return str(values[0])
+                return json.dumps(values, ensure_ascii=False, separators=(',', ':'), default=str)
+        # 如果没有主键或主键字段不存在，回退到使用所有字段值的哈希
+        field_values = []
+        for key, value in fields.items():
+            field_values.append(f"{key}:{value}")
+        return hashlib.md5('|'.join(sorted(field_values)).encode()).hexdigest()
+    
+    def _load_existing_index(self, mysql_table: str, table_id: str, primary_key: Union[str, List[str], None],
+                             fingerprint_columns: Optional[List[str]]) -> Optional[Tuple[Dict[str, str], Dict[str, str], bool]]:
+        """获取已存在记录索引：优先复用本地同步状态，状态缺失或校验失败时完整拉取飞书记录
+
+        返回 (记录标识 -> record_id, 记录标识 -> 内容指纹, 是否复用了本地同步状态)；
+        拉取失败时返回None，不保存也不使用只拉取到一部分的索引（否则未拉取到的记录会被重复创建）
+        """
+        app_token = self.base_config.app_token
+        if self.state_store:
+            cached = self.state_store.load_index(app_token, table_id)
+            if cached is None:
+                self.logger.info(f"表 {mysql_table} 没有本地同步状态，完整拉取飞书记录")
+            elif self._verify_state_index(table_id, primary_key, cached[0]):
+                records, fingerprints = cached
+                self.logger.info(f"复用本地同步状态，表 {mysql_table} 已存在 {len(records)} 条记录")
+                return records, fingerprints if fingerprint_columns else {}, True
+            else:
+                self.logger.warning(f"表 {mysql_table} 本地同步状态校验失败，重新完整拉取飞书记录")
+        
+        index = self.get_existing_index(table_id, primary_key, fingerprint_columns)
+        if index is None:
             return None
+        records, fingerprints = index
+        if self.state_store:
+            self.state_store.save_index(app_token, table_id, mysql_table, records, fingerprints)
+        return records, fingerprints, False
+    
+    def _prepare_watermark_read(self, mysql_table: str, table_id: str, schema: List[Dict],
+                                key_columns: List[str], index_reused: bool) -> Tuple[Optional[str], List, Optional[List[str]]]:
+        """准备水位增量读取，返回 (水位字段, 过滤条件, 分页键)
+
+        本地同步状态失效（飞书记录可能被改动）或水位字段变化时读取全表并重新记录水位
+        """
+        if not self.state_store:
+            self.logger.warning("水位增量同步需要配置state_path，本次读取全表")
+            return None, [], key_columns
+        
+        column = self._resolve_watermark_column(mysql_table, schema)
+        if not column:
+            self.logger.info(f"表 {mysql_table} 没有可用的水位字段，读取全表")
+            return None, [], key_columns
+        
+        stored = self.state_store.get_watermark(self.base_config.app_token, table_id)
+        if stored is None or stored[0] != column or not index_reused:
+            self.logger.info(f"表 {mysql_table} 按水位字段 {column} 首次同步或本地状态已失效，读取全表")
+            return column, [], key_columns
+        
+        watermark = stored[1]
+        self.logger.info(f"表 {mysql_table} 从水位 {column} >= {watermark} 开始读取")
+        # 按 (水位字段, 主键) 键集分页，可以利用水位字段上的索引；使用>=避免漏读与水位相同的行
+        paging_columns = [column] + [col for col in key_columns if col != column] if key_columns else None
+        return column, [(f"`{column}` >= %s", (watermark,))], paging_columns
     
-    def get_existing_records(self, table_id: str, primary_key: Optional[str] = None) -> Dict[str, str]:
-        """获取飞书表格中已存在的记录，基于主键字段建立映射"""
+    def _verify_state_index(self, table_id: str, primary_key: Union[str, List[str], None],
+                            records: Dict[str, str]) -> bool:
+        """校验本地同步状态：飞书记录总数一致，且抽样的首页记录均与本地索引匹配"""
+        try:
+            request = base_v1.ListAppTableRecordRequest.builder() \
+                .table_id(table_id) \
+                .page_size(self.STATE_VERIFY_SAMPLE_SIZE) \
+                .build()
+            response = self._call_base('read', self.base_client.base.v1.app_table_record.list, request)
+            if not response.success():
+                return False
+            
+            total = getattr(response.data, 'total', None)
+            if total != len(records):
+                self.logger.info(f"飞书记录数 {total} 与本地状态记录数 {len(records)} 不一致")
+                return False
+            
+            for record in getattr(response.data, 'items', None) or []:
+                if records.get(self._record_key(record.fields, primary_key)) != record.record_id:
+                    return False
+            return True
+        except Exception as e:
+            self.logger.error(f"校验本地同步状态失败: {e}")
+            return False
+    
+    @staticmethod
+    def _update_fields(fields: Dict[str, Any], column_names: List[str]) -> Dict[str, Any]:
+        """构建更新请求的字段，MySQL中为NULL的字段显式置空，使飞书记录与源数据一致"""
+        update_fields = {col: None for col in column_names}
+        update_fields.update(fields)
+        return update_fields
+    
+    def get_existing_records(self, table_id: str, primary_key: Union[str, List[str], None] = None) -> Dict[str, str]:
+        """获取飞书表格中已存在的记录，基于主键字段（支持联合主键字段列表）建立映射"""
+        index = self.get_existing_index(table_id, primary_key)
+        return index[0] if index is not None else {}
+    
+    def get_existing_index(self, table_id: str, primary_key: Union[str, List[str], None] = None,
+                           fingerprint_columns: Optional[List[str]] = None) -> Optional[Tuple[Dict[str, str], Dict[str, str]]]:
+        """获取飞书表格中已存在的记录索引
+
+        返回 (记录标识 -> record_id, 记录标识 -> 内容指纹)；
+        未传入fingerprint_columns时不计算指纹，第二个字典为空；任一页拉取失败时返回None
+        """
         try:
             existing_records = {}
+            fingerprints = {}
             page_token = None
+            # 只拉取建立索引需要的字段，减少宽表的响应大小
+            field_names = self._index_field_names(table_id, primary_key, fingerprint_columns)
             
             while True:
-                request_builder = ListAppTableRecordRequest.builder() \
+                request_builder = base_v1.ListAppTableRecordRequest.builder() \
                     .table_id(table_id) \
                     .page_size(500)
                 
+                if field_names:
+                    request_builder.field_names(json.dumps(field_names, ensure_ascii=False))
                 if page_token:
                     request_builder.page_token(page_token)
                 
                 request = request_builder.build()
-                response = self.base_client.base.v1.app_table_record.list(request)
+                response = self._call_base('read', self.base_client.base.v1.app_table_record.list, request)
                 
                 if not response.success():
                     self.logger.error(f"获取已存在记录失败: {response.msg}")
-                    break
+                    return None
                 
                 if hasattr(response.data, 'items') and response.data.items:
                     for record in response.data.items:
-                        if primary_key and primary_key in record.fields:
-                            # 使用主键字段值作为唯一标识
-                            primary_key_value = str(record.fields[primary_key])
-                            existing_records[primary_key_value] = record.record_id
-                        else:
-                            # 如果没有主键或主键字段不存在，回退到使用所有字段值的哈希
-                            field_values = []
-                            for key, value in record.fields.items():
-                                field_values.append(f"{key}:{value}")
-                            record_hash = hashlib.md5('|'.join(sorted(field_values)).encode()).hexdigest()
-                            existing_records[record_hash] = record.record_id
+                        record_key = self._record_key(record.fields, primary_key)
+                        existing_records[record_key] = record.record_id
+                        
+                        if fingerprint_columns:
+                            fingerprints[record_key] = DataTypeMapper.fingerprint(
+                                record.fields, fingerprint_columns)
                 
                 # 检查是否有下一页
                 if hasattr(response.data, 'has_more') and response.data.has_more:
                     page_token = response.data.page_token
                 else:
                     break
-                
-                time.sleep(0.2)  # 避免频率限制
             
             if primary_key:
-                self.logger.info(f"获取到 {len(existing_records)} 条已存在记录（基于主键 {primary_key}）")
+                key_names = ', '.join(self._key_columns(primary_key))
+                self.logger.info(f"获取到 {len(existing_records)} 条已存在记录（基于主键 {key_names}）")
             else:
                 self.logger.info(f"获取到 {len(existing_records)} 条已存在记录（基于全字段哈希）")
-            return existing_records
+            return existing_records, fingerprints
             
         except Exception as e:
             self.logger.error(f"获取已存在记录失败: {e}")
-            return {}
+            return None
+    
+    def _index_field_names(self, table_id: str, primary_key: Union[str, List[str], None],
+                           fingerprint_columns: Optional[List[str]]) -> Optional[List[str]]:
+        """建立已存在记录索引需要拉取的字段：主键字段，开启变更检测时加上参与指纹计算的字段
+
+        返回None表示拉取全部字段。没有主键时记录标识是全字段哈希，只有开启变更检测
+        （指纹字段即MySQL全部列）时才投影。飞书表格中缺少的字段不能出现在请求中，因此先查询表格现有字段
+        """
+        key_columns = self._key_columns(primary_key)
+        if not key_columns and not fingerprint_columns:
+            return None
+        base_fields = self.get_base_field_names(table_id)
+        if base_fields is None:
+            return None
+        existing = set(base_fields)
+        if any(col not in existing for col in key_columns):
+            return None
+        
+        wanted = list(key_columns)
+        wanted.extend(col for col in fingerprint_columns or [] if col not in key_columns)
+        return [col for col in wanted if col in existing] or None
+    
+    def get_base_field_names(self, table_id: str) -> Optional[List[str]]:
+        """获取飞书表格的字段名列表，失败时返回None；结果缓存在field_catalog中，本次同步内复用"""
+        cached = self.field_catalog.get(table_id)
+        if cached is not None:
+            return list(cached)
+        try:
+            field_names = []
+            page_token = None
+            while True:
+                request_builder = base_v1.ListAppTableFieldRequest.builder() \
+                    .table_id(table_id) \
+                    .page_size(100)
+                if page_token:
+                    request_builder.page_token(page_token)
+                
+                response = self._call_base('read', self.base_client.base.v1.app_table_field.list,
+                                           request_builder.build())
+                if not response.success():
+                    self.logger.error(f"获取飞书表格字段失败: {response.msg}")
+                    return None
+                
+                field_names.extend(field.field_name for field in getattr(response.data, 'items', None) or [])
+                if getattr(response.data, 'has_more', False):
+                    page_token = response.data.page_token
+                else:
+                    self.field_catalog[table_id] = field_names
+                    return list(field_names)
+        except Exception as e:
+            self.logger.error(f"获取飞书表格字段失败: {e}")
+            return None
+    
+    def ensure_base_fields(self, table_name: str, table_id: str, schema: List[Dict]) -> List[Dict]:
+        """在数据写入前补齐飞书表格中缺少的MySQL字段，返回飞书中已有字段对应的表结构
+
+        MySQL新增的列在飞书中不存在时整批写入都会被拒绝，因此先逐个创建缺少的字段；
+        创建失败的字段从返回的表结构中去除，本次同步不写入该列。获取飞书字段失败时原样返回
+        """
+        base_fields = self.get_base_field_names(table_id)
+        if base_fields is None:
+            return schema
+        existing = set(base_fields)
+        missing = [col for col in schema if col['name'] not in existing]
+        if not missing:
+            return schema
+        
+        self.logger.info(f"飞书表格 {table_name} 缺少 {len(missing)} 个字段，开始补齐: "
+                         f"{[col['name'] for col in missing]}")
+        for col in missing:
+            try:
+                request = base_v1.CreateAppTableFieldRequest.builder() \
+                    .table_id(table_id) \
+                    .request_body(self._build_field(col, base_v1.AppTableField.builder())) \
+                    .build()
+                response = self._call_base('meta', self.base_client.base.v1.app_table_field.create, request)
+                if response.success():
+                    existing.add(col['name'])
+                    self.field_catalog.setdefault(table_id, []).append(col['name'])
+                else:
+                    self.logger.error(f"创建飞书字段 {table_name}.{col['name']} 失败: {response.msg}")
+            except Exception as e:
+                self.logger.error(f"创建飞书字段 {table_name}.{col['name']} 失败: {e}")
+        
+        skipped = [col['name'] for col in missing if col['name'] not in existing]
+        if skipped:
+            self.logger.warning(f"表 {table_name} 的字段 {skipped} 在飞书中不存在，本次同步不写入这些列")
+        return [col for col in schema if col['name'] in existing]
     
     def sync_table_data(self, mysql_table: str, base_table_id: str, schema: List[Dict], incremental: bool = True) -> bool:
         """同步表数据（支持增量同步）"""
         try:
-            # 获取主键字段
-            primary_key = self.get_primary_key(mysql_table)
-            self.logger.info(f"表 {mysql_table} 主键字段: {primary_key}")
+            # 获取主键字段（支持联合主键），同时用于键集分页和记录标识
+            key_columns = self.get_primary_key_columns(mysql_table)
+            column_names = [col['name'] for col in schema]
+            # 主键字段未写入飞书时（飞书缺少该字段）无法按主键识别记录，回退到全字段哈希
+            primary_key = key_columns if key_columns and all(col in column_names for col in key_columns) else None
+            self.logger.info(f"表 {mysql_table} 主键字段: {', '.join(key_columns) or None}")
+            if not key_columns and self.sync_config.read_mode != 'stream':
+                self.logger.warning(f"表 {mysql_table} 没有主键，回退到OFFSET分页")
             
-            # 获取已存在的记录（用于去重和更新）
+            # 获取已存在的记录（用于去重和更新），开启变更检测时同时计算已有记录的内容指纹
+            skip_unchanged = incremental and self.sync_config.skip_unchanged
             existing_records = {}
+            existing_fingerprints = {}
+            index_reused = False
             if incremental:
-                existing_records = self.get_existing_records(base_table_id, primary_key)
+                index = self._load_existing_index(mysql_table, base_table_id, primary_key,
+                                                  column_names if skip_unchanged else None)
+                if index is None:
+                    self.logger.error(f"表 {mysql_table} 获取飞书已存在记录失败，跳过该表")
+                    return False
+                existing_records, existing_fingerprints, index_reused = index
             
-            # 分批获取数据
-            batch_size = 500
-            offset = 0
-            total_synced = 0
-            total_updated = 0
-            total_created = 0
+            # 行过滤：配置的WHERE条件附加到所有读取该表的查询中
+            row_conditions = self.table_filter.row_conditions(mysql_table)
             
-            while True:
-                # 获取MySQL数据
-                mysql_data = self.get_mysql_data(mysql_table, batch_size, offset)
-                if not mysql_data:
-                    break
+            # 水位增量：只读取水位字段不小于上次水位的行
+            watermark_column = None
+            watermark_conditions = []
+            paging_columns = key_columns
+            if incremental and self.sync_config.watermark:
+                watermark_column, watermark_conditions, paging_columns = self._prepare_watermark_read(
+                    mysql_table, base_table_id, schema, key_columns, index_reused)
+            conditions = row_conditions + watermark_conditions
+            
+            # 列过滤：只读取写入飞书的列，以及分页和水位需要的列
+            select_columns = None
+            if self.table_filter.has_column_filter(mysql_table):
+                select_columns = list(dict.fromkeys(column_names + key_columns + (paging_columns or [])))
+            
+            # 镜像模式：记录本次读取到的记录标识，读完后删除飞书中多出的记录
+            mirror = incremental and self.sync_config.mirror
+            
+            # 大表按主键范围切分后并发同步，各分片共享同一份已存在记录索引
+            shard_bounds = self._plan_shards(mysql_table, key_columns)
+            
+            # 断点续传：读取条件与上次中断时一致则从断点继续，此前已写入的行不再读取
+            checkpoint = None
+            if incremental and self.sync_config.resume:
+                checkpoint = self._load_checkpoint(mysql_table, base_table_id, paging_columns, conditions,
+                                                   bool(shard_bounds))
+            resumed = checkpoint is not None and checkpoint['counts']['read'] > 0
+            # 同步过程中断点的计数会被更新，先保存此前运行已完成的行数，计入本表的统计
+            resumed_counts = dict(checkpoint['counts']) if resumed else None
+            if resumed_counts:
+                self.table_metrics.add_resumed(resumed_counts)
+            
+            context = TableSyncContext(
+                mysql_table=mysql_table,
+                table_id=base_table_id,
+                column_names=column_names,
+                primary_key=primary_key,
+                paging_columns=paging_columns,
+                conditions=conditions,
+                incremental=incremental,
+                skip_unchanged=skip_unchanged,
+                # 需要比对或保存内容指纹时才计算
+                track_fingerprints=skip_unchanged or (incremental and self.state_store is not None),
+                watermark_column=watermark_column,
+                # 按表结构编译批量转换函数，每页数据逐列转换，不再逐个单元格解析字段类型
+                convert_rows=DataTypeMapper.compile_batch_converter(schema),
+                existing_records=existing_records,
+                existing_fingerprints=existing_fingerprints,
+                # 只读取部分行（水位增量或从断点继续）时，删除前单独扫描主键列
+                seen_keys=set() if mirror and primary_key and not watermark_conditions and not resumed else None,
+                checkpoint=checkpoint,
+                select_columns=select_columns,
+            )
+            
+            if shard_bounds:
+                range_stats = self._sync_shards(context, key_columns[0], shard_bounds)
+            else:
+                range_stats = [self._sync_range(context)]
+            if any(stats is None for stats in range_stats):
+                return False
+            
+            total_synced = sum(stats['synced'] for stats in range_stats)
+            total_created = sum(stats['created'] for stats in range_stats)
+            total_updated = sum(stats['updated'] for stats in range_stats)
+            total_unchanged = sum(stats['unchanged'] for stats in range_stats)
+            if resumed_counts:
+                total_synced += resumed_counts['created'] + resumed_counts['updated']
+                total_created += resumed_counts['created']
+                total_updated += resumed_counts['updated']
+                total_unchanged += resumed_counts['unchanged']
+            watermarks = [stats['max_watermark'] for stats in range_stats if stats['max_watermark'] is not None]
+            max_watermark = max(watermarks) if watermarks else None
+            if context.checkpoint is not None:
+                max_watermark = self._merge_watermark(context.checkpoint['max_watermark'], max_watermark)
+            complete = all(stats['complete'] for stats in range_stats)
+            
+            total_deleted = 0
+            if not complete:
+                # 到达单次运行时间上限，只同步了部分行：保留断点，不删除记录、不推进水位
+                self.logger.warning(f"表 {mysql_table} 已到达单次运行时间上限，本次未同步完成")
+            else:
+                if mirror:
+                    deleted = self._delete_orphan_records(mysql_table, base_table_id, schema, primary_key,
+                                                          existing_records, context.seen_keys, row_conditions)
+                    if deleted is None:
+                        return False
+                    total_deleted = deleted
+                    self.table_metrics.incr('deleted', deleted)
                 
+                # 整表同步成功后才推进水位，中途失败时下次从原水位重新读取
+                if watermark_column and max_watermark is not None:
+                    self.state_store.set_watermark(self.base_config.app_token, base_table_id, mysql_table,
+                                                   watermark_column, str(max_watermark))
+                if context.checkpoint is not None:
+                    self.state_store.clear_checkpoint(self.base_config.app_token, base_table_id)
+            
+            self.logger.info(f"表 {mysql_table} {'同步完成' if complete else '本次已同步'} - 总计: {total_synced}, "
+                             f"新增: {total_created}, 更新: {total_updated}, 未变化: {total_unchanged}, "
+                             f"删除: {total_deleted}")
+            self.table_stats[mysql_table] = {
+                'synced': total_synced,
+                'created': total_created,
+                'updated': total_updated,
+                'unchanged': total_unchanged,
+                'deleted': total_deleted,
+            }
+            if not complete:
+                self.table_stats[mysql_table]['complete'] = False
+            if resumed_counts:
+                self.table_stats[mysql_table]['resumed'] = resumed_counts
+            if shard_bounds:
+                self.table_stats[mysql_table]['shards'] = [
+                    {key: value for key, value in stats.items() if key != 'max_watermark'}
+                    for stats in range_stats
+                ]
+            return complete
+            
+        except Exception as e:
+            self.logger.error(f"同步表 {mysql_table} 数据失败: {e}")
+            return False
+    
+    def _sync_range(self, context: TableSyncContext, range_conditions: Optional[List[Tuple[str, Tuple]]] = None,
+                    label: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """同步表中满足range_conditions的行（未传入时为整表），返回记录数统计和读取到的最大水位，写入失败时返回None
+
+        label为分片名称，设置时每页写入后输出该分片的进度。context中有断点时从断点开始读取，
+        每页写入后更新断点；到达单次运行时间上限时写完当前页即停止，返回的complete为False
+        """
+        mysql_table = context.mysql_table
+        base_table_id = context.table_id
+        column_names = context.column_names
+        primary_key = context.primary_key
+        incremental = context.incremental
+        skip_unchanged = context.skip_unchanged
+        track_fingerprints = context.track_fingerprints
+        watermark_column = context.watermark_column
+        existing_records = context.existing_records
+        existing_fingerprints = context.existing_fingerprints
+        seen_keys = context.seen_keys
+        metrics = self.table_metrics
+        
+        # 分批获取数据
+        batch_size = 500
+        total_read = 0
+        total_synced = 0
+        total_updated = 0
+        total_created = 0
+        total_unchanged = 0
+        max_watermark = None
+        complete = True
+        
+        checkpoint = context.checkpoint
+        last_key = tuple(checkpoint['last_key']) if checkpoint and checkpoint['last_key'] is not None else None
+        pages = self._pipeline(mysql_table, context.convert_rows, batch_size, context.paging_columns,
+                               context.conditions + (range_conditions or []),
+                               last_key=last_key, offset=checkpoint['offset'] if checkpoint else 0,
+                               columns=context.select_columns)
+        resumed_counts = dict(checkpoint['counts']) if checkpoint else None
+        with closing(pages):
+            for mysql_data, converted in pages:
+                metrics.incr('read', len(mysql_data))
                 # 转换数据格式并处理增量同步
                 new_records = []
                 update_records = []
+                # 与new_records/update_records一一对应的 (记录标识, 内容指纹)，写入成功后保存到本地同步状态
+                new_keys = []
+                update_keys = []
+                skipped = 0
                 
-                for row in mysql_data:
-                    fields = {}
-                    for col in schema:
-                        col_name = col['name']
-                        if col_name in row:
-                            value = DataTypeMapper.convert_value(row[col_name], col['type'])
-                            if value is not None:
-                                fields[col_name] = value
+                for row, fields in zip(mysql_data, converted):
+                    if watermark_column:
+                        watermark_value = row.get(watermark_column)
+                        if watermark_value is not None and (max_watermark is None or watermark_value > max_watermark):
+                            max_watermark = watermark_value
                     
                     if not fields:  # 跳过空记录
+                        skipped += 1
                         continue
                     
                     # 生成记录唯一标识
-                    if primary_key and primary_key in fields:
-                        # 使用主键字段值作为唯一标识
-                        record_key = str(fields[primary_key])
-                    else:
-                        # 如果没有主键，回退到使用所有字段值的哈希
-                        field_values = []
-                        for key, value in fields.items():
-                            field_values.append(f"{key}:{value}")
-                        record_key = hashlib.md5('|'.join(sorted(field_values)).encode()).hexdigest()
+                    record_key = self._record_key(fields, primary_key)
+                    if seen_keys is not None:
+                        seen_keys.add(record_key)
                     
                     # 检查记录是否已存在
                     if incremental and record_key in existing_records:
+                        # 内容未变化的记录无需更新
+                        fingerprint = DataTypeMapper.fingerprint(fields, column_names) if track_fingerprints else None
+                        if skip_unchanged and fingerprint == existing_fingerprints.get(record_key):
+                            total_unchanged += 1
+                            skipped += 1
+                            continue
+                        
                         # 记录已存在，准备更新
                         update_records.append({
                             'record_id': existing_records[record_key],
-                            'fields': fields
+                            'fields': self._update_fields(fields, column_names)
                         })
+                        update_keys.append((record_key, fingerprint))
                         if primary_key:
-                            self.logger.debug(f"准备更新记录，主键 {primary_key}={record_key}")
+                            self.logger.debug(f"准备更新记录，主键 {record_key}")
                     else:
                         # 新记录，准备创建
                         new_records.append({'fields': fields})
+                        new_keys.append((record_key, DataTypeMapper.fingerprint(fields, column_names)
+                                         if track_fingerprints else None))
                         if primary_key:
-                            self.logger.debug(f"准备创建新记录，主键 {primary_key}={record_key}")
+                            self.logger.debug(f"准备创建新记录，主键 {record_key}")
+                metrics.incr('skipped', skipped)
                 
                 # 批量创建新记录
                 if new_records:
-                    success = self._batch_create_records(base_table_id, new_records)
+                    created_record_ids = []
+                    success = self._batch_create_records(base_table_id, new_records, created_record_ids)
                     if success:
+                        if incremental and len(created_record_ids) == len(new_keys):
+                            self._save_record_state(base_table_id, new_keys, created_record_ids)
                         total_created += len(new_records)
+                        metrics.incr('created', len(new_records))
                         self.logger.info(f"成功创建 {len(new_records)} 条新记录")
                     else:
+                        metrics.incr('failed', len(new_records) + len(update_records))
                         self.logger.error(f"创建新记录失败")
-                        return False
+                        return None
                 
                 # 批量更新已存在记录
                 if update_records:
                     success = self._batch_update_records(base_table_id, update_records)
                     if success:
+                        if incremental:
+                            self._save_record_state(base_table_id, update_keys,
+                                                    [record['record_id'] for record in update_records])
                         total_updated += len(update_records)
+                        metrics.incr('updated', len(update_records))
                         self.logger.info(f"成功更新 {len(update_records)} 条记录")
                     else:
+                        metrics.incr('failed', len(update_records))
                         self.logger.error(f"更新记录失败")
-                        return False
+                        return None
                 
+                total_read += len(mysql_data)
                 total_synced += len(new_records) + len(update_records)
-                offset += batch_size
+                if label:
+                    self.logger.info(f"表 {mysql_table} {label} 进度 - 已读取: {total_read}, 已同步: {total_synced}")
                 
-                # 添加延迟避免频率限制
-                time.sleep(0.5)
+                if context.checkpoint is not None:
+                    self._save_checkpoint(context, mysql_data, max_watermark, {
+                        'read': resumed_counts['read'] + total_read,
+                        'created': resumed_counts['created'] + total_created,
+                        'updated': resumed_counts['updated'] + total_updated,
+                        'unchanged': resumed_counts['unchanged'] + total_unchanged,
+                    })
+                if self._time_exhausted():
+                    complete = False
+                    break
+        
+        return {
+            'range': label,
+            'complete': complete,
+            'read': total_read,
+            'synced': total_synced,
+            'created': total_created,
+            'updated': total_updated,
+            'unchanged': total_unchanged,
+            'max_watermark': max_watermark,
+        }
+    
+    def _load_checkpoint(self, mysql_table: str, table_id: str, paging_columns: Optional[List[str]],
+                         conditions: List[Tuple[str, Tuple]], sharded: bool) -> Optional[Dict[str, Any]]:
+        """读取表的断点：分页字段和过滤条件与断点一致时返回该断点，否则返回从头开始的新断点；不支持断点时返回None"""
+        if not self.state_store:
+            self.logger.warning("断点续传需要配置state_path，本次从头读取")
+            return None
+        if sharded or self.sync_config.read_mode == 'stream':
+            self.logger.info(f"表 {mysql_table} 使用分片或流式读取，不保存断点")
+            return None
+        
+        identity = {
+            'columns': paging_columns or None,
+            'conditions': json.dumps(conditions, ensure_ascii=False, default=str),
+        }
+        stored = self.state_store.get_checkpoint(self.base_config.app_token, table_id)
+        if stored is not None and all(stored.get(key) == value for key, value in identity.items()):
+            counts = stored['counts']
+            self.logger.info(f"表 {mysql_table} 从断点继续 - 此前已读取: {counts['read']}, 新增: {counts['created']}, "
+                             f"更新: {counts['updated']}, 未变化: {counts['unchanged']}")
+            if not paging_columns:
+                self.logger.warning(f"表 {mysql_table} 没有主键，按OFFSET从断点继续，期间删除的行会导致部分行被跳过")
+            return stored
+        if stored is not None:
+            self.logger.info(f"表 {mysql_table} 的读取条件与断点不一致，从头读取")
+        return dict(identity, last_key=None, offset=0, max_watermark=None,
+                    counts={'read': 0, 'created': 0, 'updated': 0, 'unchanged': 0})
+    
+    def _save_checkpoint(self, context: TableSyncContext, rows: List[Dict], max_watermark: Any,
+                         counts: Dict[str, int]):
+        """一页写入成功后保存断点：键集分页保存最后一行的分页字段值，OFFSET分页保存已读取的行数"""
+        checkpoint = context.checkpoint
+        if context.paging_columns:
+            last_key = [rows[-1][col] for col in context.paging_columns]
+            if any(isinstance(value, (bytes, bytearray)) for value in last_key):
+                self.logger.warning(f"表 {context.mysql_table} 的分页字段为二进制类型，不保存断点")
+                context.checkpoint = None
+                return
+            checkpoint['last_key'] = [self._checkpoint_value(value) for value in last_key]
+        else:
+            checkpoint['offset'] += len(rows)
+        checkpoint['counts'] = counts
+        checkpoint['max_watermark'] = self._checkpoint_value(
+            self._merge_watermark(checkpoint['max_watermark'], max_watermark))
+        self.state_store.set_checkpoint(self.base_config.app_token, context.table_id, context.mysql_table, checkpoint)
+    
+    @staticmethod
+    def _checkpoint_value(value: Any) -> Any:
+        """断点中保存的值：数字和字符串原样保存，日期时间、定点数等转为MySQL可以直接比较的字符串"""
+        if value is None or isinstance(value, (int, float, str)):
+            return value
+        return str(value)
+    
+    @staticmethod
+    def _merge_watermark(saved: Any, current: Any) -> Any:
+        """合并断点中保存的最大水位（日期时间等已转为字符串）和本次读取到的最大水位"""
+        if saved is None or current is None:
+            return current if saved is None else saved
+        if isinstance(saved, str) and not isinstance(current, str):
+            if isinstance(current, Number):
+                return current if float(current) > float(saved) else saved
+            return current if str(current) > saved else saved
+        return max(saved, current)
+    
+    def _time_exhausted(self) -> bool:
+        """是否已到达单次运行的时间上限"""
+        return self.deadline is not None and time.monotonic() >= self.deadline
+    
+    def estimate_table_rows(self, table_name: str) -> Optional[int]:
+        """从INFORMATION_SCHEMA.TABLES读取表的估算行数（InnoDB为统计值，不精确）"""
+        cached = self._cached_table(table_name)
+        if cached is not None:
+            return cached.estimated_rows
+        try:
+            with self.mysql_conn.cursor() as cursor:
+                cursor.execute("""
+                    SELECT TABLE_ROWS
+                    FROM INFORMATION_SCHEMA.TABLES
+                    WHERE TABLE_SCHEMA = %s AND TABLE_NAME = %s
+                """, (self.mysql_config.database, table_name))
+                row = cursor.fetchone()
+                return int(row['TABLE_ROWS']) if row and row['TABLE_ROWS'] is not None else None
+        except Exception as e:
+            self.logger.error(f"获取表 {table_name} 估算行数失败: {e}")
+            return None
+    
+    def _plan_shards(self, table_name: str, key_columns: List[str]) -> List[Any]:
+        """计算分片的切分点，不需要切分时返回空列表
+
+        shards大于1、表有主键且估算行数不少于shard_min_rows时按主键第一个字段切分
+        """
+        shards = self.sync_config.shards
+        if shards <= 1 or not key_columns:
+            return []
+        estimated_rows = self.estimate_table_rows(table_name)
+        if estimated_rows is None or estimated_rows < self.sync_config.shard_min_rows:
+            return []
+        try:
+            bounds = self.get_shard_bounds(table_name, key_columns[0], shards, estimated_rows)
+        except Exception as e:
+            self.logger.warning(f"计算表 {table_name} 分片切分点失败，不切分: {e}")
+            return []
+        if bounds:
+            self.logger.info(f"表 {table_name} 估算 {estimated_rows} 行，按 {key_columns[0]} 切分为 {len(bounds) + 1} 个分片")
+        return bounds
+    
+    def get_shard_bounds(self, table_name: str, column: str, shards: int, estimated_rows: int) -> List[Any]:
+        """计算按column切分为shards个范围的切分点（升序、去重）
+
+        整数字段按MIN/MAX等宽切分；其他类型按估算行数在主键索引上等距抽样
+        """
+        with self.mysql_conn.cursor() as cursor:
+            cursor.execute(f"SELECT MIN(`{column}`) AS low, MAX(`{column}`) AS high FROM `{table_name}`")
+            row = cursor.fetchone()
+            low, high = row['low'], row['high']
+            if low is None:
+                return []
+            if isinstance(low, int) and isinstance(high, int):
+                return self._split_int_range(low, high, shards)
             
-            self.logger.info(f"表 {mysql_table} 同步完成 - 总计: {total_synced}, 新增: {total_created}, 更新: {total_updated}")
-            return True
+            bounds = []
+            for i in range(1, shards):
+                cursor.execute(f"SELECT `{column}` AS bound FROM `{table_name}` ORDER BY `{column}` "
+                               f"LIMIT 1 OFFSET {estimated_rows * i // shards}")
+                row = cursor.fetchone()
+                if row is None:
+                    break
+                if row['bound'] != low and (not bounds or row['bound'] > bounds[-1]):
+                    bounds.append(row['bound'])
+            return bounds
+    
+    @staticmethod
+    def _split_int_range(low: int, high: int, shards: int) -> List[int]:
+        """将整数区间[low, high]等宽切分为最多shards段，返回各段的起点（不含第一段）"""
+        step = (high - low + 1) / shards
+        bounds = []
+        for i in range(1, shards):
+            bound = low + int(step * i)
+            if low < bound <= high and (not bounds or bound > bounds[-1]):
+                bounds.append(bound)
+        return bounds
+    
+    @staticmethod
+    def _shard_conditions(column: str, bounds: List[Any]) -> List[List[Tuple[str, Tuple]]]:
+        """根据切分点生成各分片的过滤条件，第一段没有下界、最后一段没有上界，覆盖全部取值"""
+        ranges = []
+        for i in range(len(bounds) + 1):
+            conditions = []
+            if i > 0:
+                conditions.append((f"`{column}` >= %s", (bounds[i - 1],)))
+            if i < len(bounds):
+                conditions.append((f"`{column}` < %s", (bounds[i],)))
+            ranges.append(conditions)
+        return ranges
+    
+    def _begin_snapshot(self):
+        """在当前连接上开启一致性快照事务，之后的查询都读取同一时间点的数据"""
+        with self.mysql_conn.cursor() as cursor:
+            cursor.execute("SET SESSION TRANSACTION ISOLATION LEVEL REPEATABLE READ")
+            cursor.execute("START TRANSACTION WITH CONSISTENT SNAPSHOT")
+    
+    def _sync_shards(self, context: TableSyncContext, column: str,
+                     bounds: List[Any]) -> List[Optional[Dict[str, Any]]]:
+        """按主键范围并发同步各分片，每个分片使用独立的MySQL连接和一致性快照
+
+        先建立全部连接再依次开启快照，使各分片的快照时间点尽量接近；
+        不加全局读锁，分片之间的快照不保证完全一致
+        """
+        ranges = self._shard_conditions(column, bounds)
+        edges = ['MIN'] + [str(bound) for bound in bounds] + ['MAX']
+        labels = [f"分片 {i + 1}/{len(ranges)} {column}[{edges[i]}, {edges[i + 1]})" for i in range(len(ranges))]
+        workers: List[MySQLToBaseSync] = []
+        try:
+            for _ in ranges:
+                workers.append(self._spawn_worker())
+            for worker in workers:
+                worker._begin_snapshot()
             
-        except Exception as e:
-            self.logger.error(f"同步表 {mysql_table} 数据失败: {e}")
-            return False
+            with ThreadPoolExecutor(max_workers=len(ranges),
+                                    thread_name_prefix=f"{context.mysql_table}-shard") as executor:
+                futures = [executor.submit(worker._sync_range, context, range_conditions, label)
+                           for worker, range_conditions, label in zip(workers, ranges, labels)]
+                results = []
+                for label, future in zip(labels, futures):
+                    try:
+                        results.append(future.result())
+                    except Exception as e:
+                        self.logger.error(f"同步表 {context.mysql_table} {label} 失败: {e}")
+                        results.append(None)
+            return results
+        finally:
+            for worker in workers:
+                worker.close_mysql()
+    
+    def _save_record_state(self, table_id: str, keys: List[Tuple[str, Optional[str]]], record_ids: List[str]):
+        """写入成功后更新本地同步状态"""
+        if not self.state_store:
+            return
+        self.state_store.upsert_records(
+            self.base_config.app_token, table_id,
+            ((record_key, record_id, fingerprint)
+             for (record_key, fingerprint), record_id in zip(keys, record_ids)))
+    
+    def _delete_orphan_records(self, mysql_table: str, table_id: str, schema: List[Dict],
+                               primary_key: Optional[List[str]], existing_records: Dict[str, str],
+                               seen_keys: Optional[Set[str]],
+                               conditions: Optional[List[Tuple[str, Tuple]]] = None) -> Optional[int]:
+        """镜像模式：删除飞书中存在但MySQL中已不存在（或不满足行过滤条件conditions）的记录，返回删除数量，删除失败时返回None
+
+        seen_keys为None表示本次只读取了部分行（水位增量），此时单独扫描主键列获取全部记录标识；
+        没有主键的表按整行内容哈希作为记录标识，飞书返回的原始值与MySQL转换后的值哈希不一致，无法判断记录是否仍存在，不做删除
+        """
+        if not primary_key:
+            self.logger.warning(f"表 {mysql_table} 没有主键，无法确定飞书中已不存在的记录，跳过删除")
+            return 0
+        if seen_keys is None:
+            seen_keys = self.scan_record_keys(mysql_table, primary_key, schema, conditions)
+            if seen_keys is None:
+                self.logger.warning(f"表 {mysql_table} 主键值无法转换为记录标识，跳过删除")
+                return 0
+        
+        orphan_keys = [key for key in existing_records if key not in seen_keys]
+        if not orphan_keys:
+            return 0
+        
+        if not self._batch_delete_records(table_id, [existing_records[key] for key in orphan_keys]):
+            self.logger.error(f"删除表 {mysql_table} 中已不存在的记录失败")
+            return None
+        if self.state_store:
+            self.state_store.delete_records(self.base_config.app_token, table_id, orphan_keys)
+        for key in orphan_keys:
+            del existing_records[key]
+        self.logger.info(f"成功删除 {len(orphan_keys)} 条MySQL中已不存在的记录")
+        return len(orphan_keys)
     
     def _batch_update_records(self, table_id: str, records: List[Dict]) -> bool:
         """批量更新记录"""
         try:
-            # 飞书API限制每次最多更新500条记录
-            max_batch_size = 500
-            
-            for i in range(0, len(records), max_batch_size):
-                batch_records = records[i:i + max_batch_size]
-                
-                request = BatchUpdateAppTableRecordRequest.builder() \
+            for batch_records in self.record_batcher.batches(records):
+                request = base_v1.BatchUpdateAppTableRecordRequest.builder() \
                     .table_id(table_id) \
                     .request_body(
-                        BatchUpdateAppTableRecordRequestBody.builder()
+                        base_v1.BatchUpdateAppTableRecordRequestBody.builder()
                         .records(batch_records)
                         .build()
                     ) \
                     .build()
                 
-                response = self.base_client.base.v1.app_table_record.batch_update(request)
+                response = self._call_base('write', self.base_client.base.v1.app_table_record.batch_update, request)
                 
                 if not response.success():
                     self.logger.error(f"批量更新记录失败: {response.msg}")
                     return False
-                
-                # 添加延迟避免频率限制
-                time.sleep(0.5)
             
             return True
             
@@ -570,32 +1894,68 @@ class MySQLToBaseSync:
             self.logger.error(f"批量更新记录失败: {e}")
             return False
     
-    def _batch_create_records(self, table_id: str, records: List[Dict]) -> bool:
-        """批量创建记录"""
+    def _batch_delete_records(self, table_id: str, record_ids: List[str]) -> bool:
+        """批量删除记录"""
         try:
-            # 飞书API限制每次最多创建500条记录
+            # 飞书API限制每次最多删除500条记录
             max_batch_size = 500
             
-            for i in range(0, len(records), max_batch_size):
-                batch_records = records[i:i + max_batch_size]
+            for i in range(0, len(record_ids), max_batch_size):
+                batch_record_ids = record_ids[i:i + max_batch_size]
                 
-                request = BatchCreateAppTableRecordRequest.builder() \
+                request = base_v1.BatchDeleteAppTableRecordRequest.builder() \
+                    .table_id(table_id) \
+                    .request_body(
+                        base_v1.BatchDeleteAppTableRecordRequestBody.builder()
+                        .records(batch_record_ids)
+                        .build()
+                    ) \
+                    .build()
+                
+                response = self._call_base('write', self.base_client.base.v1.app_table_record.batch_delete, request)
+                
+                if not response.success():
+                    self.logger.error(f"批量删除记录失败: {response.msg}")
+                    return False
+            
+            return True
+            
+        except Exception as e:
+            self.logger.error(f"批量删除记录失败: {e}")
+            return False
+    
+    def _log_oversized_record(self, record: Dict, size: int):
+        """单条记录超过请求体字节预算时记录日志"""
+        action = '截断最长的文本字段' if self.sync_config.oversized_record == OVERSIZED_TRUNCATE else '单独写入'
+        record_id = f"（record_id {record['record_id']}）" if record.get('record_id') else ''
+        self.logger.warning(f"记录{record_id}大小 {size} 字节，超过单次请求的字节预算 "
+                            f"{self.sync_config.max_batch_bytes}，{action}")
+    
+    def _batch_create_records(self, table_id: str, records: List[Dict],
+                              created_record_ids: Optional[List[str]] = None) -> bool:
+        """批量创建记录，传入created_record_ids时按顺序追加新记录的record_id"""
+        try:
+            for batch_records in self.record_batcher.batches(records):
+                # client_token保证重试时不会重复创建记录
+                request = base_v1.BatchCreateAppTableRecordRequest.builder() \
                     .table_id(table_id) \
+                    .client_token(str(uuid.uuid4())) \
                     .request_body(
-                        BatchCreateAppTableRecordRequestBody.builder()
+                        base_v1.BatchCreateAppTableRecordRequestBody.builder()
                         .records(batch_records)
                         .build()
                     ) \
                     .build()
                 
-                response = self.base_client.base.v1.app_table_record.batch_create(request)
+                response = self._call_base('write', self.base_client.base.v1.app_table_record.batch_create, request)
                 
                 if not response.success():
                     self.logger.error(f"批量创建记录失败: {response.msg}")
                     return False
                 
-                # 添加延迟避免频率限制
-                time.sleep(0.5)
+                if created_record_ids is not None:
+                    created_record_ids.extend(
+                        record.record_id for record in (getattr(response.data, 'records', None) or []))
             
             return True
             
@@ -603,66 +1963,268 @@ class MySQLToBaseSync:
             self.logger.error(f"批量创建记录失败: {e}")
             return False
     
+    def sync_table(self, table_name: str, base_tables: Dict[str, str]) -> bool:
+        """同步单个表：获取表结构、按需创建飞书表格并同步数据，各阶段耗时和行数计入同步报告"""
+        self.logger.info(f"开始同步表: {table_name}")
+        metrics = self.report.table(table_name)
+        self.table_metrics = metrics
+        started = time.perf_counter()
+        try:
+            return self._sync_table(table_name, base_tables)
+        finally:
+            metrics.seconds = time.perf_counter() - started
+            self.table_metrics = TableMetrics('')
+            self.logger.info(f"表 {table_name} 耗时 {metrics.seconds:.2f}s - {metrics.format_stages()}")
+    
+    def _sync_table(self, table_name: str, base_tables: Dict[str, str]) -> bool:
+        if self._time_exhausted():
+            self.logger.warning(f"已到达单次运行时间上限，表 {table_name} 留待下次同步")
+            return False
+        
+        try:
+            # 获取表结构
+            schema = self.get_table_schema(table_name)
+            if not schema:
+                return False
+            schema = self.project_schema(table_name, schema)
+            
+            # 检查飞书表格是否存在，不存在则创建
+            table_id = base_tables.get(table_name)
+            if not table_id:
+                table_id = self.create_base_table(table_name, schema)
+                if not table_id:
+                    return False
+            else:
+                self.logger.info(f"表 {table_name} 已存在，跳过创建")
+                # 补齐MySQL新增的字段，行数据只包含飞书中存在的字段
+                schema = self.ensure_base_fields(table_name, table_id, schema)
+            
+            # 同步数据
+            return self.sync_table_data(table_name, table_id, schema)
+            
+        except Exception as e:
+            self.logger.error(f"同步表 {table_name} 失败: {e}")
+            return False
+    
+    def project_schema(self, table_name: str, schema: List[Dict]) -> List[Dict]:
+        """按列过滤配置筛选需要同步的列；主键列（分页和记录标识）和水位字段始终保留"""
+        if not self.table_filter.has_column_filter(table_name):
+            return schema
+        required = self.get_primary_key_columns(table_name)
+        if self.sync_config.watermark:
+            watermark_column = self._resolve_watermark_column(table_name, schema)
+            if watermark_column:
+                required = required + [watermark_column]
+        projected = self.table_filter.project_columns(table_name, schema, required)
+        kept = [col for col in required if not self.table_filter.column_selected(table_name, col)]
+        if kept:
+            self.logger.warning(f"表 {table_name} 的字段 {kept} 用于分页或水位，不能被过滤，仍然同步")
+        self.logger.info(f"表 {table_name} 按列过滤同步 {len(projected)}/{len(schema)} 个字段")
+        return projected
+    
+    def _spawn_worker(self) -> 'MySQLToBaseSync':
+        """创建工作线程使用的同步器：共享飞书客户端、日志和配置，使用独立的MySQL连接"""
+        worker = copy.copy(self)
+        worker.mysql_conn = None
+        if not worker.connect_mysql():
+            raise Exception("工作线程MySQL连接失败")
+        return worker
+    
+    def _sync_table_in_worker(self, table_name: str, base_tables: Dict[str, str],
+                              worker_local: threading.local, workers: List['MySQLToBaseSync'],
+                              workers_lock: threading.Lock) -> bool:
+        """在线程池中同步单个表，同一工作线程内复用MySQL连接"""
+        try:
+            worker = getattr(worker_local, 'syncer', None)
+            if worker is None:
+                worker = self._spawn_worker()
+                worker_local.syncer = worker
+                with workers_lock:
+                    workers.append(worker)
+            return worker.sync_table(table_name, base_tables)
+        except Exception as e:
+            self.logger.error(f"同步表 {table_name} 失败: {e}")
+            return False
+    
     def sync_all_tables(self) -> Dict[str, bool]:
-        """同步所有表"""
-        results = {}
+        """同步所有表，max_workers大于1时并发同步多个表
+
+        返回SyncResults（dict子类），api_stats属性中包含飞书接口调用、重试和限流统计，
+        report属性为按表记录行数、各阶段耗时和接口调用的SyncReport
+        """
+        results = SyncResults()
+        self.api_stats = ApiCallStats()
+        self.table_stats = {}
+        self.field_catalog = {}
+        self.report = SyncReport()
+        max_run_seconds = self.sync_config.max_run_seconds
+        self.deadline = time.monotonic() + max_run_seconds if max_run_seconds else None
+        results.table_stats = self.table_stats
+        results.report = self.report
         
         try:
+            # 批量加载全部表的元数据，失败时各方法回退到逐表查询
+            self.load_catalog()
+            
             # 获取MySQL表列表
             mysql_tables = self.get_mysql_tables()
             if not mysql_tables:
                 self.logger.error("未找到MySQL表")
                 return results
             
+            # 按表过滤配置筛选需要同步的表
+            selected_tables = self.table_filter.filter_tables(mysql_tables)
+            if len(selected_tables) < len(mysql_tables):
+                self.logger.info(f"按表过滤跳过 {len(mysql_tables) - len(selected_tables)} 个表: "
+                                 f"{[table for table in mysql_tables if table not in selected_tables]}")
+                mysql_tables = selected_tables
+                if not mysql_tables:
+                    self.logger.error("按表过滤后没有需要同步的MySQL表")
+                    return results
+            
             # 获取现有的飞书表格
             base_tables = self.get_base_tables()
             
-            for table_name in mysql_tables:
-                self.logger.info(f"开始同步表: {table_name}")
-                
-                try:
-                    # 获取表结构
-                    schema = self.get_table_schema(table_name)
-                    if not schema:
-                        results[table_name] = False
-                        continue
-                    
-                    # 检查飞书表格是否存在，不存在则创建
-                    table_id = base_tables.get(table_name)
-                    if not table_id:
-                        table_id = self.create_base_table(table_name, schema)
-                        if not table_id:
-                            results[table_name] = False
-                            continue
-                    else:
-                        self.logger.info(f"表 {table_name} 已存在，跳过创建")
-                    
-                    # 同步数据
-                    success = self.sync_table_data(table_name, table_id, schema)
-                    results[table_name] = success
-                    
-                except Exception as e:
-                    self.logger.error(f"同步表 {table_name} 失败: {e}")
-                    results[table_name] = False
+            max_workers = min(self.sync_config.max_workers, len(mysql_tables))
+            if max_workers <= 1:
+                for table_name in mysql_tables:
+                    results[table_name] = self.sync_table(table_name, base_tables)
+                self._finish_results(results)
+                return results
+            
+            self.logger.info(f"使用 {max_workers} 个工作线程并发同步 {len(mysql_tables)} 个表")
+            worker_local = threading.local()
+            workers: List[MySQLToBaseSync] = []
+            workers_lock = threading.Lock()
+            try:
+                with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='table-sync') as executor:
+                    futures = {
+                        table_name: executor.submit(self._sync_table_in_worker, table_name, base_tables,
+                                                    worker_local, workers, workers_lock)
+                        for table_name in mysql_tables
+                    }
+                    # 按原表顺序汇总结果
+                    for table_name, future in futures.items():
+                        results[table_name] = future.result()
+            finally:
+                for worker in workers:
+                    worker.close_mysql()
             
+            self._finish_results(results)
             return results
             
         except Exception as e:
             self.logger.error(f"同步所有表失败: {e}")
+            self._finish_results(results)
             return results
     
-    def close_connections(self):
-        """关闭连接"""
+    def _finish_results(self, results: SyncResults):
+        """汇总接口调用统计并完成同步报告"""
+        results.api_stats = self.api_stats.snapshot()
+        results.report.finish(results, results.api_stats)
+    
+    def close_mysql(self):
+        """关闭MySQL连接"""
         if self.mysql_conn:
             self.mysql_conn.close()
             self.logger.info("MySQL连接已关闭")
+    
+    def close_connections(self):
+        """关闭连接"""
+        self.close_mysql()
+        if isinstance(self.base_client, AsyncTransportClient):
+            self.base_client.close()
+        if self.state_store:
+            self.state_store.close()
+
+
+# 热启动复用的同步器：配置摘要 -> 已连接的同步器，同一进程中的后续调用（如Lambda热容器）复用连接和客户端
+_warm_syncers: 'OrderedDict[str, MySQLToBaseSync]' = OrderedDict()
+_warm_lock = threading.Lock()
+WARM_CACHE_SIZE = 4
+
+
+def _warm_key(mysql_config: MySQLConfig, base_config: BaseConfig, sync_config: SyncConfig) -> str:
+    return hashlib.sha256(repr((mysql_config, base_config, sync_config)).encode('utf-8')).hexdigest()
+
+
+def acquire_warm_syncer(mysql_config: MySQLConfig, base_config: BaseConfig, sync_config: SyncConfig,
+                        factory: Callable[..., MySQLToBaseSync] = MySQLToBaseSync) -> MySQLToBaseSync:
+    """取出配置相同的已连接同步器，连接健康检查通过时直接复用，否则新建并连接；用完后调用release_warm_syncer放回
+
+    取出期间同步器不在缓存中，并发的相同配置调用会各自新建同步器，不会共享连接
+    """
+    with _warm_lock:
+        syncer = _warm_syncers.pop(_warm_key(mysql_config, base_config, sync_config), None)
+    if syncer is not None:
+        if syncer.check_connections():
+            syncer.logger.info("热启动：复用已有的MySQL连接和飞书客户端")
+            return syncer
+        syncer.close_connections()
+    
+    syncer = factory(mysql_config, base_config, sync_config)
+    if not syncer.connect_mysql():
+        syncer.close_connections()
+        raise Exception("MySQL连接失败")
+    if not syncer.connect_base():
+        syncer.close_connections()
+        raise Exception("飞书多维表格连接失败")
+    return syncer
+
+
+def release_warm_syncer(syncer: MySQLToBaseSync):
+    """同步完成后放回缓存供下次调用复用，超过WARM_CACHE_SIZE时关闭最早放回的同步器"""
+    key = _warm_key(syncer.mysql_config, syncer.base_config, syncer.sync_config)
+    with _warm_lock:
+        evicted = [_warm_syncers.pop(key)] if key in _warm_syncers else []
+        _warm_syncers[key] = syncer
+        while len(_warm_syncers) > WARM_CACHE_SIZE:
+            evicted.append(_warm_syncers.popitem(last=False)[1])
+    for stale in evicted:
+        stale.close_connections()
+
+
+def close_warm_syncers():
+    """关闭缓存中的全部同步器"""
+    with _warm_lock:
+        syncers = list(_warm_syncers.values())
+        _warm_syncers.clear()
+    for syncer in syncers:
+        syncer.close_connections()
 
 
 def sync_with_config(mysql_host: str, mysql_port: int, mysql_username: str, 
                      mysql_password: str, mysql_database: str, 
                      app_token: str, personal_base_token: str, 
-                     region: str = 'domestic') -> Dict[str, bool]:
-    """使用指定配置进行同步"""
+                     region: str = 'domestic',
+                     read_mode: str = 'keyset',
+                     max_workers: int = 1,
+                     rate_limits: Optional[Dict[str, float]] = None,
+                     max_retries: int = 5,
+                     skip_unchanged: bool = True,
+                     state_path: Optional[str] = None,
+                     watermark: bool = False,
+                     watermark_columns: Optional[Dict[str, str]] = None,
+                     mirror: bool = False,
+                     pipeline_depth: int = 2,
+                     shards: int = 1,
+                     shard_min_rows: int = 1000000,
+                     base_transport: str = 'sdk',
+                     max_in_flight: int = 4,
+                     resume: bool = False,
+                     max_run_seconds: Optional[float] = None,
+                     max_batch_bytes: int = 5 * 1024 * 1024,
+                     oversized_record: str = 'split',
+                     include_tables: Optional[List[str]] = None,
+                     exclude_tables: Optional[List[str]] = None,
+                     include_columns: Optional[List[str]] = None,
+                     exclude_columns: Optional[List[str]] = None,
+                     row_filters: Optional[Dict[str, str]] = None,
+                     warm_start: bool = False) -> Dict[str, bool]:
+    """使用指定配置进行同步
+
+    warm_start为True时同步完成后保留连接，同一进程中配置相同的下次调用经健康检查后直接复用
+    """
     mysql_config = MySQLConfig(
         host=mysql_host,
         port=mysql_port,
@@ -677,8 +2239,45 @@ def sync_with_config(mysql_host: str, mysql_port: int, mysql_username: str,
         region=region
     )
     
+    sync_config = SyncConfig(
+        read_mode=read_mode,
+        max_workers=max_workers,
+        rate_limits=rate_limits,
+        max_retries=max_retries,
+        skip_unchanged=skip_unchanged,
+        state_path=state_path,
+        watermark=watermark,
+        watermark_columns=watermark_columns,
+        mirror=mirror,
+        pipeline_depth=pipeline_depth,
+        shards=shards,
+        shard_min_rows=shard_min_rows,
+        base_transport=base_transport,
+        max_in_flight=max_in_flight,
+        resume=resume,
+        max_run_seconds=max_run_seconds,
+        max_batch_bytes=max_batch_bytes,
+        oversized_record=oversized_record,
+        include_tables=include_tables,
+        exclude_tables=exclude_tables,
+        include_columns=include_columns,
+        exclude_columns=exclude_columns,
+        row_filters=row_filters
+    )
+    
+    if warm_start:
+        syncer = acquire_warm_syncer(mysql_config, base_config, sync_config)
+        try:
+            results = syncer.sync_all_tables()
+        except Exception as e:
+            syncer.logger.error(f"同步失败: {e}")
+            syncer.close_connections()
+            raise e
+        release_warm_syncer(syncer)
+        return results
+    
     # 创建同步器
-    syncer = MySQLToBaseSync(mysql_config, base_config)
+    syncer = MySQLToBaseSync(mysql_config, base_config, sync_config)
     
     try:
         # 连接数据库
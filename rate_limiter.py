@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+飞书多维表格接口限流与重试
+按接口类别使用令牌桶控制请求速率，替代固定的time.sleep等待；
+对限流和临时错误按指数退避加抖动重试，并根据限流情况自适应调整请求速率
+"""
+
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Union
+
+
+# 接口类别及默认QPS
+DEFAULT_RATE_LIMITS: Dict[str, float] = {
+    'read': 5.0,   # 列出数据表、记录、字段
+    'write': 2.0,  # 批量新增、更新、删除记录（PersonalBaseToken单文档限频2qps）
+    'meta': 1.0,   # 创建数据表、字段
+}
+
+# 响应分类
+RESPONSE_OK = 'ok'
+RESPONSE_THROTTLED = 'throttled'  # 触发限流，需要降速后重试
+RESPONSE_TRANSIENT = 'transient'  # 临时错误，可以重试
+RESPONSE_FATAL = 'fatal'          # 参数、权限等错误，重试无意义
+
+# 飞书开放平台限流错误码
+THROTTLE_ERROR_CODES = {
+    99991400,  # 应用/租户请求频率超限
+    1254290,   # TooManyRequest
+}
+
+# 可重试的临时错误码
+TRANSIENT_ERROR_CODES = {
+    1254291,   # 写冲突
+    1254607,   # 数据未就绪
+    1255001,   # 内部错误
+    1255002,   # RPC错误
+    1255040,   # 请求超时
+}
+
+# 限流响应中携带重试等待时间的响应头
+RETRY_AFTER_HEADERS = ('retry-after', 'x-ogw-ratelimit-reset')
+
+
+class TokenBucket:
+    """令牌桶：按rate每秒补充令牌，最多累积capacity个，允许短时突发"""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        if rate <= 0:
+            raise ValueError(f"限流速率必须大于0: {rate}")
+        self.rate = float(rate)
+        self.capacity = float(capacity) if capacity else max(1.0, self.rate)
+        self._tokens = self.capacity
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def set_rate(self, rate: float):
+        """调整令牌补充速率"""
+        with self._lock:
+            self._refill()
+            self.rate = float(rate)
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+        self._last = now
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """获取令牌，令牌不足时阻塞等待，返回实际等待的秒数"""
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return waited
+                wait = (tokens - self._tokens) / self.rate
+            time.sleep(wait)
+            waited += wait
+
+
+class RateLimiter:
+    """按接口类别管理令牌桶，线程安全，可在多个同步线程间共享
+
+    触发限流时将该类别速率减半（不低于配置值的min_ratio），
+    之后每次成功调用按配置值的recover_ratio逐步恢复，直至配置值
+    """
+
+    def __init__(self, limits: Optional[Dict[str, float]] = None,
+                 min_ratio: float = 0.1, recover_ratio: float = 0.05):
+        merged = dict(DEFAULT_RATE_LIMITS)
+        merged.update(limits or {})
+        self.max_rates: Dict[str, float] = merged
+        self.min_ratio = min_ratio
+        self.recover_ratio = recover_ratio
+        self.buckets: Dict[str, TokenBucket] = {
+            endpoint: TokenBucket(rate) for endpoint, rate in merged.items()
+        }
+
+    def acquire(self, endpoint: str) -> float:
+        """为指定类别的接口获取一次调用配额，返回等待的秒数"""
+        bucket = self.buckets.get(endpoint)
+        if bucket is None:
+            raise KeyError(f"未知的接口类别: {endpoint}")
+        return bucket.acquire()
+
+    def throttle(self, endpoint: str) -> float:
+        """触发限流后降低该类别的请求速率，返回调整后的速率"""
+        bucket = self.buckets[endpoint]
+        rate = max(bucket.rate / 2, self.max_rates[endpoint] * self.min_ratio)
+        bucket.set_rate(rate)
+        return rate
+
+    def recover(self, endpoint: str) -> float:
+        """调用成功后逐步恢复该类别的请求速率，返回调整后的速率"""
+        bucket = self.buckets[endpoint]
+        max_rate = self.max_rates[endpoint]
+        if bucket.rate < max_rate:
+            bucket.set_rate(min(max_rate, bucket.rate + max_rate * self.recover_ratio))
+        return bucket.rate
+
+
+@dataclass
+class RetryPolicy:
+    """重试策略：指数退避加全抖动，服务端给出等待时间时至少等待该时间"""
+    max_retries: int = 5
+    base_delay: float = 1.0
+    max_delay: float = 60.0
+
+    def backoff(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """计算第attempt次重试（从0开始）前的等待秒数"""
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self.max_delay))
+        return delay
+
+
+class ApiCallStats:
+    """飞书接口调用统计，线程安全"""
+
+    FIELDS = ('calls', 'retries', 'throttled', 'transient_errors', 'failed')
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts: Dict[str, int] = {name: 0 for name in self.FIELDS}
+        self._seconds: Dict[str, float] = {'rate_limit_wait': 0.0, 'backoff': 0.0}
+
+    def incr(self, name: str, value: int = 1):
+        with self._lock:
+            self._counts[name] += value
+
+    def add_seconds(self, name: str, seconds: float):
+        if seconds:
+            with self._lock:
+                self._seconds[name] += seconds
+
+    def snapshot(self) -> Dict[str, Any]:
+        """返回当前统计的副本"""
+        with self._lock:
+            result: Dict[str, Any] = dict(self._counts)
+            for name, seconds in self._seconds.items():
+                result[f'{name}_seconds'] = round(seconds, 3)
+            return result
+
+
+def classify_response(response: Any) -> str:
+    """按HTTP状态码和飞书错误码对响应分类"""
+    if response.success():
+        return RESPONSE_OK
+
+    code = getattr(response, 'code', None)
+    raw = getattr(response, 'raw', None)
+    status_code = getattr(raw, 'status_code', None)
+
+    if status_code == 429 or code in THROTTLE_ERROR_CODES:
+        return RESPONSE_THROTTLED
+    if code in TRANSIENT_ERROR_CODES or (status_code is not None and status_code >= 500):
+        return RESPONSE_TRANSIENT
+    return RESPONSE_FATAL
+
+
+def get_retry_after(response: Any) -> Optional[float]:
+    """读取响应头中的重试等待秒数，没有时返回None"""
+    headers = getattr(getattr(response, 'raw', None), 'headers', None)
+    if not headers:
+        return None
+    lowered = {str(k).lower(): v for k, v in headers.items()}
+    for name in RETRY_AFTER_HEADERS:
+        value = lowered.get(name)
+        if value is None:
+            continue
+        try:
+            return max(0.0, float(value))
+        except (TypeError, ValueError):
+            continue
+    return None
+
+
+def parse_rate_limits(spec: Union[str, Dict[str, float], None]) -> Dict[str, float]:
+    """解析限流配置，支持字典或 "read=5,write=2" 形式的字符串"""
+    if not spec:
+        return {}
+    if isinstance(spec, dict):
+        return {str(k): float(v) for k, v in spec.items()}
+
+    limits = {}
+    for item in str(spec).split(','):
+        item = item.strip()
+        if not item:
+            continue
+        endpoint, sep, rate = item.partition('=')
+        if not sep:
+            raise ValueError(f"限流配置格式错误: {item}，应为 类别=QPS")
+        limits[endpoint.strip()] = float(rate)
+    return limits
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+批量写入记录的切分
+按记录数上限和请求体字节预算切分batch_create/batch_update的记录，
+宽表、长文本的批次在超过请求体大小限制前结束，窄表仍按记录数上限写满
+"""
+
+import json
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+
+# 单条记录超过字节预算时的处理方式
+OVERSIZED_SPLIT = 'split'        # 单独作为一个批次写入，不修改内容
+OVERSIZED_TRUNCATE = 'truncate'  # 截断最长的文本字段直至不超过预算，仍超过时单独写入
+OVERSIZED_POLICIES = (OVERSIZED_SPLIT, OVERSIZED_TRUNCATE)
+
+# 请求体中records数组之外的固定开销（{"records": [...]}、client_token等）
+PAYLOAD_OVERHEAD = 64
+
+# 截断后追加的标记
+TRUNCATED_SUFFIX = '…[truncated]'
+
+
+def record_size(record: Dict[str, Any]) -> int:
+    """记录序列化为请求体JSON后的字节数，与SDK的序列化方式一致（ensure_ascii=False、UTF-8）"""
+    return len(json.dumps(record, ensure_ascii=False, default=str).encode('utf-8'))
+
+
+def _cut_utf8(value: str, max_bytes: int) -> str:
+    """按UTF-8字节数截断字符串，不截断在多字节字符中间"""
+    return value.encode('utf-8')[:max(0, max_bytes)].decode('utf-8', 'ignore')
+
+
+def truncate_record(record: Dict[str, Any], max_bytes: int) -> Dict[str, Any]:
+    """从最长的文本字段开始截断，返回不超过max_bytes的新记录；文本字段全部截断后仍超过时尽量缩小"""
+    fields = dict(record.get('fields') or {})
+    truncated = dict(record, fields=fields)
+    excess = record_size(truncated) - max_bytes
+    text_fields = sorted((name for name, value in fields.items() if isinstance(value, str)),
+                         key=lambda name: len(fields[name]), reverse=True)
+    suffix_bytes = len(TRUNCATED_SUFFIX.encode('utf-8'))
+    for name in text_fields:
+        if excess <= 0:
+            break
+        value = fields[name]
+        # JSON转义（引号、换行等）使序列化后的长度大于原文，按实际序列化长度计算缩减量
+        before = record_size({name: value})
+        fields[name] = _cut_utf8(value, len(value.encode('utf-8')) - excess - suffix_bytes) + TRUNCATED_SUFFIX
+        excess -= before - record_size({name: fields[name]})
+    return truncated
+
+
+class RecordBatcher:
+    """按记录数上限和请求体字节预算切分记录，保持原有顺序
+
+    先按记录数上限整块估算，不超过预算时直接作为一个批次（窄表只需一次序列化）；
+    超过预算后逐条计算大小，在记录数上限或字节预算先到达时结束当前批次。
+    单条记录超过预算时按oversized策略处理，on_oversized回调用于记录日志
+    """
+
+    def __init__(self, max_records: int = 500, max_bytes: int = 5 * 1024 * 1024,
+                 oversized: str = OVERSIZED_SPLIT,
+                 on_oversized: Optional[Callable[[Dict[str, Any], int], None]] = None):
+        if oversized not in OVERSIZED_POLICIES:
+            raise ValueError(f"未知的超大记录处理方式: {oversized}，可选值: {', '.join(OVERSIZED_POLICIES)}")
+        self.max_records = max_records
+        self.max_bytes = max_bytes
+        self.oversized = oversized
+        self.on_oversized = on_oversized
+
+    def batches(self, records: List[Dict[str, Any]]) -> Iterator[List[Dict[str, Any]]]:
+        budget = self.max_bytes - PAYLOAD_OVERHEAD
+        start = 0
+        # 整块估算，直到第一次超过预算
+        while start < len(records):
+            chunk = records[start:start + self.max_records]
+            if record_size(chunk) > budget:
+                break
+            yield chunk
+            start += len(chunk)
+
+        batch: List[Dict[str, Any]] = []
+        batch_bytes = 2  # 数组的方括号
+        for record in records[start:]:
+            size = record_size(record)
+            if size + 2 > budget:
+                if self.on_oversized is not None:
+                    self.on_oversized(record, size)
+                if self.oversized == OVERSIZED_TRUNCATE:
+                    record = truncate_record(record, budget - 2)
+                    size = record_size(record)
+            if batch and (len(batch) >= self.max_records or batch_bytes + size + 2 > budget):
+                yield batch
+                batch, batch_bytes = [], 2
+            batch.append(record)
+            batch_bytes += size + 2  # 记录之间的分隔符", "
+        if batch:
+            yield batch
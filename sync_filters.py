@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+同步范围过滤
+按表名模式选择需要同步的表，按 "表.列" 模式选择需要同步的列，按表附加WHERE条件过滤行；
+列和行的过滤都体现在生成的SQL中，不需要的数据不会从MySQL读出
+"""
+
+import json
+from fnmatch import fnmatchcase
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+
+def parse_patterns(value: Union[str, Iterable[str], None]) -> List[str]:
+    """解析模式列表，支持列表或逗号分隔的字符串，如 "orders,log_*" """
+    if value is None:
+        return []
+    items = value.split(',') if isinstance(value, str) else value
+    return [str(item).strip() for item in items if str(item).strip()]
+
+
+def parse_column_patterns(value: Union[str, Iterable[str], Dict[str, Any], None]) -> List[str]:
+    """解析列模式，支持 "orders.id,*.password" 形式的字符串、列表，或 {表: 列或列列表} 形式的字典"""
+    if isinstance(value, dict):
+        return [f"{table}.{column}" for table, columns in value.items() for column in parse_patterns(columns)]
+    patterns = parse_patterns(value)
+    for pattern in patterns:
+        if '.' not in pattern:
+            raise ValueError(f"列过滤模式应为 表.列 的形式: {pattern}")
+    return patterns
+
+
+def parse_row_filters(value: Union[str, Dict[str, str], None]) -> Dict[str, str]:
+    """解析行过滤条件，支持字典或JSON字符串 {"表名或模式": "WHERE条件"}（条件中常含逗号，不使用逗号分隔的形式）"""
+    if value is None:
+        return {}
+    if isinstance(value, str):
+        value = json.loads(value)
+    if not isinstance(value, dict):
+        raise ValueError("行过滤条件应为 {表名: WHERE条件} 形式的JSON对象")
+    return {str(table): str(condition).strip() for table, condition in value.items() if str(condition).strip()}
+
+
+class TableFilter:
+    """同步范围过滤配置
+
+    表：设置include_tables时只同步匹配的表，再排除exclude_tables匹配的表；
+    列：某个表有匹配的include_columns时只同步匹配的列，再排除exclude_columns匹配的列；
+    行：row_filters中所有匹配表名的条件以AND连接，作为读取该表的附加WHERE条件。
+    表名和列名模式使用fnmatch语法（*、?、[abc]），区分大小写
+    """
+
+    def __init__(self, include_tables: Optional[List[str]] = None, exclude_tables: Optional[List[str]] = None,
+                 include_columns: Optional[List[str]] = None, exclude_columns: Optional[List[str]] = None,
+                 row_filters: Optional[Dict[str, str]] = None):
+        self.include_tables = parse_patterns(include_tables)
+        self.exclude_tables = parse_patterns(exclude_tables)
+        self.include_columns = [self._split_column_pattern(p) for p in parse_column_patterns(include_columns)]
+        self.exclude_columns = [self._split_column_pattern(p) for p in parse_column_patterns(exclude_columns)]
+        self.row_filters = parse_row_filters(row_filters)
+
+    @staticmethod
+    def _split_column_pattern(pattern: str) -> Tuple[str, str]:
+        table, _, column = pattern.rpartition('.')
+        return table, column
+
+    def table_selected(self, table_name: str) -> bool:
+        if self.include_tables and not any(fnmatchcase(table_name, p) for p in self.include_tables):
+            return False
+        return not any(fnmatchcase(table_name, p) for p in self.exclude_tables)
+
+    def filter_tables(self, tables: List[str]) -> List[str]:
+        """按表过滤配置筛选表，保持原有顺序"""
+        return [table for table in tables if self.table_selected(table)]
+
+    def has_column_filter(self, table_name: str) -> bool:
+        return any(fnmatchcase(table_name, table) for table, _ in self.include_columns + self.exclude_columns)
+
+    def column_selected(self, table_name: str, column: str) -> bool:
+        includes = [col for table, col in self.include_columns if fnmatchcase(table_name, table)]
+        if includes and not any(fnmatchcase(column, p) for p in includes):
+            return False
+        return not any(fnmatchcase(table_name, table) and fnmatchcase(column, col)
+                       for table, col in self.exclude_columns)
+
+    def project_columns(self, table_name: str, schema: List[Dict], required: Iterable[str] = ()) -> List[Dict]:
+        """按列过滤配置筛选表结构，required中的列（如主键）始终保留"""
+        required = set(required)
+        return [col for col in schema if col['name'] in required or self.column_selected(table_name, col['name'])]
+
+    def row_conditions(self, table_name: str) -> List[Tuple[str, Tuple]]:
+        """表的行过滤条件，格式与读取MySQL时的附加条件一致 [(SQL片段, 参数)]
+
+        查询带参数执行，条件中的%（如LIKE 'a%'）转义后按字面处理
+        """
+        return [(condition.replace('%', '%%'), ())
+                for pattern, condition in self.row_filters.items() if fnmatchcase(table_name, pattern)]
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+同步报告
+按表记录行数统计和各阶段耗时（MySQL读取、转换、飞书列表、飞书写入、限流等待），
+以及飞书接口调用次数和请求字节数；可导出为JSON或Prometheus文本文件（node_exporter textfile collector）
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+
+# 行数统计：读取、转换、新增、更新、跳过（内容未变化或空行）、删除、写入失败
+ROW_COUNTERS = ('read', 'converted', 'created', 'updated', 'skipped', 'deleted', 'failed')
+
+# 断点中保存的此前运行的行数对应的行数统计，未变化的行计为跳过
+RESUMED_COUNTERS = {'read': ('read', 'converted'), 'created': ('created',), 'updated': ('updated',),
+                    'unchanged': ('skipped',)}
+
+# 耗时阶段：MySQL读取、行转换、飞书列表类接口、飞书写入类接口、飞书建表建字段、限流等待、重试退避
+STAGES = ('mysql_read', 'convert', 'base_list', 'base_write', 'base_meta', 'rate_limit_wait', 'backoff')
+
+# 飞书接口类别对应的耗时阶段
+ENDPOINT_STAGES = {'read': 'base_list', 'write': 'base_write', 'meta': 'base_meta'}
+
+STAGE_NAMES = {
+    'mysql_read': 'MySQL读取',
+    'convert': '转换',
+    'base_list': '飞书列表',
+    'base_write': '飞书写入',
+    'base_meta': '飞书元数据',
+    'rate_limit_wait': '限流等待',
+    'backoff': '重试退避',
+}
+
+
+class TableMetrics:
+    """单表同步的行数、各阶段耗时和接口调用统计，线程安全（分片和流水线线程共同累加）
+
+    各阶段耗时为所有线程累计的时间，流水线或分片并发时阶段耗时之和可能大于整表耗时
+    """
+
+    def __init__(self, table: str):
+        self.table = table
+        self.success: Optional[bool] = None
+        self.seconds = 0.0
+        self.api_calls = 0
+        self.request_bytes = 0
+        self._lock = threading.Lock()
+        self._rows: Dict[str, int] = {name: 0 for name in ROW_COUNTERS}
+        self._stages: Dict[str, float] = {name: 0.0 for name in STAGES}
+        self._resumed: Dict[str, int] = {}
+
+    def add_resumed(self, counts: Dict[str, int]):
+        """从断点继续时计入此前运行已完成的行数，rows为包含此前运行在内的总数，resumed_rows为其中此前运行的部分"""
+        with self._lock:
+            for name, value in counts.items():
+                self._resumed[name] = self._resumed.get(name, 0) + value
+                for counter in RESUMED_COUNTERS[name]:
+                    self._rows[counter] += value
+
+    def incr(self, name: str, value: int = 1):
+        if value:
+            with self._lock:
+                self._rows[name] += value
+
+    def add_seconds(self, stage: str, seconds: float):
+        if seconds:
+            with self._lock:
+                self._stages[stage] += seconds
+
+    def add_api_call(self, request_bytes: int):
+        with self._lock:
+            self.api_calls += 1
+            self.request_bytes += request_bytes
+
+    @contextmanager
+    def timer(self, stage: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_seconds(stage, time.perf_counter() - started)
+
+    def timed(self, iterable: Iterable, stage: str) -> Iterator:
+        """逐项迭代iterable，把每次取下一项的耗时计入stage；关闭时同时关闭iterable"""
+        iterator = iter(iterable)
+        try:
+            while True:
+                started = time.perf_counter()
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+                finally:
+                    self.add_seconds(stage, time.perf_counter() - started)
+                yield item
+        finally:
+            close = getattr(iterator, 'close', None)
+            if close is not None:
+                close()
+
+    def format_stages(self) -> str:
+        """按耗时从高到低列出各阶段，用于日志"""
+        with self._lock:
+            stages = sorted(((seconds, stage) for stage, seconds in self._stages.items() if seconds), reverse=True)
+        return ', '.join(f"{STAGE_NAMES[stage]} {seconds:.2f}s" for seconds, stage in stages) or '无'
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            result = {
+                'success': self.success,
+                'seconds': round(self.seconds, 3),
+                'rows': dict(self._rows),
+                'stage_seconds': {stage: round(seconds, 3) for stage, seconds in self._stages.items()},
+                'api_calls': self.api_calls,
+                'request_bytes': self.request_bytes,
+            }
+            if self._resumed:
+                result['resumed_rows'] = dict(self._resumed)
+            return result
+
+
+def _escape_label(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class SyncReport:
+    """一次同步的结构化报告：表名 -> TableMetrics，附带整体耗时和飞书接口统计"""
+
+    PROMETHEUS_PREFIX = 'mysql_to_base_sync'
+
+    def __init__(self):
+        self.started_at = time.time()
+        self.seconds = 0.0
+        self.api_stats: Dict[str, Any] = {}
+        self.tables: Dict[str, TableMetrics] = {}
+        self._lock = threading.Lock()
+
+    def table(self, name: str) -> TableMetrics:
+        """获取表的统计对象，不存在时创建"""
+        with self._lock:
+            metrics = self.tables.get(name)
+            if metrics is None:
+                metrics = self.tables[name] = TableMetrics(name)
+            return metrics
+
+    def finish(self, results: Dict[str, bool], api_stats: Dict[str, Any]):
+        """同步结束后记录各表结果、整体耗时和接口统计"""
+        self.seconds = time.time() - self.started_at
+        self.api_stats = dict(api_stats)
+        for name, success in results.items():
+            self.table(name).success = bool(success)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'started_at': datetime.fromtimestamp(self.started_at).isoformat(timespec='seconds'),
+            'seconds': round(self.seconds, 3),
+            'success': all(metrics.success for metrics in self.tables.values()),
+            'api_stats': self.api_stats,
+            'tables': {name: metrics.to_dict() for name, metrics in self.tables.items()},
+        }
+
+    def to_json(self, **kwargs) -> str:
+        return json.dumps(self.to_dict(), ensure_ascii=False, **kwargs)
+
+    def to_prometheus(self) -> str:
+        """导出为Prometheus文本格式，所有指标为本次同步的快照（gauge）"""
+        prefix = self.PROMETHEUS_PREFIX
+        lines: List[str] = []
+
+        def metric(name: str, help_text: str, samples: List[tuple]):
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            lines.append(f"# TYPE {prefix}_{name} gauge")
+            for labels, value in samples:
+                label_text = ','.join(f'{key}="{_escape_label(str(val))}"' for key, val in labels.items())
+                lines.append(f"{prefix}_{name}{{{label_text}}} {value}" if label_text else f"{prefix}_{name} {value}")
+
+        tables = {name: metrics.to_dict() for name, metrics in self.tables.items()}
+        metric('last_run_timestamp_seconds', 'Start time of the last sync run.', [({}, round(self.started_at, 3))])
+        metric('duration_seconds', 'Wall time of the last sync run.', [({}, round(self.seconds, 3))])
+        metric('table_success', 'Whether the table synced successfully (1) or not (0).',
+               [({'table': name}, int(bool(report['success']))) for name, report in tables.items()])
+        metric('table_seconds', 'Wall time spent syncing the table.',
+               [({'table': name}, report['seconds']) for name, report in tables.items()])
+        metric('rows', 'Rows per table by outcome.',
+               [({'table': name, 'kind': kind}, count)
+                for name, report in tables.items() for kind, count in report['rows'].items()])
+        metric('stage_seconds', 'Time spent per table in each stage, summed over threads.',
+               [({'table': name, 'stage': stage}, seconds)
+                for name, report in tables.items() for stage, seconds in report['stage_seconds'].items()])
+        metric('table_api_calls', 'Base API calls made for the table, including retries.',
+               [({'table': name}, report['api_calls']) for name, report in tables.items()])
+        metric('table_request_bytes', 'Base API request body bytes sent for the table.',
+               [({'table': name}, report['request_bytes']) for name, report in tables.items()])
+        metric('api', 'Base API call statistics of the whole run.',
+               [({'kind': kind}, value) for kind, value in self.api_stats.items()])
+        return '\n'.join(lines) + '\n'
+
+    def write_json(self, path: str):
+        self._write_atomic(path, self.to_json(indent=2))
+
+    def write_prometheus(self, path: str):
+        """写入Prometheus文本文件；先写临时文件再替换，避免采集到写了一半的文件"""
+        self._write_atomic(path, self.to_prometheus())
+
+    @staticmethod
+    def _write_atomic(path: str, content: str):
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        os.replace(tmp_path, path)
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+本地同步状态存储
+使用SQLite记录每个飞书表格中 记录标识 -> (record_id, 内容指纹, 最近同步时间)，
+后续同步直接复用，无需每次分页拉取整张飞书表格；同时保存水位增量同步的水位
+和binlog实时同步的读取位置，以及中断的单表同步的断点
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+
+class SyncStateStore:
+    """基于SQLite的同步状态存储，线程安全，可在多个同步线程间共享"""
+
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._init_schema()
+
+    def _init_schema(self):
+        with self._lock, self._conn:
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS record_state (
+                    app_token TEXT NOT NULL,
+                    table_id TEXT NOT NULL,
+                    record_key TEXT NOT NULL,
+                    record_id TEXT NOT NULL,
+                    fingerprint TEXT,
+                    synced_at REAL NOT NULL,
+                    PRIMARY KEY (app_token, table_id, record_key)
+                )
+            """)
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS table_state (
+                    app_token TEXT NOT NULL,
+                    table_id TEXT NOT NULL,
+                    mysql_table TEXT,
+                    indexed_at REAL NOT NULL,
+                    PRIMARY KEY (app_token, table_id)
+                )
+            """)
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS watermark_state (
+                    app_token TEXT NOT NULL,
+                    table_id TEXT NOT NULL,
+                    mysql_table TEXT,
+                    column_name TEXT NOT NULL,
+                    watermark TEXT NOT NULL,
+                    updated_at REAL NOT NULL,
+                    PRIMARY KEY (app_token, table_id)
+                )
+            """)
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS binlog_state (
+                    app_token TEXT NOT NULL,
+                    source TEXT NOT NULL,
+                    log_file TEXT NOT NULL,
+                    log_pos INTEGER NOT NULL,
+                    updated_at REAL NOT NULL,
+                    PRIMARY KEY (app_token, source)
+                )
+            """)
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS checkpoint_state (
+                    app_token TEXT NOT NULL,
+                    table_id TEXT NOT NULL,
+                    mysql_table TEXT,
+                    checkpoint TEXT NOT NULL,
+                    updated_at REAL NOT NULL,
+                    PRIMARY KEY (app_token, table_id)
+                )
+            """)
+
+    def load_index(self, app_token: str, table_id: str) -> Optional[Tuple[Dict[str, str], Dict[str, str]]]:
+        """读取表格的记录索引，返回 (记录标识 -> record_id, 记录标识 -> 内容指纹)，没有状态时返回None"""
+        with self._lock:
+            exists = self._conn.execute(
+                "SELECT 1 FROM table_state WHERE app_token = ? AND table_id = ?",
+                (app_token, table_id)).fetchone()
+            if not exists:
+                return None
+            rows = self._conn.execute(
+                "SELECT record_key, record_id, fingerprint FROM record_state WHERE app_token = ? AND table_id = ?",
+                (app_token, table_id)).fetchall()
+
+        records = {}
+        fingerprints = {}
+        for record_key, record_id, fingerprint in rows:
+            records[record_key] = record_id
+            if fingerprint:
+                fingerprints[record_key] = fingerprint
+        return records, fingerprints
+
+    def save_index(self, app_token: str, table_id: str, mysql_table: str,
+                   records: Dict[str, str], fingerprints: Dict[str, str]):
+        """用完整拉取得到的索引替换表格的全部状态"""
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM record_state WHERE app_token = ? AND table_id = ?",
+                               (app_token, table_id))
+            self._conn.executemany(
+                "INSERT INTO record_state VALUES (?, ?, ?, ?, ?, ?)",
+                ((app_token, table_id, key, record_id, fingerprints.get(key), now)
+                 for key, record_id in records.items()))
+            self._conn.execute("INSERT OR REPLACE INTO table_state VALUES (?, ?, ?, ?)",
+                               (app_token, table_id, mysql_table, now))
+
+    def upsert_records(self, app_token: str, table_id: str,
+                       rows: Iterable[Tuple[str, str, Optional[str]]]):
+        """写入成功后更新记录状态，rows为 (记录标识, record_id, 内容指纹)"""
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO record_state VALUES (?, ?, ?, ?, ?, ?)",
+                ((app_token, table_id, key, record_id, fingerprint, now)
+                 for key, record_id, fingerprint in rows))
+
+    def delete_records(self, app_token: str, table_id: str, record_keys: Iterable[str]):
+        """删除记录后移除对应的记录状态"""
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "DELETE FROM record_state WHERE app_token = ? AND table_id = ? AND record_key = ?",
+                ((app_token, table_id, key) for key in record_keys))
+
+    def get_watermark(self, app_token: str, table_id: str) -> Optional[Tuple[str, str]]:
+        """读取表格上次同步完成时的水位，返回 (水位字段, 水位值)，没有时返回None"""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT column_name, watermark FROM watermark_state WHERE app_token = ? AND table_id = ?",
+                (app_token, table_id)).fetchone()
+
+    def set_watermark(self, app_token: str, table_id: str, mysql_table: str, column_name: str, watermark: str):
+        """保存表格本次同步完成时的水位"""
+        with self._lock, self._conn:
+            self._conn.execute("INSERT OR REPLACE INTO watermark_state VALUES (?, ?, ?, ?, ?, ?)",
+                               (app_token, table_id, mysql_table, column_name, watermark, time.time()))
+
+    def get_binlog_position(self, app_token: str, source: str) -> Optional[Tuple[str, int]]:
+        """读取binlog实时同步已写入飞书的位置，返回 (binlog文件, 位置)，没有时返回None"""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT log_file, log_pos FROM binlog_state WHERE app_token = ? AND source = ?",
+                (app_token, source)).fetchone()
+
+    def set_binlog_position(self, app_token: str, source: str, log_file: str, log_pos: int):
+        """保存binlog实时同步已写入飞书的位置"""
+        with self._lock, self._conn:
+            self._conn.execute("INSERT OR REPLACE INTO binlog_state VALUES (?, ?, ?, ?, ?)",
+                               (app_token, source, log_file, int(log_pos), time.time()))
+
+    def get_checkpoint(self, app_token: str, table_id: str) -> Optional[Dict[str, Any]]:
+        """读取表格未完成同步的断点，没有时返回None"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT checkpoint FROM checkpoint_state WHERE app_token = ? AND table_id = ?",
+                (app_token, table_id)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def set_checkpoint(self, app_token: str, table_id: str, mysql_table: str, checkpoint: Dict[str, Any]):
+        """保存表格同步的断点（读取位置和已同步的记录数），checkpoint需要可以JSON序列化"""
+        with self._lock, self._conn:
+            self._conn.execute("INSERT OR REPLACE INTO checkpoint_state VALUES (?, ?, ?, ?, ?)",
+                               (app_token, table_id, mysql_table, json.dumps(checkpoint, ensure_ascii=False),
+                                time.time()))
+
+    def clear_checkpoint(self, app_token: str, table_id: str):
+        """表格同步完成后删除断点"""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM checkpoint_state WHERE app_token = ? AND table_id = ?",
+                               (app_token, table_id))
+
+    def invalidate(self, app_token: str, table_id: str):
+        """删除表格的全部状态，下次同步时重新完整拉取"""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM checkpoint_state WHERE app_token = ? AND table_id = ?",
+                               (app_token, table_id))
+            self._conn.execute("DELETE FROM watermark_state WHERE app_token = ? AND table_id = ?",
+                               (app_token, table_id))
+            self._conn.execute("DELETE FROM record_state WHERE app_token = ? AND table_id = ?",
+                               (app_token, table_id))
+            self._conn.execute("DELETE FROM table_state WHERE app_token = ? AND table_id = ?",
+                               (app_token, table_id))
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试飞书字段缓存与字段补齐
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+import mysql_to_base_sync
+from conftest import reply, stub_base_client
+
+
+class StubFieldApi:
+    def __init__(self, field_names, reject=()):
+        self.field_names = list(field_names)
+        self.reject = set(reject)
+        self.list_calls = 0
+        self.created = []
+
+    def list(self, request):
+        self.list_calls += 1
+        return reply(data=SimpleNamespace(items=[SimpleNamespace(field_name=name) for name in self.field_names],
+                                          has_more=False))
+
+    def create(self, request):
+        field = request.request_body
+        if field.field_name in self.reject:
+            return reply(success=False, code=1254014, msg='FieldNameDuplicated')
+        self.created.append((field.field_name, field.type))
+        self.field_names.append(field.field_name)
+        return reply(data=SimpleNamespace(field=field))
+
+
+SCHEMA = [
+    {'name': 'id', 'type': 'int(11)'},
+    {'name': 'name', 'type': 'varchar(50)'},
+    {'name': 'created', 'type': 'datetime'},
+    {'name': 'score', 'type': 'decimal(5,2)'},
+]
+
+
+@pytest.fixture
+def field_syncer(make_syncer):
+    return lambda field_api: make_syncer(stub_base_client(app_table_field=field_api),
+                                         rate_limits={'read': 1000, 'meta': 1000})
+
+
+def test_missing_fields_created_once(field_syncer):
+    """飞书中缺少的字段按MySQL类型创建，字段列表只拉取一次"""
+    field_api = StubFieldApi(['id', 'name'])
+    syncer = field_syncer(field_api)
+
+    assert syncer.ensure_base_fields('users', 'tbl', SCHEMA) == SCHEMA
+    assert field_api.created == [('created', 5), ('score', 2)]
+    assert syncer.get_base_field_names('tbl') == ['id', 'name', 'created', 'score']
+    assert syncer.ensure_base_fields('users', 'tbl', SCHEMA) == SCHEMA
+    assert field_api.list_calls == 1
+
+
+def test_failed_fields_are_not_written(field_syncer):
+    """字段创建失败时从表结构中去除，该列不写入飞书，其他列照常同步"""
+    field_api = StubFieldApi(['id', 'name'], reject=['score'])
+    syncer = field_syncer(field_api)
+
+    schema = syncer.ensure_base_fields('users', 'tbl', SCHEMA)
+    assert [col['name'] for col in schema] == ['id', 'name', 'created']
+
+
+def test_select_fields_created_with_options(field_syncer):
+    """enum/set列创建为单选/多选字段并带有选项"""
+    field_api = StubFieldApi(['id'])
+    syncer = field_syncer(field_api)
+    schema = [{'name': 'id', 'type': 'int(11)'},
+              {'name': 'status', 'type': "enum('new','paid')"},
+              {'name': 'tags', 'type': "set('a','b')"}]
+
+    assert syncer.ensure_base_fields('orders', 'tbl', schema) == schema
+    assert field_api.created == [('status', 3), ('tags', 4)]
+    header = syncer._build_field(schema[1], mysql_to_base_sync.base_v1.AppTableCreateHeader.builder())
+    assert header.ui_type == 'SingleSelect'
+    assert [option.name for option in header.property.options] == ['选项1', '选项2', '选项3']
+
+
+def test_existing_table_is_reconciled_before_sync(field_syncer):
+    """已存在的飞书表格先补齐字段，再按补齐后的表结构同步数据"""
+    field_api = StubFieldApi(['id', 'name', 'created'], reject=['score'])
+    syncer = field_syncer(field_api)
+    syncer.get_table_schema = lambda table_name: SCHEMA
+    synced = {}
+    syncer.sync_table_data = lambda mysql_table, table_id, schema: synced.setdefault(mysql_table, schema) and True
+
+    assert syncer.sync_table('users', {'users': 'tbl'})
+    assert [col['name'] for col in synced['users']] == ['id', 'name', 'created']
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试asyncio飞书接口传输：使用本地模拟的多维表格开放接口
+"""
+
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+from baseopensdk.api.base.v1 import *
+from base_transport import AsyncBaseTransport, AsyncTransportClient
+
+
+class FakeBaseServer(ThreadingHTTPServer):
+    """模拟多维表格开放接口：数据表列表、记录列表、批量新增/更新/删除记录"""
+    daemon_threads = True
+
+    def __init__(self, delay: float = 0.0):
+        super().__init__(('127.0.0.1', 0), FakeBaseHandler)
+        self.delay = delay
+        self.tables = {'tbl1': 'users'}
+        self.records = {}
+        self.next_id = 0
+        self.lock = threading.Lock()
+        self.connections = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.requests = []
+        self.host_headers = []
+        self.fail_next = 0
+        self.drop_idle = False
+        self.thread = threading.Thread(target=self.serve_forever, args=(0.05,), daemon=True)
+        self.thread.start()
+
+    @property
+    def domain(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+class FakeBaseHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def do_GET(self):
+        self.handle_api()
+
+    def do_POST(self):
+        self.handle_api()
+
+    def handle_api(self):
+        server = self.server
+        length = int(self.headers.get('Content-Length') or 0)
+        body = json.loads(self.rfile.read(length)) if length else None
+        url = urlsplit(self.path)
+        query = {k: v[0] for k, v in parse_qs(url.query).items()}
+        with server.lock:
+            server.requests.append((self.command, url.path, query, body, self.headers.get('Authorization')))
+            server.host_headers.append(self.headers.get('Host'))
+            server.in_flight += 1
+            server.peak_in_flight = max(server.peak_in_flight, server.in_flight)
+            fail = server.fail_next > 0
+            server.fail_next -= fail
+        try:
+            time.sleep(server.delay)
+            if fail:
+                self.reply(429, {'code': 1254290, 'msg': 'TooManyRequest'})
+                return
+            with server.lock:
+                self.reply(200, {'code': 0, 'msg': 'success', 'data': self.route(url.path, query, body)})
+        finally:
+            with server.lock:
+                server.in_flight -= 1
+
+    def route(self, path, query, body):
+        server = self.server
+        parts = path.split('/')[6:]  # /open-apis/bitable/v1/apps/:app_token/...
+        if parts == ['tables']:
+            items = [{'table_id': table_id, 'name': name} for table_id, name in server.tables.items()]
+            return {'items': items, 'has_more': False, 'total': len(items)}
+        records = server.records.setdefault(parts[1], {})
+        action = parts[-1]
+        if action == 'records':
+            start = int(query.get('page_token') or 0)
+            size = int(query.get('page_size') or 20)
+            names = json.loads(query['field_names']) if 'field_names' in query else None
+            items = [{'record_id': record_id,
+                      'fields': {k: v for k, v in fields.items() if names is None or k in names}}
+                     for record_id, fields in list(records.items())[start:start + size]]
+            has_more = start + size < len(records)
+            return {'items': items, 'has_more': has_more, 'page_token': str(start + size) if has_more else None,
+                    'total': len(records)}
+        if action == 'batch_create':
+            created = []
+            for record in body['records']:
+                server.next_id += 1
+                record_id = f"rec{server.next_id}"
+                records[record_id] = record['fields']
+                created.append({'record_id': record_id, 'fields': record['fields']})
+            return {'records': created}
+        if action == 'batch_update':
+            for record in body['records']:
+                records[record['record_id']].update(record['fields'])
+            return {'records': body['records']}
+        if action == 'batch_delete':
+            for record_id in body['records']:
+                records.pop(record_id, None)
+            return {'records': [{'record_id': record_id, 'deleted': True} for record_id in body['records']]}
+        raise ValueError(path)
+
+    def reply(self, status, payload):
+        content = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+        if self.server.drop_idle:
+            # 不发送Connection: close，直接关闭连接，模拟服务端回收空闲连接
+            self.close_connection = True
+
+
+@pytest.fixture
+def server():
+    server = FakeBaseServer()
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def client(server):
+    client = AsyncTransportClient(server.domain, 'app', 'pt-token', max_in_flight=4)
+    yield client
+    client.close()
+
+
+def create_request(table_id, rows):
+    return BatchCreateAppTableRecordRequest.builder() \
+        .table_id(table_id) \
+        .request_body(BatchCreateAppTableRecordRequestBody.builder()
+                      .records([AppTableRecord.builder().fields(fields).build() for fields in rows])
+                      .build()) \
+        .build()
+
+
+def test_builder_requests_round_trip(server, client):
+    """SDK请求对象编码为开放接口的路径、查询参数和JSON请求体，响应解析为SDK响应对象"""
+    response = client.base.v1.app_table_record.batch_create(create_request('tbl1', [{'id': 1, 'name': '张三'}]))
+    assert response.success()
+    record_id = response.data.records[0].record_id
+
+    method, path, _, body, auth = server.requests[-1]
+    assert (method, path) == ('POST', '/open-apis/bitable/v1/apps/app/tables/tbl1/records/batch_create')
+    assert body == {'records': [{'fields': {'id': 1, 'name': '张三'}}]}
+    assert auth == 'Bearer pt-token'
+
+    request = ListAppTableRecordRequest.builder().table_id('tbl1').page_size(500) \
+        .field_names(json.dumps(['id'])).build()
+    response = client.base.v1.app_table_record.list(request)
+    assert isinstance(response, ListAppTableRecordResponse)
+    assert [(item.record_id, item.fields) for item in response.data.items] == [(record_id, {'id': 1})]
+    assert server.requests[-1][2] == {'page_size': '500', 'field_names': '["id"]'}
+    assert response.raw.status_code == 200
+    # 非默认端口时Host头带上端口
+    assert server.host_headers[-1] == f"127.0.0.1:{server.server_address[1]}"
+
+
+def test_host_header_omits_default_port():
+    assert AsyncBaseTransport('https://base-api.feishu.cn', 'app', 'pt').host_header == 'base-api.feishu.cn'
+    assert AsyncBaseTransport('http://example.com:80', 'app', 'pt').host_header == 'example.com'
+    assert AsyncBaseTransport('https://example.com:8443', 'app', 'pt').host_header == 'example.com:8443'
+    assert AsyncBaseTransport('http://[::1]:8080', 'app', 'pt').host_header == '[::1]:8080'
+
+
+def test_keep_alive_reuses_connection(server, client):
+    """顺序请求复用同一条连接"""
+    for _ in range(20):
+        assert client.base.v1.app_table.list(ListAppTableRequest.builder().build()).success()
+    assert server.connections == 1
+    assert client.transport.connections_opened == 1
+
+
+def test_in_flight_limit(server):
+    """并发请求数不超过max_in_flight，连接数不超过并发数"""
+    server.delay = 0.05
+    transport = AsyncBaseTransport(server.domain, 'app', 'pt-token', max_in_flight=3)
+
+    async def run():
+        requests = [create_request('tbl1', [{'id': i}]) for i in range(12)]
+        responses = await asyncio.gather(*(transport.request(request) for request in requests))
+        await transport.close()
+        return responses
+
+    responses = asyncio.run(run())
+    assert all(response.success() for response in responses)
+    assert server.peak_in_flight == 3
+    assert transport.connections_opened == 3
+    assert len(server.records['tbl1']) == 12
+
+
+def test_server_closed_idle_connection(server, client):
+    """服务端关闭空闲连接后自动换新连接重发"""
+    server.drop_idle = True
+    for _ in range(3):
+        assert client.base.v1.app_table.list(ListAppTableRequest.builder().build()).success()
+    assert client.transport.connections_opened == 3
+    assert len(server.requests) == 3
+
+
+def test_syncer_uses_async_transport(server, client, make_syncer):
+    """同步器使用async传输时限流重试、批量写入和已存在记录索引与SDK客户端行为一致"""
+    syncer = make_syncer(client, personal_base_token='pt-token', base_transport='async',
+                         rate_limits={'read': 1000, 'write': 1000})
+    syncer.retry_policy.backoff = lambda attempt, retry_after=None: 0
+
+    assert syncer.get_base_tables() == {'users': 'tbl1'}
+    server.fail_next = 1
+    created = []
+    assert syncer._batch_create_records('tbl1', [{'fields': {'id': i, 'name': f'n{i}'}} for i in range(3)], created)
+    assert len(created) == 3 and syncer.api_stats.snapshot()['throttled'] == 1
+
+    existing, _ = syncer.get_existing_index('tbl1', 'id')
+    assert existing == {str(i): record_id for i, record_id in enumerate(created)}
+    assert syncer._batch_update_records('tbl1', [{'record_id': created[0], 'fields': {'name': 'x'}}])
+    assert syncer._batch_delete_records('tbl1', created[1:])
+    assert server.records['tbl1'] == {created[0]: {'id': 0, 'name': 'x'}}
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
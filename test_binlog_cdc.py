@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试binlog实时同步
+单元测试使用桩事件和桩飞书客户端；设置CDC_TEST_MYSQL_HOST等环境变量后，
+额外连接本地开启binlog的MySQL进行集成测试
+"""
+
+import itertools
+import os
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from binlog_cdc import BinlogCDCSync, CDCConfig
+from conftest import reply
+from mysql_to_base_sync import MySQLConfig, BaseConfig, SyncConfig, MySQLToBaseSync
+
+
+class StubBaseClient:
+    """内存中的飞书记录接口，只实现实时同步用到的调用"""
+
+    def __init__(self):
+        self.records = {}
+        self.calls = []
+        self.fail_create = False
+        self._ids = itertools.count(1)
+        record_api = SimpleNamespace(list=self._list, batch_create=self._create,
+                                     batch_update=self._update, batch_delete=self._delete)
+        self.base = SimpleNamespace(v1=SimpleNamespace(app_table_record=record_api))
+
+    def _list(self, request):
+        self.calls.append('list')
+        items = [SimpleNamespace(record_id=rid, fields=dict(fields)) for rid, fields in self.records.items()]
+        return reply(SimpleNamespace(items=items, has_more=False, page_token=None, total=len(items)))
+
+    def _create(self, request):
+        self.calls.append('create')
+        if self.fail_create:
+            return reply(success=False, msg='internal error')
+        created = []
+        for record in request.request_body.records:
+            record_id = f"rec{next(self._ids)}"
+            self.records[record_id] = dict(record['fields'])
+            created.append(SimpleNamespace(record_id=record_id, fields=record['fields']))
+        return reply(SimpleNamespace(records=created))
+
+    def _update(self, request):
+        self.calls.append('update')
+        for record in request.request_body.records:
+            self.records[record['record_id']].update(record['fields'])
+        return reply(SimpleNamespace(records=[]))
+
+    def _delete(self, request):
+        self.calls.append('delete')
+        for record_id in request.request_body.records:
+            self.records.pop(record_id, None)
+        return reply(SimpleNamespace(records=[]))
+
+    def rows(self):
+        """按id返回当前记录内容，忽略显式置空的字段"""
+        rows = [{k: v for k, v in fields.items() if v is not None} for fields in self.records.values()]
+        return sorted(rows, key=lambda row: row['id'])
+
+
+class StubServerConnection:
+    """只响应SHOW GLOBAL VARIABLES的MySQL连接，默认满足实时同步要求的binlog配置"""
+
+    def __init__(self, **overrides):
+        self.variables = dict(BinlogCDCSync.REQUIRED_SERVER_VARIABLES, **overrides)
+
+    def cursor(self):
+        conn = self
+
+        class Cursor:
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *args):
+                pass
+
+            def execute(self, sql):
+                assert sql.startswith('SHOW GLOBAL VARIABLES')
+
+            def fetchall(self):
+                return [{'Variable_name': name, 'Value': value} for name, value in conn.variables.items()
+                        if value is not None]
+
+        return Cursor()
+
+    def close(self):
+        pass
+
+
+class StubStream:
+    """按顺序产生events的binlog流，每个事件后推进到positions中的下一个位置"""
+
+    def __init__(self, events, positions, log_file='mysql-bin.000001', log_pos=4):
+        self.events = events
+        self.positions = iter(positions)
+        self.log_file = log_file
+        self.log_pos = log_pos
+        self.closed = False
+
+    def __iter__(self):
+        for event in self.events:
+            self.log_pos = next(self.positions)
+            yield event
+
+    def close(self):
+        self.closed = True
+
+
+# 与pymysqlreplication中的事件同名，BinlogCDCSync按事件类名分派
+class WriteRowsEvent(SimpleNamespace):
+    pass
+
+
+class UpdateRowsEvent(SimpleNamespace):
+    pass
+
+
+class DeleteRowsEvent(SimpleNamespace):
+    pass
+
+
+class XidEvent(SimpleNamespace):
+    pass
+
+
+USERS_SCHEMA = [
+    {'name': 'id', 'type': 'int', 'null': False, 'key': 'PRI', 'default': None, 'extra': ''},
+    {'name': 'name', 'type': 'varchar(50)', 'null': True, 'key': '', 'default': None, 'extra': ''},
+]
+
+
+@pytest.fixture
+def cdc_syncer(make_syncer):
+    def factory(state_path=None):
+        syncer = make_syncer(StubBaseClient(), state_path=state_path,
+                             rate_limits={'read': 1000, 'write': 1000, 'meta': 1000})
+        syncer.get_base_tables = lambda: {'users': 'tbl_users'}
+        syncer.get_table_schema = lambda table_name: USERS_SCHEMA
+        syncer.get_primary_key_columns = lambda table_name: ['id']
+        syncer.mysql_conn = StubServerConnection()
+        return syncer
+    return factory
+
+
+def test_events_are_coalesced_per_record(cdc_syncer):
+    """同一记录在一个批次内的多次变更只写入最后一次"""
+    syncer = cdc_syncer()
+    cdc = BinlogCDCSync(syncer, CDCConfig(batch_size=100))
+    cdc.handle_event(WriteRowsEvent(table='users', rows=[{'values': {'id': 1, 'name': 'a'}},
+                                                         {'values': {'id': 2, 'name': 'b'}}]))
+    cdc.handle_event(UpdateRowsEvent(table='users', rows=[{'before_values': {'id': 1, 'name': 'a'},
+                                                           'after_values': {'id': 1, 'name': 'a2'}}]))
+    cdc.handle_event(DeleteRowsEvent(table='users', rows=[{'values': {'id': 2, 'name': 'b'}}]))
+    cdc.flush()
+
+    assert syncer.base_client.rows() == [{'id': 1, 'name': 'a2'}]
+    # 只拉取一次已有记录索引，只创建一次，记录2从未写入飞书因此无需删除
+    assert syncer.base_client.calls == ['list', 'create']
+    assert cdc.stats['created'] == 1 and cdc.stats['deleted'] == 0
+
+
+def test_update_delete_and_primary_key_change(cdc_syncer):
+    """更新已存在记录、删除记录；主键被修改时删除旧记录并写入新记录"""
+    syncer = cdc_syncer()
+    cdc = BinlogCDCSync(syncer, CDCConfig(batch_size=100))
+    cdc.handle_event(WriteRowsEvent(table='users', rows=[{'values': {'id': i, 'name': f'n{i}'}} for i in (1, 2, 3)]))
+    cdc.flush()
+
+    cdc.handle_event(UpdateRowsEvent(table='users', rows=[
+        {'before_values': {'id': 1, 'name': 'n1'}, 'after_values': {'id': 1, 'name': None}},
+        {'before_values': {'id': 2, 'name': 'n2'}, 'after_values': {'id': 20, 'name': 'n2'}},
+    ]))
+    cdc.handle_event(DeleteRowsEvent(table='users', rows=[{'values': {'id': 3, 'name': 'n3'}}]))
+    cdc.flush()
+
+    assert syncer.base_client.rows() == [{'id': 1}, {'id': 20, 'name': 'n2'}]
+    assert cdc.stats == {'events': 3, 'created': 4, 'updated': 1, 'deleted': 2, 'flushes': 2}
+
+
+def test_unknown_and_filtered_tables_are_ignored(cdc_syncer):
+    """飞书中不存在的表和未选择的表不产生写入"""
+    syncer = cdc_syncer()
+    cdc = BinlogCDCSync(syncer, CDCConfig(tables=['users']))
+    cdc.handle_event(WriteRowsEvent(table='orders', rows=[{'values': {'id': 1}}]))
+    syncer.get_base_tables = lambda: {}
+    cdc.config.tables = None
+    cdc.handle_event(WriteRowsEvent(table='orders', rows=[{'values': {'id': 1}}]))
+    assert cdc._pending_count == 0
+    assert cdc.stats['events'] == 0
+
+
+def test_position_saved_at_transaction_boundary(cdc_syncer, tmp_path):
+    """位置只在事务提交后保存，批量写入成功后才推进；重启时从保存的位置继续"""
+    syncer = cdc_syncer(str(tmp_path / 'sync_state.db'))
+    syncer.state_store.set_binlog_position('app', cdc_source(syncer), 'mysql-bin.000001', 4)
+
+    events = [
+        WriteRowsEvent(table='users', rows=[{'values': {'id': 1, 'name': 'a'}}]),
+        XidEvent(),
+        WriteRowsEvent(table='users', rows=[{'values': {'id': 2, 'name': 'b'}}]),
+    ]
+
+    def stream_factory(**kwargs):
+        assert kwargs['log_file'] == 'mysql-bin.000001' and kwargs['log_pos'] == 4
+        return StubStream(events, [100, 120, 180])
+
+    cdc = BinlogCDCSync(syncer, CDCConfig(flush_interval=3600, initial_sync=False), stream_factory=stream_factory)
+    cdc.run()
+
+    assert [row['id'] for row in syncer.base_client.rows()] == [1, 2]
+    # 第二个事务未看到提交事件，保存的位置停在第一个事务之后，重启时重放（按主键幂等写入）
+    assert syncer.state_store.get_binlog_position('app', cdc_source(syncer)) == ('mysql-bin.000001', 120)
+    syncer.close_connections()
+
+
+def test_binlog_settings_checked_before_reading(cdc_syncer):
+    """binlog格式或列元数据不满足要求时启动即报错，不读取binlog"""
+    syncer = cdc_syncer()
+    syncer.mysql_conn = StubServerConnection(binlog_row_metadata='MINIMAL', binlog_row_image=None)
+    opened = []
+    cdc = BinlogCDCSync(syncer, CDCConfig(initial_sync=False), stream_factory=lambda **kwargs: opened.append(kwargs))
+    with pytest.raises(Exception, match='binlog_row_image=未设置, binlog_row_metadata=MINIMAL'):
+        cdc.run()
+    assert opened == []
+
+
+def test_failed_flush_is_not_repeated_on_exit(cdc_syncer):
+    """写入失败后退出时不再写入累积的变更，原始错误不被掩盖，binlog流照常关闭"""
+    syncer = cdc_syncer()
+    syncer.base_client.fail_create = True
+    syncer.retry_policy.backoff = lambda attempt, retry_after=None: 0
+    stream = StubStream([WriteRowsEvent(table='users', rows=[{'values': {'id': 1, 'name': 'a'}}])], [100])
+    cdc = BinlogCDCSync(syncer, CDCConfig(flush_interval=0, initial_sync=False),
+                        stream_factory=lambda **kwargs: stream)
+    cdc.start_position = lambda: ('mysql-bin.000001', 4)
+    with pytest.raises(Exception, match='创建记录失败'):
+        cdc.run()
+    assert syncer.base_client.calls.count('create') == 1
+    assert stream.closed
+
+
+def cdc_source(syncer):
+    config = syncer.mysql_config
+    return f"{config.host}:{config.port}/{config.database}"
+
+
+MYSQL_TEST_ENV = 'CDC_TEST_MYSQL_HOST'
+
+
+@pytest.mark.skipif(not os.getenv(MYSQL_TEST_ENV), reason=f"未设置{MYSQL_TEST_ENV}，跳过MySQL集成测试")
+def test_cdc_against_local_mysql(tmp_path):
+    """连接本地MySQL：写入、更新、删除后读取binlog同步到桩飞书客户端"""
+    pytest.importorskip('pymysqlreplication')
+    syncer = MySQLToBaseSync(
+        MySQLConfig(host=os.getenv(MYSQL_TEST_ENV), port=int(os.getenv('CDC_TEST_MYSQL_PORT', 3306)),
+                    username=os.getenv('CDC_TEST_MYSQL_USERNAME', 'root'),
+                    password=os.getenv('CDC_TEST_MYSQL_PASSWORD', ''),
+                    database=os.getenv('CDC_TEST_MYSQL_DATABASE', 'test')),
+        BaseConfig(app_token='app', personal_base_token='token'),
+        SyncConfig(state_path=str(tmp_path / 'sync_state.db')),
+    )
+    assert syncer.connect_mysql()
+    syncer.base_client = StubBaseClient()
+    syncer.get_base_tables = lambda: {'cdc_users': 'tbl_users'}
+
+    with syncer.mysql_conn.cursor() as cursor:
+        cursor.execute("DROP TABLE IF EXISTS cdc_users")
+        cursor.execute("CREATE TABLE cdc_users (id INT PRIMARY KEY, name VARCHAR(50))")
+    syncer.mysql_conn.commit()
+
+    cdc = BinlogCDCSync(syncer, CDCConfig(tables=['cdc_users'], initial_sync=False, flush_interval=0.1))
+    cdc.start_position()
+    with syncer.mysql_conn.cursor() as cursor:
+        cursor.execute("INSERT INTO cdc_users VALUES (1, 'a'), (2, 'b')")
+        cursor.execute("UPDATE cdc_users SET name = 'a2' WHERE id = 1")
+        cursor.execute("DELETE FROM cdc_users WHERE id = 2")
+    syncer.mysql_conn.commit()
+
+    started = time.monotonic()
+    cdc.run(max_events=3)
+    assert time.monotonic() - started < 30
+    assert syncer.base_client.rows() == [{'id': 1, 'name': 'a2'}]
+
+    with syncer.mysql_conn.cursor() as cursor:
+        cursor.execute("DROP TABLE cdc_users")
+    syncer.close_connections()
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试MySQL元数据批量加载与缓存
+"""
+
+from datetime import datetime
+
+import pytest
+
+
+TABLES = [
+    {'table_name': 'orders', 'table_rows': 2000000, 'update_time': datetime(2024, 5, 1)},
+    {'table_name': 'tags', 'table_rows': None, 'update_time': None},
+]
+COLUMNS = [
+    {'table_name': 'orders', 'name': 'shop_id', 'type': 'int(11)', 'nullable': 'NO', 'column_key': 'PRI',
+     'column_default': None, 'extra': ''},
+    {'table_name': 'orders', 'name': 'order_id', 'type': 'bigint(20)', 'nullable': 'NO', 'column_key': 'PRI',
+     'column_default': None, 'extra': ''},
+    {'table_name': 'orders', 'name': 'updated_at', 'type': 'timestamp', 'nullable': 'YES', 'column_key': '',
+     'column_default': 'CURRENT_TIMESTAMP', 'extra': 'on update CURRENT_TIMESTAMP'},
+    {'table_name': 'tags', 'name': 'name', 'type': 'varchar(50)', 'nullable': 'YES', 'column_key': '',
+     'column_default': None, 'extra': ''},
+]
+KEYS = [
+    {'table_name': 'orders', 'name': 'shop_id'},
+    {'table_name': 'orders', 'name': 'order_id'},
+]
+
+
+class StubCursor:
+    def __init__(self, conn):
+        self.conn = conn
+        self.rows = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+    def execute(self, sql, params=None):
+        self.conn.queries.append(sql)
+        if self.conn.fail:
+            raise Exception('access denied')
+        if 'INFORMATION_SCHEMA.TABLES' in sql:
+            self.rows = TABLES
+        elif 'INFORMATION_SCHEMA.COLUMNS' in sql:
+            self.rows = COLUMNS
+        elif 'KEY_COLUMN_USAGE' in sql and 'TABLE_NAME =' not in sql:
+            self.rows = KEYS
+        elif 'KEY_COLUMN_USAGE' in sql:
+            self.rows = [{'COLUMN_NAME': 'id'}]
+        else:
+            self.rows = [{'Field': 'id', 'Type': 'int(11)', 'Null': 'NO', 'Key': 'PRI', 'Default': None,
+                          'Extra': 'auto_increment'}]
+
+    def fetchall(self):
+        return self.rows
+
+
+class StubConnection:
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.queries = []
+
+    def cursor(self, cursor_class=None):
+        return StubCursor(self)
+
+
+@pytest.fixture
+def catalog_syncer(make_syncer):
+    def factory(conn):
+        syncer = make_syncer()
+        syncer.mysql_conn = conn
+        return syncer
+    return factory
+
+
+def test_catalog_serves_per_table_lookups(catalog_syncer):
+    """三次查询加载全部表的元数据，之后表列表、表结构、主键和估算行数都不再查询MySQL"""
+    conn = StubConnection()
+    syncer = catalog_syncer(conn)
+    assert syncer.load_catalog()
+    assert len(conn.queries) == 3
+
+    assert syncer.get_mysql_tables() == ['orders', 'tags']
+    schema = syncer.get_table_schema('orders')
+    assert [col['name'] for col in schema] == ['shop_id', 'order_id', 'updated_at']
+    assert schema[2] == {'name': 'updated_at', 'type': 'timestamp', 'null': True, 'key': '',
+                         'default': 'CURRENT_TIMESTAMP', 'extra': 'on update CURRENT_TIMESTAMP'}
+    assert syncer.detect_watermark_column(schema) == 'updated_at'
+    assert syncer.get_primary_key_columns('orders') == ['shop_id', 'order_id']
+    assert syncer.get_primary_key_columns('tags') == []
+    assert syncer.estimate_table_rows('orders') == 2000000
+    assert syncer.catalog['orders'].update_time == datetime(2024, 5, 1)
+    assert len(conn.queries) == 3
+
+    # 调用方修改返回的表结构不影响缓存
+    schema.pop()
+    assert len(syncer.get_table_schema('orders')) == 3
+
+
+def test_uncached_table_falls_back_to_queries(catalog_syncer):
+    """不在缓存中的表（如同步期间新建）和加载失败时逐表查询"""
+    conn = StubConnection()
+    syncer = catalog_syncer(conn)
+    syncer.load_catalog()
+    assert syncer.get_primary_key_columns('created_later') == ['id']
+    assert syncer.get_table_schema('created_later')[0]['extra'] == 'auto_increment'
+
+    failing = catalog_syncer(StubConnection(fail=True))
+    assert not failing.load_catalog()
+    assert failing.catalog is None
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试中断的单表同步按断点继续
+"""
+
+from datetime import datetime
+
+import pytest
+
+from mysql_to_base_sync import MySQLToBaseSync
+
+
+SCHEMA = [{'name': 'id', 'type': 'int(11)'}, {'name': 'name', 'type': 'varchar(50)'}]
+ROWS = [{'id': i, 'name': f'user{i}'} for i in range(1, 1201)]
+
+
+def resumable_syncer(make_syncer, tmp_path, created, pages_before_stop=None):
+    syncer = make_syncer(resume=True, state_path=str(tmp_path / 'sync_state.db'), pipeline_depth=0)
+    syncer.queries = []
+
+    def fetch_page(table_name, limit, offset=0, key_columns=None, last_key=None, conditions=None, columns=None):
+        syncer.queries.append(last_key if key_columns else offset)
+        rows = [row for row in ROWS if last_key is None or row['id'] > last_key[0]] if key_columns else ROWS[offset:]
+        return rows[:limit]
+
+    def create_records(table_id, records, created_record_ids=None):
+        created.extend(record['fields']['id'] for record in records)
+        created_record_ids.extend(f"rec{record['fields']['id']}" for record in records)
+        return True
+
+    syncer._fetch_mysql_page = fetch_page
+    syncer._batch_create_records = create_records
+    syncer._load_existing_index = lambda *args: ({}, {}, False)
+    syncer._plan_shards = lambda table_name, key_columns: []
+    # 模拟到达单次运行时间上限：写完指定页数后停止
+    syncer._time_exhausted = lambda: pages_before_stop is not None and len(syncer.queries) >= pages_before_stop
+    return syncer
+
+
+@pytest.mark.parametrize('key_columns', [['id'], []])
+def test_resume_after_interrupted_run(make_syncer, tmp_path, key_columns):
+    """中断后下次从断点继续读取，已写入的行不再读取和写入；完成后清除断点"""
+    created = []
+    first = resumable_syncer(make_syncer, tmp_path, created, pages_before_stop=1)
+    first.get_primary_key_columns = lambda table_name: key_columns
+    assert not first.sync_table_data('users', 'tbl', SCHEMA)
+    assert created == list(range(1, 501))
+    assert first.table_stats['users']['complete'] is False
+    checkpoint = first.state_store.get_checkpoint('app', 'tbl')
+    assert checkpoint['counts']['read'] == 500
+    first.close_connections()
+
+    second = resumable_syncer(make_syncer, tmp_path, created)
+    second.get_primary_key_columns = lambda table_name: key_columns
+    second.table_metrics = second.report.table('users')
+    assert second.sync_table_data('users', 'tbl', SCHEMA)
+    assert created == list(range(1, 1201))
+    assert second.queries[0] == ((500,) if key_columns else 500)
+    # 统计包含此前运行已写入的行
+    stats = second.table_stats['users']
+    assert (stats['synced'], stats['created'], stats['updated'], stats['unchanged']) == (1200, 1200, 0, 0)
+    assert stats['resumed'] == {'read': 500, 'created': 500, 'updated': 0, 'unchanged': 0}
+    report = second.report.table('users').to_dict()
+    assert report['rows']['read'] == 1200 and report['rows']['created'] == 1200
+    assert report['resumed_rows']['read'] == 500
+    assert second.state_store.get_checkpoint('app', 'tbl') is None
+    second.close_connections()
+
+
+def test_changed_conditions_restart(make_syncer, tmp_path):
+    """读取条件变化（如水位改变）时丢弃旧断点，从头读取"""
+    created = []
+    syncer = resumable_syncer(make_syncer, tmp_path, created)
+    syncer.state_store.set_checkpoint('app', 'tbl', 'users', {
+        'columns': ['id'], 'conditions': '[["`updated_at` >= %s", ["2024-01-01"]]]', 'last_key': [900],
+        'offset': 0, 'max_watermark': None, 'counts': {'read': 900, 'created': 900, 'updated': 0, 'unchanged': 0}})
+    syncer.get_primary_key_columns = lambda table_name: ['id']
+    assert syncer.sync_table_data('users', 'tbl', SCHEMA)
+    assert syncer.queries[0] is None
+    assert len(created) == 1200
+    syncer.close_connections()
+
+
+def test_merge_watermark():
+    """断点中转为字符串的水位与本次读取到的水位按原类型比较"""
+    assert MySQLToBaseSync._merge_watermark('2024-01-02 00:00:00', datetime(2024, 1, 1)) == '2024-01-02 00:00:00'
+    assert MySQLToBaseSync._merge_watermark('2024-01-02 00:00:00', datetime(2024, 1, 3)) == datetime(2024, 1, 3)
+    assert MySQLToBaseSync._merge_watermark(9, 10) == 10
+    assert MySQLToBaseSync._merge_watermark(None, 10) == 10
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
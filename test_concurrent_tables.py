@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试多个表并发同步：工作线程使用独立的MySQL连接，结果按原表顺序汇总，单个表失败不影响其他表
+"""
+
+import threading
+import time
+
+import pytest
+
+from mysql_to_base_sync import MySQLToBaseSync
+
+
+class StubConnection:
+    def __init__(self):
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+def test_workers_use_own_connections_and_keep_table_order(make_syncer, monkeypatch):
+    """每个工作线程复制同步器并建立自己的连接；先提交的慢表最后完成，结果仍按原表顺序"""
+    connections = []
+
+    def connect_mysql(self):
+        self.mysql_conn = StubConnection()
+        connections.append(self.mysql_conn)
+        return True
+
+    synced = []
+    lock = threading.Lock()
+
+    def sync_table(self, table_name, base_tables):
+        with lock:
+            synced.append((table_name, self, self.mysql_conn))
+        if table_name == 'orders':
+            time.sleep(0.2)
+        if table_name == 'broken':
+            raise Exception('读取失败')
+        return True
+
+    monkeypatch.setattr(MySQLToBaseSync, 'connect_mysql', connect_mysql)
+    monkeypatch.setattr(MySQLToBaseSync, 'sync_table', sync_table)
+    syncer = make_syncer(max_workers=2)
+    main_conn = syncer.mysql_conn = StubConnection()
+    syncer.load_catalog = lambda: False
+    syncer.get_mysql_tables = lambda: ['orders', 'broken', 'users', 'items']
+    syncer.get_base_tables = lambda: {}
+
+    results = syncer.sync_all_tables()
+    assert list(results.items()) == [('orders', True), ('broken', False), ('users', True), ('items', True)]
+    assert sorted(table for table, _, _ in synced) == ['broken', 'items', 'orders', 'users']
+
+    # 两个工作线程各自使用一个复制的同步器和连接，结束后关闭，主连接不受影响
+    assert len(connections) == 2
+    assert all(worker is not syncer and conn in connections for _, worker, conn in synced)
+    assert len({id(worker) for _, worker, _ in synced}) == 2
+    assert all(conn.closed for conn in connections)
+    assert syncer.mysql_conn is main_conn and not main_conn.closed
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
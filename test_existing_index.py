@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试已存在记录索引：只请求需要的字段，联合主键的记录标识
+"""
+
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from conftest import reply
+from mysql_to_base_sync import MySQLToBaseSync
+
+
+class StubBase:
+    def __init__(self, field_names, records):
+        self.field_names = field_names
+        self.records = records
+        self.requests = []
+        self.base = SimpleNamespace(v1=SimpleNamespace(
+            app_table_field=SimpleNamespace(list=self.list_fields),
+            app_table_record=SimpleNamespace(list=self.list_records),
+        ))
+
+    def list_fields(self, request):
+        return reply(SimpleNamespace(items=[SimpleNamespace(field_name=name) for name in self.field_names],
+                                     has_more=False))
+
+    def list_records(self, request):
+        self.requests.append(request)
+        names = json.loads(request.field_names) if request.field_names else None
+        items = [SimpleNamespace(record_id=record_id,
+                                 fields={k: v for k, v in fields.items() if names is None or k in names})
+                 for record_id, fields in self.records.items()]
+        return reply(SimpleNamespace(items=items, has_more=False, total=len(items)))
+
+
+@pytest.fixture
+def index_syncer(make_syncer):
+    return lambda field_names, records=None: make_syncer(StubBase(field_names, records or {}),
+                                                         rate_limits={'read': 1000})
+
+
+def test_listing_requests_only_key_fields(index_syncer):
+    """未开启变更检测时只拉取主键字段，开启时加上指纹字段"""
+    records = {'rec1': {'id': 1, 'name': 'a', 'notes': 'x' * 1000}}
+    syncer = index_syncer(['id', 'name', 'notes'], records)
+
+    existing, fingerprints = syncer.get_existing_index('tbl', 'id')
+    assert existing == {'1': 'rec1'} and fingerprints == {}
+    assert json.loads(syncer.base_client.requests[-1].field_names) == ['id']
+
+    existing, fingerprints = syncer.get_existing_index('tbl', 'id', ['id', 'name'])
+    assert existing == {'1': 'rec1'} and '1' in fingerprints
+    assert json.loads(syncer.base_client.requests[-1].field_names) == ['id', 'name']
+
+
+def test_projection_skips_missing_fields(index_syncer):
+    """飞书中缺少的指纹字段不出现在请求中；缺少主键字段或没有主键时拉取全部字段"""
+    syncer = index_syncer(['id', 'name'])
+    assert syncer._index_field_names('tbl', 'id', ['id', 'name', 'added_later']) == ['id', 'name']
+    assert syncer._index_field_names('tbl', 'code', ['code', 'name']) is None
+    assert syncer._index_field_names('tbl', None, None) is None
+    assert syncer._index_field_names('tbl', None, ['id', 'name']) == ['id', 'name']
+
+
+def test_composite_key_encoding():
+    """联合主键编码为紧凑JSON数组，飞书返回的浮点数和富文本与MySQL转换后的值得到相同标识"""
+    record_key = MySQLToBaseSync._record_key
+    assert record_key({'a': 1, 'b': 'x', 'v': 'y'}, ['a', 'b']) == '[1,"x"]'
+    assert record_key({'a': 1.0, 'b': [{'text': 'x', 'type': 'text'}]}, ['a', 'b']) == '[1,"x"]'
+    assert record_key({'a': 1, 'b': 2}, ['a', 'b']) != record_key({'a': 1, 'b': 3}, ['a', 'b'])
+    # 单字段主键保持原有格式，兼容已保存的本地同步状态
+    assert record_key({'id': 42}, 'id') == record_key({'id': 42}, ['id']) == '42'
+    # 主键字段缺失时回退到全字段哈希
+    assert len(record_key({'a': 1}, ['a', 'b'])) == 32
+
+
+def test_bigint_keys_do_not_collide():
+    """超过2^53的BIGINT主键不经过浮点数转换，相邻的值得到不同的记录标识"""
+    record_key = MySQLToBaseSync._record_key
+    assert record_key({'id': 1234567890123456789}, 'id') == '1234567890123456789'
+    assert record_key({'id': 1234567890123456790}, 'id') == '1234567890123456790'
+    assert record_key({'id': 2 ** 53 + 1}, 'id') != record_key({'id': 2 ** 53}, 'id')
+    assert record_key({'a': 2 ** 53 + 1, 'b': 1}, ['a', 'b']) == f'[{2 ** 53 + 1},1]'
+    # 飞书返回的整数值浮点数仍与MySQL整数一致
+    assert record_key({'id': 42.0}, 'id') == '42'
+
+
+def test_composite_key_index_has_no_collisions(index_syncer):
+    """联合主键表中第一个字段相同的记录不会互相覆盖，拉取时请求全部主键字段"""
+    records = {f'rec{i}': {'a': 1, 'b': i, 'v': 'x'} for i in range(3)}
+    syncer = index_syncer(['a', 'b', 'v'], records)
+    existing, _ = syncer.get_existing_index('tbl', ['a', 'b'])
+    assert existing == {'[1,0]': 'rec0', '[1,1]': 'rec1', '[1,2]': 'rec2'}
+    assert json.loads(syncer.base_client.requests[-1].field_names) == ['a', 'b']
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
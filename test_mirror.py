@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试镜像模式删除MySQL中已不存在的记录
+"""
+
+import pytest
+
+from conftest import reply, stub_base_client
+
+
+class StubRecordApi:
+    def __init__(self, success=True):
+        self.deleted = []
+        self.success = success
+
+    def batch_delete(self, request):
+        self.deleted.append(list(request.request_body.records))
+        return reply(success=self.success, code=1254045)
+
+
+SCHEMA = [{'name': 'id', 'type': 'int(11)'}, {'name': 'name', 'type': 'varchar(50)'}]
+
+
+@pytest.fixture
+def mirror_syncer(make_syncer, tmp_path):
+    def factory(success=True):
+        record_api = StubRecordApi(success)
+        syncer = make_syncer(stub_base_client(app_table_record=record_api), mirror=True,
+                             state_path=str(tmp_path / 'sync_state.db'), rate_limits={'write': 1000})
+        syncer.record_api = record_api
+        return syncer
+    return factory
+
+
+def test_orphans_deleted_in_batches(mirror_syncer):
+    """飞书中多出的记录按每批500条删除，同时移除本地同步状态"""
+    syncer = mirror_syncer()
+    existing = {str(i): f'rec{i}' for i in range(1200)}
+    syncer.state_store.save_index('app', 'tbl', 'users', dict(existing), {})
+    seen = {str(i) for i in range(100)}
+
+    deleted = syncer._delete_orphan_records('users', 'tbl', SCHEMA, 'id', existing, seen)
+
+    assert deleted == 1100
+    assert [len(batch) for batch in syncer.record_api.deleted] == [500, 500, 100]
+    assert set(existing) == seen
+    assert set(syncer.state_store.load_index('app', 'tbl')[0]) == seen
+    syncer.close_connections()
+
+
+def test_partial_read_scans_primary_keys(mirror_syncer):
+    """水位增量只读取了部分行时单独扫描主键；没有主键时跳过删除"""
+    syncer = mirror_syncer()
+    syncer.scan_record_keys = lambda table_name, primary_key, schema, conditions=None: {'1', '2'}
+    existing = {'1': 'rec1', '2': 'rec2', '3': 'rec3'}
+
+    assert syncer._delete_orphan_records('users', 'tbl', SCHEMA, 'id', existing, None) == 1
+    assert syncer.record_api.deleted == [['rec3']]
+    assert syncer._delete_orphan_records('logs', 'tbl', SCHEMA, None, {'x': 'rec9'}, None) == 0
+    syncer.close_connections()
+
+
+def test_delete_failure_fails_table(mirror_syncer):
+    """删除失败时返回None，由调用方将该表标记为同步失败"""
+    syncer = mirror_syncer(success=False)
+    assert syncer._delete_orphan_records('users', 'tbl', SCHEMA, 'id', {'1': 'rec1'}, set()) is None
+    syncer.close_connections()
+
+
+def test_table_without_primary_key_skips_delete(mirror_syncer):
+    """没有主键的表无法按记录标识匹配，即使读取了全部行也不删除"""
+    syncer = mirror_syncer()
+    assert syncer._delete_orphan_records('logs', 'tbl', SCHEMA, None, {'x': 'rec9'}, {'y'}) == 0
+    assert syncer.record_api.deleted == []
+    syncer.close_connections()
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
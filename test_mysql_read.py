@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试MySQL读取：键集分页生成的SQL和按页遍历、流式读取及读取方式配置
+"""
+
+import re
+
+import pymysql
+import pytest
+
+from mysql_to_base_sync import MySQLToBaseSync, SyncConfig
+
+
+class StubConnection:
+    """按执行的SQL从rows中返回结果的MySQL连接：按ORDER BY的列排序，按键集条件的参数和LIMIT截取"""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.queries = []
+        self.cursor_classes = []
+
+    def cursor(self, cursor_class=None):
+        self.cursor_classes.append(cursor_class)
+        return StubCursor(self)
+
+    def close(self):
+        pass
+
+
+class StubCursor:
+    def __init__(self, conn):
+        self.conn = conn
+        self.result = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+    def execute(self, sql, params=()):
+        self.conn.queries.append((sql, params))
+        if sql.startswith('SET '):
+            self.result = []
+            return
+        match = re.search(r'ORDER BY (.+?)(?: LIMIT (\d+))?$', sql)
+        if not match:
+            self.result = list(self.conn.rows)
+            return
+        keys = [col.strip(' `') for col in match.group(1).split(',')]
+        rows = sorted(self.conn.rows, key=lambda row: tuple(row[col] for col in keys))
+        if ' > ' in sql:
+            last_key = tuple(params[-len(keys):])
+            rows = [row for row in rows if tuple(row[col] for col in keys) > last_key]
+        self.result = rows[:int(match.group(2))] if match.group(2) else rows
+
+    def fetchall(self):
+        return self.result
+
+    def fetchmany(self, size):
+        rows, self.result = self.result[:size], self.result[size:]
+        return rows
+
+
+ROWS = [{'a': a, 'b': b, 'name': f'{a}-{b}'} for a in range(3) for b in range(3)]
+
+
+@pytest.fixture
+def read_syncer(make_syncer):
+    def factory(rows=ROWS, **options):
+        syncer = make_syncer(**options)
+        syncer.mysql_conn = StubConnection(rows)
+        return syncer
+    return factory
+
+
+def test_keyset_query_single_and_composite_key():
+    """单列主键使用 `id` > %s，联合主键使用行构造器 (a, b) > (%s, %s)，都按主键排序且不使用OFFSET"""
+    sql, params = MySQLToBaseSync._build_select_query('users', None, ['id'], (500,), 100)
+    assert sql == "SELECT * FROM `users` WHERE `id` > %s ORDER BY `id` LIMIT 100"
+    assert params == (500,)
+
+    sql, params = MySQLToBaseSync._build_select_query('items', None, ['a', 'b'], (1, 2), 100)
+    assert sql == "SELECT * FROM `items` WHERE (`a`, `b`) > (%s, %s) ORDER BY `a`, `b` LIMIT 100"
+    assert params == (1, 2)
+
+    # 第一页没有键集条件
+    sql, params = MySQLToBaseSync._build_select_query('items', None, ['a', 'b'], None, 100)
+    assert sql == "SELECT * FROM `items` ORDER BY `a`, `b` LIMIT 100"
+    assert params == ()
+
+
+def test_keyset_pages_continue_from_last_key(read_syncer):
+    """按联合主键分页时从上一页最后一行的键继续读取，不使用OFFSET，不漏行不重复"""
+    syncer = read_syncer()
+    pages = list(syncer._iter_mysql_batches('items', 4, ['a', 'b']))
+    assert [len(rows) for rows in pages] == [4, 4, 1]
+    assert [row for rows in pages for row in rows] == ROWS
+
+    queries = syncer.mysql_conn.queries
+    assert all('OFFSET' not in sql for sql, _ in queries)
+    assert [params for _, params in queries] == [(), (1, 0), (2, 1)]
+    assert queries[1][0] == "SELECT * FROM `items` WHERE (`a`, `b`) > (%s, %s) ORDER BY `a`, `b` LIMIT 4"
+
+
+def test_stream_mode_reads_same_rows_as_paged_mode(read_syncer):
+    """stream模式通过SSDictCursor只执行一次查询，按批次产出的行与键集分页一致"""
+    paged = list(read_syncer()._iter_mysql_batches('items', 4, ['a', 'b']))
+
+    syncer = read_syncer(read_mode='stream')
+    batches = syncer._iter_mysql_batches('items', 4, ['a', 'b'])
+    assert not syncer.mysql_conn.queries  # 生成器在迭代时才开始查询
+    assert list(batches) == paged
+
+    assert syncer.mysql_conn.cursor_classes == [None, pymysql.cursors.SSDictCursor]
+    selects = [sql for sql, _ in syncer.mysql_conn.queries if sql.startswith('SELECT')]
+    assert selects == ["SELECT * FROM `items`"]
+
+
+def test_unknown_read_mode_and_transport():
+    """读取方式和传输方式只接受已知的值"""
+    assert SyncConfig(read_mode='stream', base_transport='async').read_mode == 'stream'
+    with pytest.raises(ValueError):
+        SyncConfig(read_mode='cursor')
+    with pytest.raises(ValueError):
+        SyncConfig(base_transport='http2')
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试单表同步的读取/转换/写入流水线
+"""
+
+import threading
+import time
+
+import pytest
+
+from mysql_to_base_sync import MySQLToBaseSync
+
+
+def test_stage_preserves_order():
+    """后台线程按原顺序产出全部结果"""
+    assert list(MySQLToBaseSync._pipeline_stage(iter(range(100)), 2, 'test')) == list(range(100))
+
+
+def test_stage_applies_backpressure():
+    """调用方未消费时，后台线程最多领先队列容量加上正在放入的一项"""
+    produced = []
+
+    def source():
+        for i in range(100):
+            produced.append(i)
+            yield i
+
+    stage = MySQLToBaseSync._pipeline_stage(source(), 2, 'test')
+    assert next(stage) == 0
+    time.sleep(0.3)
+    assert len(produced) <= 4
+    stage.close()
+
+
+def test_stage_reraises_errors():
+    """后台线程中的异常在调用方重新抛出"""
+    def source():
+        yield 1
+        raise ValueError('read failed')
+
+    stage = MySQLToBaseSync._pipeline_stage(source(), 2, 'test')
+    assert next(stage) == 1
+    with pytest.raises(ValueError):
+        next(stage)
+
+
+def test_close_stops_and_closes_source():
+    """调用方提前结束时后台线程退出，并关闭上游迭代器以释放MySQL连接"""
+    closed = threading.Event()
+
+    def source():
+        try:
+            for i in range(1000):
+                yield i
+        finally:
+            closed.set()
+
+    threads = threading.active_count()
+    stage = MySQLToBaseSync._pipeline_stage(source(), 2, 'test')
+    next(stage)
+    stage.close()
+    assert closed.is_set()
+    assert threading.active_count() == threads
+
+
+def test_chained_stages_overlap():
+    """读取与写入重叠执行，总耗时接近较慢一侧"""
+    def read():
+        for i in range(5):
+            time.sleep(0.1)
+            yield i
+
+    started = time.monotonic()
+    reader = MySQLToBaseSync._pipeline_stage(read(), 2, 'reader')
+    for _ in MySQLToBaseSync._pipeline_stage(reader, 2, 'converter'):
+        time.sleep(0.1)
+    # 顺序执行约1秒，流水线约0.6秒
+    assert time.monotonic() - started < 0.85
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试飞书接口限流器
+"""
+
+import time
+
+import pytest
+
+from rate_limiter import (
+    RateLimiter, RetryPolicy, TokenBucket, classify_response, get_retry_after, parse_rate_limits,
+    RESPONSE_FATAL, RESPONSE_OK, RESPONSE_THROTTLED, RESPONSE_TRANSIENT,
+)
+
+
+class FakeRaw:
+    def __init__(self, status_code=200, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+
+
+class FakeResponse:
+    def __init__(self, code=0, status_code=200, headers=None):
+        self.code = code
+        self.msg = 'success' if code == 0 else 'error'
+        self.raw = FakeRaw(status_code, headers)
+
+    def success(self):
+        return self.code == 0
+
+
+def test_token_bucket_limits_rate():
+    """突发令牌用完后按设定速率放行"""
+    bucket = TokenBucket(rate=50, capacity=1)
+    start = time.monotonic()
+    for _ in range(6):
+        bucket.acquire()
+    elapsed = time.monotonic() - start
+    # 第一个令牌立即可用，其余5个按50qps补充，至少需要0.1秒
+    assert elapsed >= 0.09
+
+
+def test_token_bucket_allows_burst():
+    """桶内令牌充足时不等待"""
+    bucket = TokenBucket(rate=1, capacity=5)
+    assert sum(bucket.acquire() for _ in range(5)) == 0
+
+
+def test_rate_limiter_endpoints():
+    """未配置的类别使用默认值，未知类别报错"""
+    limiter = RateLimiter({'write': 10})
+    assert limiter.buckets['write'].rate == 10
+    assert limiter.buckets['read'].rate == 5
+    with pytest.raises(KeyError):
+        limiter.acquire('unknown')
+
+
+def test_rate_limiter_adapts_to_throttling():
+    """限流时速率减半且不低于下限，成功后逐步恢复到配置值"""
+    limiter = RateLimiter({'write': 4}, min_ratio=0.25, recover_ratio=0.5)
+    assert limiter.throttle('write') == 2
+    assert limiter.throttle('write') == 1
+    assert limiter.throttle('write') == 1
+    assert limiter.recover('write') == 3
+    assert limiter.recover('write') == 4
+
+
+def test_classify_response():
+    """按错误码和HTTP状态码区分限流、临时错误和不可重试错误"""
+    assert classify_response(FakeResponse()) == RESPONSE_OK
+    assert classify_response(FakeResponse(code=99991400)) == RESPONSE_THROTTLED
+    assert classify_response(FakeResponse(code=None, status_code=429)) == RESPONSE_THROTTLED
+    assert classify_response(FakeResponse(code=1255001)) == RESPONSE_TRANSIENT
+    assert classify_response(FakeResponse(code=None, status_code=502)) == RESPONSE_TRANSIENT
+    assert classify_response(FakeResponse(code=1254045)) == RESPONSE_FATAL
+
+
+def test_retry_backoff_respects_retry_after():
+    """退避时间不超过上限，并至少等待服务端要求的时间"""
+    policy = RetryPolicy(base_delay=1, max_delay=8)
+    assert all(0 <= policy.backoff(attempt) <= 8 for attempt in range(10))
+    assert policy.backoff(0, retry_after=5) >= 5
+    assert get_retry_after(FakeResponse(code=99991400, headers={'X-Ogw-Ratelimit-Reset': '3'})) == 3
+    assert get_retry_after(FakeResponse(code=99991400)) is None
+
+
+def test_parse_rate_limits():
+    """解析字符串和字典形式的限流配置"""
+    assert parse_rate_limits('read=8, write=3') == {'read': 8.0, 'write': 3.0}
+    assert parse_rate_limits({'meta': '2'}) == {'meta': 2.0}
+    assert parse_rate_limits('') == {}
+    with pytest.raises(ValueError):
+        parse_rate_limits('read')
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
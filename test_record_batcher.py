@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试按记录数和请求体字节预算切分批量写入
+"""
+
+import json
+
+import pytest
+
+from record_batcher import RecordBatcher, PAYLOAD_OVERHEAD, TRUNCATED_SUFFIX, record_size
+
+
+def payload_size(batch):
+    """与SDK序列化请求体的方式一致"""
+    return len(json.dumps({'records': batch}, ensure_ascii=False).encode('utf-8'))
+
+
+def make_records(count, text_size):
+    return [{'fields': {'id': i, 'name': f'名称{i}', 'note': '备注' * text_size}} for i in range(count)]
+
+
+def test_narrow_rows_fill_record_cap():
+    """窄表按记录数上限写满"""
+    records = make_records(1200, 2)
+    batches = list(RecordBatcher(max_records=500).batches(records))
+    assert [len(batch) for batch in batches] == [500, 500, 200]
+    assert [record for batch in batches for record in batch] == records
+
+
+def test_wide_rows_split_by_bytes():
+    """宽表按字节预算切分，每批不超过预算且尽量写满，顺序不变"""
+    records = make_records(300, 500)
+    max_bytes = 64 * 1024
+    batches = list(RecordBatcher(max_records=500, max_bytes=max_bytes).batches(records))
+    assert len(batches) > 1
+    assert [record for batch in batches for record in batch] == records
+    record_bytes = record_size(records[0]) + 2
+    for batch in batches:
+        assert payload_size(batch) + 40 <= max_bytes
+    for batch in batches[:-1]:
+        # 再加一条就会超过预算
+        assert payload_size(batch) + record_bytes > max_bytes - PAYLOAD_OVERHEAD
+
+
+def test_oversized_record_split():
+    """超过预算的单条记录单独成批，内容不变，并回调记录大小"""
+    records = make_records(5, 10)
+    large = {'fields': {'id': 99, 'note': 'x' * 5000}}
+    records.insert(2, large)
+    seen = []
+    batcher = RecordBatcher(max_bytes=2000, on_oversized=lambda record, size: seen.append((record, size)))
+    batches = list(batcher.batches(records))
+    assert [large] in batches
+    assert [record for batch in batches for record in batch] == records
+    assert seen == [(large, record_size(large))]
+
+
+def test_oversized_record_truncate():
+    """truncate策略截断最长的文本字段，结果不超过预算，其他字段不变"""
+    large = {'record_id': 'rec1', 'fields': {'id': 1, 'short': '短文本', 'note': '长"文本\n' * 2000}}
+    batches = list(RecordBatcher(max_bytes=4000, oversized='truncate').batches([large]))
+    assert len(batches) == 1 and len(batches[0]) == 1
+    record = batches[0][0]
+    assert record['record_id'] == 'rec1'
+    assert record['fields']['short'] == '短文本'
+    assert record['fields']['note'].endswith(TRUNCATED_SUFFIX)
+    assert large['fields']['note'].startswith(record['fields']['note'][:-len(TRUNCATED_SUFFIX)])
+    assert payload_size(batches[0]) <= 4000
+    # 原记录不被修改
+    assert not large['fields']['note'].endswith(TRUNCATED_SUFFIX)
+
+
+def test_unknown_policy():
+    with pytest.raises(ValueError):
+        RecordBatcher(oversized='drop')
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试预编译的行转换函数
+"""
+
+import time
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+import pytest
+
+from mysql_to_base_sync import DataTypeMapper
+
+
+SCHEMA = [
+    {'name': 'id', 'type': 'int(11)'},
+    {'name': 'name', 'type': 'VARCHAR(50)'},
+    {'name': 'amount', 'type': 'decimal(10,2)'},
+    {'name': 'active', 'type': 'bool'},
+    {'name': 'created', 'type': 'datetime'},
+    {'name': 'birthday', 'type': 'date'},
+    {'name': 'payload', 'type': 'json'},
+]
+
+
+def test_value_converter_by_type():
+    """按字段类型选择转换函数，类型名大小写和长度限制不影响结果"""
+    created = datetime(2024, 1, 2, 3, 4, 5)
+    assert DataTypeMapper.convert_value(Decimal('1.50'), 'DECIMAL(10,2)') == 1.5
+    assert DataTypeMapper.convert_value('42', 'bigint(20) unsigned') == 42
+    assert DataTypeMapper.convert_value(0, 'boolean') is False
+    assert DataTypeMapper.convert_value(created, 'timestamp') == int(created.timestamp() * 1000)
+    assert DataTypeMapper.convert_value('2024-01-02 03:04:05', 'datetime') == int(created.timestamp() * 1000)
+    assert DataTypeMapper.convert_value('not a date', 'datetime') == 'not a date'
+    assert DataTypeMapper.convert_value(b'abc', 'varbinary(10)') == "b'abc'"
+    assert DataTypeMapper.convert_value(None, 'int') is None
+    assert DataTypeMapper.value_converter('int(11)') is DataTypeMapper.value_converter('int(11)')
+
+
+def test_compiled_row_matches_convert_value():
+    """行转换结果与逐个调用convert_value一致，值为NULL或缺失的字段被省略"""
+    row = {
+        'id': 7, 'name': 'alice', 'amount': Decimal('12.30'), 'active': 1,
+        'created': datetime(2024, 5, 6, 7, 8, 9), 'birthday': date(2000, 1, 1), 'payload': None,
+    }
+    convert_row = DataTypeMapper.compile_row_converter(SCHEMA)
+    expected = {}
+    for col in SCHEMA:
+        value = DataTypeMapper.convert_value(row[col['name']], col['type'])
+        if value is not None:
+            expected[col['name']] = value
+
+    assert convert_row(row) == expected
+    assert 'payload' not in expected and 'birthday' not in expected
+    assert convert_row({'id': '3'}) == {'id': 3}
+
+
+def test_batch_converter_matches_row_converter():
+    """按列批量转换与逐行转换结果一致"""
+    rows = [
+        {'id': i, 'name': None if i % 3 else f'n{i}', 'amount': Decimal(i) / 7, 'active': i % 2,
+         'created': datetime(2024, 1, 1) + timedelta(minutes=97 * i), 'birthday': date(2000, 1, 1),
+         'payload': '{}'}
+        for i in range(50)
+    ]
+    rows.append({'id': 99})
+    convert_row = DataTypeMapper.compile_row_converter(SCHEMA)
+    convert_rows = DataTypeMapper.compile_batch_converter(SCHEMA)
+    assert convert_rows(rows) == [convert_row(row) for row in rows]
+    assert convert_rows([]) == []
+    assert DataTypeMapper.compile_batch_converter([])([{'id': 1}]) == [{}]
+
+
+@pytest.mark.parametrize('tz', ['UTC', 'Asia/Shanghai', 'America/New_York', 'Australia/Lord_Howe'])
+def test_datetime_column_matches_timestamp(monkeypatch, tz):
+    """整列计算的毫秒时间戳与逐个调用timestamp()逐位一致，包括夏令时切换当天"""
+    monkeypatch.setenv('TZ', tz)
+    time.tzset()
+    monkeypatch.setattr(DataTypeMapper, '_day_offsets', {})
+    try:
+        start = datetime(2024, 3, 9)
+        values = [start + timedelta(seconds=1237 * i, microseconds=(i * 123457) % 1000000) for i in range(2000)]
+        values += [datetime(1969, 12, 31, 23, 59, 59, 999999), None, '2024-01-02 03:04:05', 'bad', date(2024, 1, 1)]
+        expected = [DataTypeMapper.convert_value(value, 'datetime') for value in values]
+        assert DataTypeMapper.column_converter('datetime')(values) == expected
+    finally:
+        monkeypatch.undo()
+        time.tzset()
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试大表按主键范围切分
+"""
+
+import pytest
+
+from mysql_to_base_sync import MySQLToBaseSync
+
+
+def test_split_int_range():
+    """整数主键按MIN/MAX等宽切分，区间过小时减少分片数"""
+    split = MySQLToBaseSync._split_int_range
+    assert split(1, 100, 4) == [26, 51, 76]
+    assert split(0, 3, 4) == [1, 2, 3]
+    assert split(5, 6, 4) == [6]
+    assert split(5, 5, 4) == []
+
+
+def test_shard_conditions_cover_all_values():
+    """第一段没有下界、最后一段没有上界，相邻分片以同一切分点衔接"""
+    ranges = MySQLToBaseSync._shard_conditions('id', [10, 20])
+    assert ranges == [
+        [('`id` < %s', (10,))],
+        [('`id` >= %s', (10,)), ('`id` < %s', (20,))],
+        [('`id` >= %s', (20,))],
+    ]
+    assert MySQLToBaseSync._shard_conditions('id', []) == [[]]
+
+
+def test_plan_shards_thresholds(make_syncer):
+    """未开启分片、没有主键或估算行数不足时不切分"""
+    syncer = make_syncer(shards=4, shard_min_rows=1000)
+    syncer.get_shard_bounds = lambda table_name, column, shards, estimated_rows: [10, 20, 30]
+
+    syncer.estimate_table_rows = lambda table_name: 999
+    assert syncer._plan_shards('orders', ['id']) == []
+    syncer.estimate_table_rows = lambda table_name: 1000
+    assert syncer._plan_shards('orders', ['id']) == [10, 20, 30]
+    assert syncer._plan_shards('logs', []) == []
+    assert make_syncer()._plan_shards('orders', ['id']) == []
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试内容未变化的记录不重复写入：飞书返回的富文本、数字和日期与MySQL转换后的值指纹一致
+"""
+
+import itertools
+import json
+import re
+from datetime import datetime
+from decimal import Decimal
+from types import SimpleNamespace
+
+import pytest
+
+from conftest import reply, stub_base_client
+from mysql_to_base_sync import DataTypeMapper
+
+
+SCHEMA = [
+    {'name': 'id', 'type': 'int(11)'},
+    {'name': 'title', 'type': 'varchar(100)'},
+    {'name': 'amount', 'type': 'decimal(10,2)'},
+    {'name': 'qty', 'type': 'int(11)'},
+    {'name': 'created', 'type': 'datetime'},
+]
+ROWS = [
+    {'id': 1, 'title': 'hello http://x.com', 'amount': Decimal('12.50'), 'qty': 3,
+     'created': datetime(2024, 5, 1, 8, 30)},
+    {'id': 2, 'title': 'plain', 'amount': Decimal('7'), 'qty': None, 'created': None},
+    {'id': 3, 'title': 'see https://a.b/c?d=1 now', 'amount': Decimal('0.10'), 'qty': 0,
+     'created': datetime(2023, 12, 31, 23, 59, 59)},
+]
+
+
+def base_value(value):
+    """模拟飞书返回的字段值：文本为富文本片段列表（链接单独成段），数字为浮点数，日期为毫秒时间戳"""
+    if isinstance(value, str):
+        return [{'text': part, 'type': 'url', 'link': part} if re.match(r'https?://', part)
+                else {'text': part, 'type': 'text'}
+                for part in re.split(r'(https?://\S+)', value) if part]
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    return value
+
+
+class StubRecordApi:
+    def __init__(self):
+        self.records = {}
+        self.updates = 0
+        self._ids = itertools.count(1)
+
+    def list(self, request):
+        names = json.loads(request.field_names) if request.field_names else None
+        items = [SimpleNamespace(record_id=record_id,
+                                 fields={k: v for k, v in fields.items() if names is None or k in names})
+                 for record_id, fields in self.records.items()]
+        return reply(SimpleNamespace(items=items, has_more=False, page_token=None, total=len(items)))
+
+    def batch_create(self, request):
+        created = []
+        for record in request.request_body.records:
+            record_id = f"rec{next(self._ids)}"
+            self.records[record_id] = {k: base_value(v) for k, v in record['fields'].items()}
+            created.append(SimpleNamespace(record_id=record_id, fields=record['fields']))
+        return reply(SimpleNamespace(records=created))
+
+    def batch_update(self, request):
+        for record in request.request_body.records:
+            self.updates += 1
+            fields = self.records[record['record_id']]
+            for key, value in record['fields'].items():
+                if value is None:
+                    fields.pop(key, None)
+                else:
+                    fields[key] = base_value(value)
+        return reply(SimpleNamespace(records=[]))
+
+
+@pytest.fixture
+def record_api():
+    return StubRecordApi()
+
+
+@pytest.fixture
+def run_sync(make_syncer, record_api):
+    field_api = SimpleNamespace(list=lambda request: reply(SimpleNamespace(
+        items=[SimpleNamespace(field_name=col['name']) for col in SCHEMA], has_more=False)))
+    client = stub_base_client(app_table_record=record_api, app_table_field=field_api)
+
+    def run(rows):
+        syncer = make_syncer(client, pipeline_depth=0, rate_limits={'read': 1000, 'write': 1000, 'meta': 1000})
+        syncer.get_primary_key_columns = lambda table_name: ['id']
+
+        def fetch_page(table_name, limit, offset=0, key_columns=None, last_key=None, conditions=None, columns=None):
+            return [row for row in rows if last_key is None or row['id'] > last_key[0]][:limit]
+
+        syncer._fetch_mysql_page = fetch_page
+        assert syncer.sync_table_data('orders', 'tbl', SCHEMA)
+        return syncer.table_stats['orders']
+    return run
+
+
+def test_second_run_over_unchanged_rows_writes_nothing(run_sync, record_api):
+    """第二次同步未变化的行时，富文本（含链接）、数字和日期的指纹一致，不发送更新"""
+    assert run_sync(ROWS)['created'] == 3
+    stats = run_sync(ROWS)
+    assert (stats['created'], stats['updated'], stats['unchanged']) == (0, 0, 3)
+    assert record_api.updates == 0
+
+    changed = [dict(ROWS[0], amount=Decimal('13.00'))] + ROWS[1:]
+    stats = run_sync(changed)
+    assert (stats['updated'], stats['unchanged']) == (1, 2)
+
+
+def test_rich_text_segments_join_without_separator():
+    """富文本片段按原文拼接，多选等字符串列表用逗号分隔"""
+    segments = [{'text': 'hello ', 'type': 'text'}, {'text': 'http://x.com', 'type': 'url'}]
+    assert DataTypeMapper.normalize_value(segments) == 'hello http://x.com'
+    assert DataTypeMapper.normalize_value(['a', 'b']) == 'a,b'
+    assert DataTypeMapper.fingerprint({'title': segments}, ['title']) == \
+        DataTypeMapper.fingerprint({'title': 'hello http://x.com'}, ['title'])
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试表、列、行过滤及其生成的SQL
+"""
+
+import pytest
+
+from api import parse_optional_params
+from mysql_to_base_sync import MySQLToBaseSync
+from sync_filters import TableFilter
+
+
+SCHEMA = [
+    {'name': 'id', 'type': 'int(11)'},
+    {'name': 'name', 'type': 'varchar(50)'},
+    {'name': 'avatar', 'type': 'blob'},
+    {'name': 'password_hash', 'type': 'varchar(64)'},
+    {'name': 'updated_at', 'type': 'datetime', 'extra': 'on update CURRENT_TIMESTAMP'},
+]
+
+
+@pytest.fixture
+def filtered_syncer(make_syncer):
+    def factory(**options):
+        syncer = make_syncer(pipeline_depth=0, **options)
+        syncer.get_primary_key_columns = lambda table_name: ['id']
+        return syncer
+    return factory
+
+
+def test_table_patterns():
+    """先按include_tables选择，再排除exclude_tables，保持原有顺序"""
+    table_filter = TableFilter(include_tables=['orders', 'user*'], exclude_tables='users_audit,*_tmp')
+    tables = ['audit_log', 'orders', 'users', 'users_audit', 'users_tmp', 'user_roles']
+    assert table_filter.filter_tables(tables) == ['orders', 'users', 'user_roles']
+    assert TableFilter(exclude_tables=['audit_*']).filter_tables(tables) == tables[1:]
+    assert TableFilter().filter_tables(tables) == tables
+
+
+def test_column_projection_keeps_required_columns():
+    """只同步匹配的列，排除的列不再读取；主键等必需列始终保留"""
+    table_filter = TableFilter(include_columns={'users': ['name', 'avatar', 'password_*']},
+                               exclude_columns='*.password_hash,*.avatar')
+    projected = table_filter.project_columns('users', SCHEMA, required=['id'])
+    assert [col['name'] for col in projected] == ['id', 'name']
+    # 没有匹配到include_columns的表同步全部未排除的列
+    assert [col['name'] for col in table_filter.project_columns('orders', SCHEMA)] == ['id', 'name', 'updated_at']
+    assert not TableFilter(include_columns=['users.name']).has_column_filter('orders')
+    with pytest.raises(ValueError):
+        TableFilter(include_columns='name')
+
+
+def test_select_query_with_columns_and_row_filter():
+    """列和行过滤体现在生成的SQL中，行过滤条件中的%按字面处理"""
+    conditions = TableFilter(row_filters={'users': "deleted_at IS NULL", 'user*': "name NOT LIKE 'test%'"}) \
+        .row_conditions('users')
+    sql, params = MySQLToBaseSync._build_select_query('users', conditions, ['id'], (500,), 100,
+                                                      columns=['id', 'name'])
+    assert sql == ("SELECT `id`, `name` FROM `users` WHERE (deleted_at IS NULL) AND (name NOT LIKE 'test%%') "
+                   "AND `id` > %s ORDER BY `id` LIMIT 100")
+    assert "LIKE 'test%') AND `id` > 500" in sql % params
+    assert params == (500,)
+
+
+def test_sync_reads_only_selected_columns_and_rows(filtered_syncer):
+    """同步时只读取写入飞书的列和分页、水位需要的列，并附加行过滤条件"""
+    syncer = filtered_syncer(exclude_columns=['users.avatar', 'users.password_hash', 'users.updated_at'],
+                         row_filters={'users': 'deleted_at IS NULL'}, watermark=True)
+    schema = syncer.project_schema('users', SCHEMA)
+    # 水位字段用于增量读取，不能被过滤
+    assert [col['name'] for col in schema] == ['id', 'name', 'updated_at']
+
+    queries = []
+
+    def fetch_page(table_name, limit, offset=0, key_columns=None, last_key=None, conditions=None, columns=None):
+        queries.append((columns, conditions))
+        return [{'id': 1, 'name': 'a', 'updated_at': None}]
+
+    syncer._fetch_mysql_page = fetch_page
+    syncer._load_existing_index = lambda *args: ({}, {}, False)
+    syncer._plan_shards = lambda table_name, key_columns: []
+    syncer._batch_create_records = lambda table_id, records, created_record_ids=None: \
+        created_record_ids.extend(['rec1']) or True
+    assert syncer.sync_table_data('users', 'tbl', schema)
+    assert queries == [(['id', 'name', 'updated_at'], [('deleted_at IS NULL', ())])]
+
+
+def test_sync_all_tables_skips_filtered_tables(filtered_syncer):
+    syncer = filtered_syncer(include_tables=['orders', 'users'], exclude_tables=['users'])
+    syncer.load_catalog = lambda: False
+    syncer.get_mysql_tables = lambda: ['audit_log', 'orders', 'users']
+    syncer.get_base_tables = lambda: {}
+    synced = []
+    syncer.sync_table = lambda table_name, base_tables: synced.append(table_name) or True
+    assert dict(syncer.sync_all_tables()) == {'orders': True}
+    assert synced == ['orders']
+
+
+def test_parse_filter_params():
+    """请求体可以传列表和字典，环境变量使用逗号分隔和JSON"""
+    env = {
+        'include_tables': 'orders, users',
+        'exclude_columns': '*.password_hash,orders.payload',
+        'row_filters': '{"orders": "status <> \'deleted\'"}',
+    }
+    options = parse_optional_params(env.get)
+    assert options == {
+        'include_tables': ['orders', 'users'],
+        'exclude_columns': ['*.password_hash', 'orders.payload'],
+        'row_filters': {'orders': "status <> 'deleted'"},
+    }
+    body = {'include_columns': {'orders': ['id', 'amount']}, 'row_filters': {'orders': 'amount > 0'}}
+    assert parse_optional_params(body.get) == {
+        'include_columns': ['orders.id', 'orders.amount'],
+        'row_filters': {'orders': 'amount > 0'},
+    }
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试同步报告的统计与导出
+"""
+
+import json
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from conftest import reply
+from sync_report import SyncReport, TableMetrics
+
+
+def test_timed_iterator_and_counters():
+    """逐项计时迭代器把取数耗时计入阶段，关闭时关闭上游"""
+    metrics = TableMetrics('orders')
+    closed = []
+
+    def pages():
+        try:
+            for i in range(3):
+                time.sleep(0.02)
+                yield i
+        finally:
+            closed.append(True)
+
+    timed = metrics.timed(pages(), 'mysql_read')
+    assert next(timed) == 0
+    timed.close()
+    assert closed == [True]
+    metrics.incr('read', 500)
+    report = metrics.to_dict()
+    assert report['rows']['read'] == 500
+    assert report['stage_seconds']['mysql_read'] >= 0.02
+    assert metrics.format_stages().startswith('MySQL读取')
+
+
+def test_call_base_attributes_to_current_table(make_syncer):
+    """接口调用的耗时、次数和请求字节数计入当前同步的表"""
+    syncer = make_syncer(rate_limits={'read': 1000, 'write': 1000, 'meta': 1000})
+    syncer.report = SyncReport()
+    syncer.table_metrics = syncer.report.table('orders')
+    request = SimpleNamespace(body={'records': [{'fields': {'name': '张三'}}]})
+
+    def write(req):
+        time.sleep(0.01)
+        return reply()
+
+    syncer._call_base('write', write, request)
+    syncer._call_base('read', lambda req: reply(request_bytes=0), SimpleNamespace(body=None))
+    syncer._call_base('write', lambda req: reply(request_bytes=123), request)
+
+    report = syncer.report.table('orders').to_dict()
+    assert report['api_calls'] == 3
+    # SDK传输按JSON序列化计算请求体大小，async传输直接使用发送的字节数
+    assert report['request_bytes'] == len(json.dumps(request.body, ensure_ascii=False).encode('utf-8')) + 123
+    assert report['stage_seconds']['base_write'] >= 0.01
+
+
+def test_report_export(tmp_path):
+    """JSON与Prometheus导出包含各表行数和阶段耗时，标签值按格式转义"""
+    report = SyncReport()
+    metrics = report.table('we"ird')
+    metrics.incr('created', 10)
+    metrics.add_seconds('base_write', 1.5)
+    report.finish({'we"ird': True}, {'calls': 3})
+
+    data = json.loads(report.to_json())
+    assert data['success'] is True
+    assert data['tables']['we"ird']['rows']['created'] == 10
+    assert data['api_stats'] == {'calls': 3}
+
+    text = report.to_prometheus()
+    assert 'mysql_to_base_sync_rows{table="we\\"ird",kind="created"} 10' in text
+    assert 'mysql_to_base_sync_stage_seconds{table="we\\"ird",stage="base_write"} 1.5' in text
+    assert 'mysql_to_base_sync_api{kind="calls"} 3' in text
+
+    path = tmp_path / 'metrics' / 'sync.prom'
+    report.write_prometheus(str(path))
+    assert path.read_text(encoding='utf-8') == text
+    assert [p.name for p in path.parent.iterdir()] == ['sync.prom']
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
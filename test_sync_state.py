@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试本地同步状态存储
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from conftest import reply, stub_base_client
+from sync_state import SyncStateStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = SyncStateStore(str(tmp_path / 'state' / 'sync_state.db'))
+    yield store
+    store.close()
+
+
+def test_missing_state_returns_none(store):
+    """没有保存过的表格返回None，调用方需要完整拉取"""
+    assert store.load_index('app', 'tbl1') is None
+
+
+def test_save_and_load_index(store):
+    """完整拉取后保存的索引可以原样读回"""
+    store.save_index('app', 'tbl1', 'users', {'1': 'rec1', '2': 'rec2'}, {'1': 'fp1'})
+    records, fingerprints = store.load_index('app', 'tbl1')
+    assert records == {'1': 'rec1', '2': 'rec2'}
+    assert fingerprints == {'1': 'fp1'}
+    # 空表格也是有效状态
+    store.save_index('app', 'tbl2', 'empty', {}, {})
+    assert store.load_index('app', 'tbl2') == ({}, {})
+
+
+def test_upsert_and_invalidate(store):
+    """写入后的增量更新覆盖旧状态，失效后需要重新拉取"""
+    store.save_index('app', 'tbl1', 'users', {'1': 'rec1'}, {'1': 'fp1'})
+    store.upsert_records('app', 'tbl1', [('1', 'rec1', 'fp1-new'), ('3', 'rec3', 'fp3')])
+    records, fingerprints = store.load_index('app', 'tbl1')
+    assert records == {'1': 'rec1', '3': 'rec3'}
+    assert fingerprints == {'1': 'fp1-new', '3': 'fp3'}
+
+    store.invalidate('app', 'tbl1')
+    assert store.load_index('app', 'tbl1') is None
+
+
+def test_watermark(store):
+    """水位按表格保存，失效时一并清除"""
+    assert store.get_watermark('app', 'tbl1') is None
+    store.set_watermark('app', 'tbl1', 'orders', 'updated_at', '2024-01-01 00:00:00')
+    store.set_watermark('app', 'tbl1', 'orders', 'updated_at', '2024-01-02 00:00:00')
+    assert tuple(store.get_watermark('app', 'tbl1')) == ('updated_at', '2024-01-02 00:00:00')
+
+    store.invalidate('app', 'tbl1')
+    assert store.get_watermark('app', 'tbl1') is None
+
+
+def test_checkpoint(store):
+    """断点按表格保存，同步完成或状态失效时清除"""
+    assert store.get_checkpoint('app', 'tbl1') is None
+    checkpoint = {'columns': ['id'], 'last_key': [500], 'counts': {'read': 500}}
+    store.set_checkpoint('app', 'tbl1', 'orders', checkpoint)
+    assert store.get_checkpoint('app', 'tbl1') == checkpoint
+    store.clear_checkpoint('app', 'tbl1')
+    assert store.get_checkpoint('app', 'tbl1') is None
+
+    store.set_checkpoint('app', 'tbl1', 'orders', checkpoint)
+    store.invalidate('app', 'tbl1')
+    assert store.get_checkpoint('app', 'tbl1') is None
+
+
+
+def test_failed_listing_is_not_saved(make_syncer, tmp_path):
+    """拉取飞书记录中途失败时不保存、不使用只拉取到一部分的索引，该表同步失败"""
+    pages = [reply(SimpleNamespace(items=[SimpleNamespace(record_id='rec1', fields={'id': 1.0})],
+                                   has_more=True, page_token='p2')),
+             reply(success=False, msg='internal error')]
+    record_api = SimpleNamespace(list=lambda request: pages.pop(0))
+    syncer = make_syncer(stub_base_client(app_table_record=record_api), state_path=str(tmp_path / 'sync_state.db'),
+                         rate_limits={'read': 1000}, max_retries=0)
+    syncer.get_primary_key_columns = lambda table_name: []
+    created = []
+    syncer._batch_create_records = lambda table_id, records, created_record_ids=None: created.append(records)
+
+    assert not syncer.sync_table_data('users', 'tbl1', [{'name': 'id', 'type': 'int(11)'}])
+    assert syncer.state_store.load_index('app', 'tbl1') is None
+    assert created == []
+    syncer.close_connections()
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试热启动复用连接、日志处理器只添加一次以及延迟导入baseopensdk
+"""
+
+import json
+import logging
+import os
+import subprocess
+import sys
+
+import pytest
+
+import api
+import mysql_to_base_sync
+from conftest import make_configs
+from mysql_to_base_sync import MySQLToBaseSync, acquire_warm_syncer, release_warm_syncer, close_warm_syncers
+
+
+class StubConnection:
+    def __init__(self, alive=True):
+        self.alive = alive
+        self.rollbacks = 0
+        self.closed = False
+
+    def ping(self, reconnect=False):
+        if not self.alive:
+            raise ConnectionError('MySQL server has gone away')
+
+    def rollback(self):
+        self.rollbacks += 1
+
+    def close(self):
+        self.closed = True
+
+
+class StubBaseClient:
+    def __init__(self):
+        self.closed = False
+
+
+class StubSyncer(MySQLToBaseSync):
+    connects = 0
+
+    def connect_mysql(self):
+        StubSyncer.connects += 1
+        self.mysql_conn = StubConnection()
+        return True
+
+    def connect_base(self):
+        self.base_client = StubBaseClient()
+        return True
+
+
+def configs(database='test'):
+    return make_configs(database, rate_limits={'read': 1000, 'write': 1000, 'meta': 1000})
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    StubSyncer.connects = 0
+    yield
+    close_warm_syncers()
+
+
+def test_logger_handlers_added_once():
+    """多次创建同步器时不重复添加日志处理器"""
+    MySQLToBaseSync(*configs())
+    handlers = list(logging.getLogger('mysql_to_base_sync').handlers)
+    MySQLToBaseSync(*configs())
+    assert logging.getLogger('mysql_to_base_sync').handlers == handlers
+
+
+def test_warm_syncer_reused_after_health_check():
+    """配置相同的调用复用同一个同步器，复用前结束上次遗留的事务"""
+    first = acquire_warm_syncer(*configs(), factory=StubSyncer)
+    release_warm_syncer(first)
+    second = acquire_warm_syncer(*configs(), factory=StubSyncer)
+    assert second is first
+    assert second.mysql_conn.rollbacks == 1
+    assert StubSyncer.connects == 1
+    # 取出期间相同配置的并发调用新建同步器
+    other = acquire_warm_syncer(*configs(), factory=StubSyncer)
+    assert other is not first
+    release_warm_syncer(second)
+    release_warm_syncer(other)
+    assert second.mysql_conn.closed and not other.mysql_conn.closed
+
+
+def test_broken_connections_reconnected():
+    """MySQL连接失效时重连，飞书客户端已关闭时重建"""
+    syncer = acquire_warm_syncer(*configs(), factory=StubSyncer)
+    syncer.mysql_conn.alive = False
+    syncer.base_client.closed = True
+    release_warm_syncer(syncer)
+    reused = acquire_warm_syncer(*configs(), factory=StubSyncer)
+    assert reused is syncer
+    assert reused.mysql_conn.alive and not reused.base_client.closed
+    assert StubSyncer.connects == 2
+
+
+def test_cache_evicts_oldest(monkeypatch):
+    monkeypatch.setattr(mysql_to_base_sync, 'WARM_CACHE_SIZE', 2)
+    syncers = [acquire_warm_syncer(*configs(f'db{i}'), factory=StubSyncer) for i in range(3)]
+    for syncer in syncers:
+        release_warm_syncer(syncer)
+    assert syncers[0].mysql_conn.closed
+    assert not syncers[2].mysql_conn.closed
+
+
+def test_lambda_enables_warm_start(monkeypatch):
+    """Lambda环境中默认开启热启动，请求体可以关闭"""
+    calls = []
+    monkeypatch.setattr(api, 'sync_with_config', lambda **kwargs: calls.append(kwargs) or {})
+    monkeypatch.setenv('AWS_LAMBDA_FUNCTION_NAME', 'sync')
+    body = {'mysql_host': 'h', 'mysql_port': 3306, 'mysql_username': 'u', 'mysql_password': 'p',
+            'mysql_database': 'd', 'app_token': 'a', 'personal_base_token': 't'}
+    assert api.lambda_handler({'body': json.dumps(body)})['statusCode'] == 200
+    assert api.lambda_handler({'body': dict(body, warm_start='false')})['statusCode'] == 200
+    assert [call['warm_start'] for call in calls] == [True, False]
+
+
+def test_import_defers_baseopensdk():
+    """导入入口模块时不导入baseopensdk"""
+    code = "import sys, api; print('baseopensdk' in sys.modules)"
+    output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True,
+                            cwd=os.path.dirname(os.path.abspath(__file__))).stdout
+    assert output.strip() == 'False'
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试水位增量读取：水位条件、(水位字段, 主键) 键集分页、回退到读取全表以及水位合并
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from mysql_to_base_sync import MySQLToBaseSync
+
+
+SCHEMA = [
+    {'name': 'id', 'type': 'int(11)'},
+    {'name': 'name', 'type': 'varchar(50)'},
+    {'name': 'updated_at', 'type': 'datetime', 'extra': 'on update CURRENT_TIMESTAMP'},
+]
+START = datetime(2024, 1, 1)
+# 水位值只有4个，相同水位的行跨越分页边界
+ROWS = [{'id': i, 'name': f'user{i}', 'updated_at': START + timedelta(days=i % 4)} for i in range(1, 1201)]
+
+
+@pytest.fixture
+def watermark_syncer(make_syncer, tmp_path):
+    syncer = make_syncer(watermark=True, state_path=str(tmp_path / 'sync_state.db'), pipeline_depth=0)
+    syncer.get_primary_key_columns = lambda table_name: ['id']
+    yield syncer
+    syncer.close_connections()
+
+
+def test_first_run_reads_full_table(watermark_syncer):
+    """没有保存过水位时读取全表，按主键分页"""
+    assert watermark_syncer._prepare_watermark_read('orders', 'tbl', SCHEMA, ['id'], True) == \
+        ('updated_at', [], ['id'])
+
+
+def test_stored_watermark_reads_with_tie_break(watermark_syncer):
+    """保存过水位且复用了本地同步状态时，用>=读取并按 (水位字段, 主键) 分页"""
+    watermark_syncer.state_store.set_watermark('app', 'tbl', 'orders', 'updated_at', '2024-01-03 00:00:00')
+    column, conditions, paging_columns = watermark_syncer._prepare_watermark_read(
+        'orders', 'tbl', SCHEMA, ['id'], True)
+    assert (column, paging_columns) == ('updated_at', ['updated_at', 'id'])
+    assert conditions == [('`updated_at` >= %s', ('2024-01-03 00:00:00',))]
+
+    sql, params = MySQLToBaseSync._build_select_query('orders', conditions, paging_columns,
+                                                      ('2024-01-03 00:00:00', 7), 500)
+    assert sql == ("SELECT * FROM `orders` WHERE (`updated_at` >= %s) AND (`updated_at`, `id`) > (%s, %s) "
+                   "ORDER BY `updated_at`, `id` LIMIT 500")
+    assert params == ('2024-01-03 00:00:00', '2024-01-03 00:00:00', 7)
+
+
+def test_state_not_reused_or_column_changed_reads_full_table(watermark_syncer):
+    """本地同步状态未复用（飞书记录可能被改动）或水位字段变化时读取全表"""
+    store = watermark_syncer.state_store
+    store.set_watermark('app', 'tbl', 'orders', 'updated_at', '2024-01-03 00:00:00')
+    assert watermark_syncer._prepare_watermark_read('orders', 'tbl', SCHEMA, ['id'], False) == \
+        ('updated_at', [], ['id'])
+    store.set_watermark('app', 'tbl', 'orders', 'modified_at', '2024-01-03 00:00:00')
+    assert watermark_syncer._prepare_watermark_read('orders', 'tbl', SCHEMA, ['id'], True) == \
+        ('updated_at', [], ['id'])
+
+
+def test_incremental_run_reads_rows_at_and_after_watermark(watermark_syncer):
+    """增量同步读取水位相同及之后的全部行（跨页的相同水位不漏读不重复），完成后水位推进到最大值"""
+    store = watermark_syncer.state_store
+    store.set_watermark('app', 'tbl', 'orders', 'updated_at', str(START + timedelta(days=2)))
+    queries = []
+
+    def fetch_page(table_name, limit, offset=0, key_columns=None, last_key=None, conditions=None, columns=None):
+        queries.append((key_columns, last_key))
+        floor = datetime.fromisoformat(conditions[0][1][0])
+        rows = sorted((row for row in ROWS if row['updated_at'] >= floor),
+                      key=lambda row: (row['updated_at'], row['id']))
+        if last_key is not None:
+            rows = [row for row in rows if (row['updated_at'], row['id']) > tuple(last_key)]
+        return rows[:limit]
+
+    read = []
+
+    def create_records(table_id, records, created_record_ids=None):
+        read.extend(record['fields']['id'] for record in records)
+        created_record_ids.extend(f"rec{record['fields']['id']}" for record in records)
+        return True
+
+    watermark_syncer._fetch_mysql_page = fetch_page
+    watermark_syncer._load_existing_index = lambda *args: ({}, {}, True)
+    watermark_syncer._plan_shards = lambda table_name, key_columns: []
+    watermark_syncer._batch_create_records = create_records
+
+    assert watermark_syncer.sync_table_data('orders', 'tbl', SCHEMA)
+    expected = [row['id'] for row in ROWS if row['updated_at'] >= START + timedelta(days=2)]
+    assert sorted(read) == expected and len(read) == len(set(read))
+    assert all(key_columns == ['updated_at', 'id'] for key_columns, _ in queries)
+    assert store.get_watermark('app', 'tbl')[1] == str(START + timedelta(days=3))
+
+
+def test_merge_watermark_keeps_larger_value():
+    """断点中转为字符串的水位与本次读取到的水位按原类型比较，任一方为空时取另一方"""
+    merge = MySQLToBaseSync._merge_watermark
+    assert merge(None, None) is None
+    assert merge('2024-01-02 00:00:00', None) == '2024-01-02 00:00:00'
+    assert merge('2024-01-02 00:00:00', datetime(2024, 1, 1)) == '2024-01-02 00:00:00'
+    assert merge('2024-01-02 00:00:00', datetime(2024, 1, 3)) == datetime(2024, 1, 3)
+    assert merge('9', 10) == 10 and merge('11', 10) == '11'
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])